@@ -4,11 +4,193 @@ Now with aggregator rewriting that references core_lambda_functions.
 """
 import math
 import numpy as np
-from core_lambda_functions import COUNT, SUM, MAX, IF, CONTAINS, EQUAL
+import os
+import sys
+
+_TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools")
+if _TOOLS not in sys.path:
+    sys.path.insert(0, _TOOLS)
+
+from core_lambda_functions import COUNT, SUM, MAX, MIN, AVG, IF, CONTAINS, EQUAL, EXISTS, MINBY, MAXBY, MODE, TOPN
 
 import uuid
 import re
 
+_EXTENTS = {}
+_EXTENT_VERSIONS = {}
+
+def _register(obj):
+    """Remember every instance so 'Entity where ...' formulas can scan it."""
+    name = type(obj).__name__
+    _EXTENTS.setdefault(name, []).append(obj)
+    _EXTENT_VERSIONS[name] = _EXTENT_VERSIONS.get(name, 0) + 1
+
+def _extent(entity_name):
+    """All instances of entity_name created so far."""
+    return _EXTENTS.get(entity_name, [])
+
+def _forget_extents():
+    """Empty every extent; returns the instances they held."""
+    forgotten = [obj for objs in _EXTENTS.values() for obj in objs]
+    _EXTENTS.clear()
+    return forgotten
+
+def _new_collection():
+    return []
+
+def _index_rows(entity_name, bucket):
+    """A hash-index bucket ({id: obj}) as a list."""
+    return list(bucket.values()) if bucket else []
+
+def _column(rows, field):
+    """field of every row in rows (e.g. SUM(teams -> wins))."""
+    return [getattr(x, field) for x in rows]
+
+def _flatten(rows, collection):
+    """Concatenate the collection of every row (e.g. teams.roster)."""
+    return [y for x in rows for y in getattr(x, collection)]
+
+def _touch(obj, attr_name, _seen=None):
+    """
+    attr_name on obj changed: drop the memoized fields that depend on it,
+    bump obj's extent version, then tell every object that holds obj in
+    a collection or reference attribute.
+    """
+    if _seen is None:
+        _seen = set()
+    elif id(obj) in _seen:
+        return
+    _seen.add(id(obj))
+    memo = obj.__dict__.get('_memo')
+    if memo:
+        for dependent in getattr(type(obj), '_DEPENDENTS', {}).get(attr_name, ()):
+            memo.pop(dependent, None)
+    name = type(obj).__name__
+    _EXTENT_VERSIONS[name] = _EXTENT_VERSIONS.get(name, 0) + 1
+    containers = obj.__dict__.get('_containers')
+    if containers:
+        for parent, parent_attr in list(containers.values()):
+            _touch(parent, parent_attr, _seen)
+
+_INDEXES = {}            # (entity, input field) -> {value: {id(obj): obj}}
+_CALCULATED_INDEXES = {} # (entity, calculated field) -> (version stamp, index)
+
+def _lookup(entity_name, field, key):
+    """Instances of entity_name whose input field equals key, from the hash index."""
+    return _index_rows(entity_name, _INDEXES.get((entity_name, field), {}).get(key))
+
+def _lookup_calculated(entity_name, field, key):
+    """
+    As _lookup, for a calculated field.  Its index is rebuilt with one pass
+    over the extent whenever the versions of that extent (or of the
+    extents the field itself scans) have moved, so N probes between two
+    changes cost one scan instead of N.
+    """
+    cls = globals().get(entity_name)
+    deps = (entity_name,) + tuple(cls._EXTENT_DEPS.get(field, ()) if cls else ())
+    stamp = tuple(_EXTENT_VERSIONS.get(e, 0) for e in deps)
+    hit = _CALCULATED_INDEXES.get((entity_name, field))
+    if hit is None or hit[0] != stamp:
+        index = {}
+        for obj in _extent(entity_name):
+            index.setdefault(getattr(obj, field), {})[id(obj)] = obj
+        hit = _CALCULATED_INDEXES[(entity_name, field)] = (stamp, index)
+    return _index_rows(entity_name, hit[1].get(key))
+
+def _reindex(obj, field, value):
+    """Move obj to the `value` bucket of the (type, field) hash index."""
+    keys = obj.__dict__.setdefault('_index_keys', {})
+    if keys is None:
+        return      # forgotten by clear_extents()
+    index = _INDEXES.setdefault((type(obj).__name__, field), {})
+    if field in keys:
+        bucket = index[keys[field]]
+        del bucket[id(obj)]
+        if not bucket:
+            del index[keys[field]]
+    index.setdefault(value, {})[id(obj)] = obj
+    keys[field] = value
+
+def clear_extents():
+    """
+    Forget every instance created so far.  The extents and hash indexes
+    hold each instance for the life of the module, so a long-running
+    process that builds one model after another calls this between
+    them to let the old objects go.  Those objects keep working, but
+    'Entity where ...' scans and lookups no longer find them.
+    """
+    for obj in _forget_extents():
+        obj.__dict__['_index_keys'] = None
+    _INDEXES.clear()
+    _CALCULATED_INDEXES.clear()
+    for name in _EXTENT_VERSIONS:
+        _EXTENT_VERSIONS[name] += 1
+
+def _contain(item, parent, attr_name):
+    """Record that parent.attr_name holds item, so changes to item reach parent."""
+    if isinstance(item, _Entity):
+        item.__dict__.setdefault('_containers', {})[(id(parent), attr_name)] = (parent, attr_name)
+
+def _uncontain(item, parent, attr_name):
+    """parent.attr_name no longer holds item: stop telling parent about item's changes."""
+    if isinstance(item, _Entity):
+        containers = item.__dict__.get('_containers')
+        if containers:
+            containers.pop((id(parent), attr_name), None)
+
+class _Entity:
+    """Base for generated classes: every public attribute write invalidates its dependents."""
+    _DEPENDENTS = {}
+    _EXTENT_DEPS = {}
+    _SCALARS = frozenset()
+    _INDEXED = frozenset()
+
+    def __setattr__(self, name, value):
+        public = not name.startswith('_')
+        if name in type(self)._SCALARS:
+            table, row = self.__dict__['_table'], self.__dict__['_row']
+            old = table.get(row, name) if public else None
+            table.set(row, name, value)
+        else:
+            old = self.__dict__.get(name) if public else None
+            object.__setattr__(self, name, value)
+        if name in type(self)._INDEXED:
+            _reindex(self, name, value)
+        if public:
+            if old is not value:
+                _uncontain(old, self, name)
+            _contain(value, self, name)
+            _touch(self, name)
+
+class memoized_property:
+    """
+    A read-only @property cached per instance.  The entry is dropped by
+    _touch when an input changes, and is re-stamped against the
+    versions of any entity extents the formula scans.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        extents = type(obj)._EXTENT_DEPS.get(self.name)
+        stamp = tuple(_EXTENT_VERSIONS.get(e, 0) for e in extents) if extents else None
+        memo = obj.__dict__.get('_memo')
+        if memo is None:
+            memo = obj.__dict__['_memo'] = {}
+        hit = memo.get(self.name)
+        if hit is not None and hit[1] == stamp:
+            return hit[0]
+        value = self.func(obj)
+        memo[self.name] = (value, stamp)
+        return value
+
+    def __set__(self, obj, value):
+        raise AttributeError(f"can't set calculated field '{self.name}'")
+
 class CollectionWrapper:
     """A tiny helper so we can do something like: obj.someLookup.add(item)."""
     def __init__(self, parent_object, attr_name):
@@ -17,10 +199,25 @@ class CollectionWrapper:
         if not hasattr(parent_object, '_collections'):
             parent_object._collections = {}
         if attr_name not in parent_object._collections:
-            parent_object._collections[attr_name] = []
+            parent_object._collections[attr_name] = _new_collection()
+
+    @property
+    def items(self):
+        """The underlying list (or RowSet in --columnar modules)."""
+        return self.parent_object._collections[self.attr_name]
 
     def add(self, item):
         self.parent_object._collections[self.attr_name].append(item)
+        _contain(item, self.parent_object, self.attr_name)
+        _touch(self.parent_object, self.attr_name)
+
+    def remove(self, item):
+        """Remove the first occurrence of item (ValueError if absent)."""
+        items = self.parent_object._collections[self.attr_name]
+        items.remove(item)
+        if not any(x is item for x in items):
+            _uncontain(item, self.parent_object, self.attr_name)
+        _touch(self.parent_object, self.attr_name)
 
     def __iter__(self):
         return iter(self.parent_object._collections[self.attr_name])
@@ -31,51 +228,53 @@ class CollectionWrapper:
     def __getitem__(self, index):
         return self.parent_object._collections[self.attr_name][index]
 
-# Below are aggregator stubs not yet in core_lambda_functions:
-def AVG(collection):
-    """Placeholder aggregator: real logic not yet implemented."""
-    # Could do: return sum(collection)/len(collection) if numeric
-    return f"/* AVG not implemented: {collection} */"
-
-def EXISTS(condition_expr):
-    return f"/* EXISTS not implemented: {condition_expr} */"
-
-def MINBY(expr):
-    return f"/* MINBY not implemented: {expr} */"
-
-def MAXBY(expr):
-    return f"/* MAXBY not implemented: {expr} */"
-
-def MODE(expr):
-    return f"/* MODE not implemented: {expr} */"
-
-def TOPN(expr):
-    return f"/* TOPN not implemented: {expr} */"
-
 
 # ----- Generated classes below -----
 
-class Edge:
+class Edge(_Entity):
     """Plain data container for Edge entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {}
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.label = kwargs.get('label')
         self.polygon_id = kwargs.get('polygon_id')
 
         # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
 
-class Angle:
+class Angle(_Entity):
     """Plain data container for Angle entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {}
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.angle_degrees = kwargs.get('angle_degrees')
         self.polygon_id = kwargs.get('polygon_id')
 
         # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
 
-class Polygon:
+class Polygon(_Entity):
     """Plain data container for Polygon entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'angle_degrees': ('has_right_angle', 'largest_angle', 'sum_of_angles'),
+        'angles': ('angle_count', 'angle_degrees', 'has_right_angle', 'largest_angle', 'sum_of_angles'),
+        'edge_count': ('is_triangle', 'shape_type'),
+        'edges': ('edge_count', 'is_triangle', 'shape_type'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.label = kwargs.get('label')
 
@@ -83,57 +282,57 @@ class Polygon:
         self.edges = CollectionWrapper(self, 'edges')
         self.angles = CollectionWrapper(self, 'angles')
 
-    @property
+    @memoized_property
     def edge_count(self):
         """Number of edges in this polygon.
         Original formula: COUNT(this.edges)
         """
         return COUNT(self.edges)
 
-    @property
+    @memoized_property
     def angle_count(self):
         """Number of angles in this polygon.
         Original formula: COUNT(this.angles)
         """
         return COUNT(self.angles)
 
-    @property
+    @memoized_property
     def largest_angle(self):
         """The maximum angle measure among angles.
         Original formula: MAX(this.angle_degrees)
         """
         return MAX(self.angle_degrees)
 
-    @property
+    @memoized_property
     def sum_of_angles(self):
         """Sum of all angle measures in degrees.
         Original formula: SUM(this.angle_degrees)
         """
         return SUM(self.angle_degrees)
 
-    @property
+    @memoized_property
     def is_triangle(self):
         """True if the polygon has exactly 3 edges.
         Original formula: EQUAL(this.edge_count, 3)
         """
         return EQUAL(self.edge_count, 3)
 
-    @property
+    @memoized_property
     def has_right_angle(self):
         """True if any angle == 90.
         Original formula: CONTAINS(this.angle_degrees, 90)
         """
         return CONTAINS(self.angle_degrees, 90)
 
-    @property
+    @memoized_property
     def shape_type(self):
         """Naive categorization based on edge_count: 3 => triangle, 4 => quadrilateral, else other.
         Original formula: IF( EQUAL(this.edge_count,3), 'triangle', IF(EQUAL(this.edge_count,4),'square','polygon') )
         """
-        return IF( EQUAL(self.edge_count,3), 'triangle', IF(EQUAL(self.edge_count,4),'square','polygon') )
+        return ('triangle' if EQUAL(self.edge_count, 3) else ('square' if EQUAL(self.edge_count, 4) else 'polygon'))
 
     # Derived properties for 'target_entity': 'this'
-    @property
+    @memoized_property
     def angle_degrees(self):
         """An array of the angles of a triangle."""
-        return [x.angle_degrees for x in self.angles]
+        return _column(self.angles, 'angle_degrees')
@@ -0,0 +1,125 @@
+# array_backend.py
+"""
+Array backend for the quantum-walk engine: `xp` is numpy or cupy.
+
+The backend is picked once at import from QWALK_BACKEND (auto | numpy |
+cupy; auto means CuPy when it imports and sees a GPU) and can be changed
+with use_backend().  Engine code allocates with xp and calls to_host()
+wherever a result has to become a NumPy array (files, plots).
+
+The complex dtype of the walk is complex128 unless QWALK_DTYPE (or
+use_dtype()) selects complex64, which halves the memory and bandwidth of
+every grid-sized buffer; EVOLVE then watches the norm for drift.
+
+On the CPU the per-step kernels are spread over a thread pool
+(QWALK_THREADS, default os.cpu_count()); NumPy releases the GIL inside
+matmul and slice copies, so bands of the grid run concurrently.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+xp = np
+complex_dtype = np.dtype(np.complex128)
+_threads = 1
+_pool = None
+
+
+def _gpu_available():
+    if cupy is None:
+        return False
+    try:
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+def use_backend(name="auto"):
+    """Select 'numpy', 'cupy' or 'auto' and return the chosen array module."""
+    global xp
+    if name == "auto":
+        name = "cupy" if _gpu_available() else "numpy"
+    if name == "cupy":
+        if cupy is None:
+            raise ImportError("QWALK_BACKEND=cupy but CuPy is not installed")
+        xp = cupy
+    elif name == "numpy":
+        xp = np
+    else:
+        raise ValueError(f"Unknown array backend {name!r} (expected auto, numpy or cupy)")
+    return xp
+
+
+def use_dtype(name="complex128"):
+    """Select the walk's complex dtype, 'complex128' or 'complex64', and return it."""
+    global complex_dtype
+    dtype = np.dtype(name)
+    if dtype not in (np.complex64, np.complex128):
+        raise ValueError(f"Unknown walk dtype {name!r} (expected complex128 or complex64)")
+    complex_dtype = dtype
+    return dtype
+
+
+def set_cpu_threads(n=None):
+    """Threads used by the CPU kernels (None = os.cpu_count())."""
+    global _threads, _pool
+    n = max(1, n or os.cpu_count() or 1)
+    if n != _threads and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+    _threads = n
+    return n
+
+
+def cpu_threads():
+    return _threads if xp is np else 1
+
+
+def parallel_map(fn, items):
+    """Call fn on every item, on the CPU thread pool when there is one."""
+    global _pool
+    if cpu_threads() == 1:
+        for item in items:
+            fn(item)
+        return
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=_threads, thread_name_prefix="qwalk")
+    for _ in _pool.map(fn, items):
+        pass
+
+
+def bands(n, parts=None):
+    """Split range(n) into up to `parts` contiguous slices (default: one per thread)."""
+    parts = max(1, min(n, parts or cpu_threads()))
+    edges = [n * i // parts for i in range(parts + 1)]
+    return [slice(a, b) for a, b in zip(edges, edges[1:])]
+
+
+def array_module(a):
+    """numpy or cupy, whichever a belongs to."""
+    if cupy is not None:
+        return cupy.get_array_module(a)
+    return np
+
+
+def asarray(a, dtype=None):
+    """a as an array of the current backend."""
+    return xp.asarray(a, dtype=dtype)
+
+
+def to_host(a):
+    """a as a NumPy array (no copy if it already is one)."""
+    if cupy is not None and isinstance(a, cupy.ndarray):
+        return cupy.asnumpy(a)
+    return np.asarray(a)
+
+
+use_backend(os.environ.get("QWALK_BACKEND", "auto"))
+use_dtype(os.environ.get("QWALK_DTYPE", "complex128"))
+set_cpu_threads(int(os.environ.get("QWALK_THREADS", "0")) or None)
@@ -0,0 +1,174 @@
+# checkpoints.py
+"""
+Crash-safe persistence for long EVOLVE runs.
+
+CheckpointRing keeps the last `slots` states of the walk in one memory-mapped
+structured .npy file: psi plus the step index, a sequence number and a JSON
+`state` blob (Grid parameters, RNG state, ...).  A slot is invalidated before
+its psi is overwritten and only re-stamped once the new psi is flushed, so a
+crash at any point leaves the previous checkpoint intact.
+
+SnapshotStream appends (step, detector-row intensity) records to a raw
+binary file.  Records are fixed-size, so readers can load_snapshots() the
+file while the simulation is still writing it; a torn trailing record from a
+crash is ignored.
+
+    ring = CheckpointRing("run.ckpt.npy", psi_init.shape, meta=grid_params)
+    snaps = SnapshotStream("run.snap", nx)
+    psi = EVOLVE(psi_init, 400, 1000, False, coin, offsets, barrier_row, ...,
+                 checkpoints=ring, checkpoint_every=100,
+                 snapshots=snaps, snapshot_every=10, detector_row=detector_row)
+
+Re-running the same call after a crash resumes from the newest checkpoint.
+"""
+import json
+import os
+
+import numpy as np
+
+_STATE_BYTES = 4096
+_SNAP_MAGIC = b"QWSNAP01"
+
+
+def _ring_dtype(shape, dtype):
+    return np.dtype([
+        ("seq", np.int64),              # 0 = empty / being written
+        ("step", np.int64),
+        ("state", f"S{_STATE_BYTES}"),  # JSON: meta, rng state
+        ("psi", dtype, tuple(shape)),
+    ])
+
+
+class CheckpointRing:
+    """
+    Ring of `slots` checkpoints of a psi array of the given shape/dtype.
+    psi is stored in that dtype whatever the walk's: a complex64 ring
+    rounds a walk that EVOLVE promoted to complex128.
+
+    meta: JSON-serializable run description (e.g. Grid parameters).  It is
+          stored with every checkpoint and must match on resume.
+    rng:  optional np.random.Generator whose state is saved and restored.
+    """
+
+    def __init__(self, path, shape, dtype=np.complex128, slots=2, meta=None, rng=None):
+        self.path = path
+        self.meta = meta or {}
+        self.rng = rng
+        dtype = _ring_dtype(shape, dtype)
+        if os.path.exists(path):
+            self.records = np.load(path, mmap_mode="r+")
+            if self.records.dtype != dtype:
+                raise ValueError(f"Checkpoint file {path} holds a different psi shape/dtype")
+        else:
+            self.records = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(slots,))
+            self.records["seq"] = 0
+            self.records.flush()
+
+    def latest(self):
+        """Index of the newest valid slot, or None if the ring is empty."""
+        seq = self.records["seq"]
+        if not seq.any():
+            return None
+        return int(np.argmax(seq))
+
+    def save(self, step, psi):
+        """Write psi at `step` over the oldest slot."""
+        state = {"meta": self.meta}
+        if self.rng is not None:
+            state["rng"] = self.rng.bit_generator.state
+        blob = json.dumps(state).encode()
+        if len(blob) > _STATE_BYTES:
+            raise ValueError(f"Checkpoint state is {len(blob)} bytes; at most {_STATE_BYTES} fit in a slot")
+        slot = int(np.argmin(self.records["seq"]))
+        record = self.records[slot:slot + 1]
+        next_seq = int(self.records["seq"].max()) + 1
+        record["seq"] = 0
+        self.records.flush()
+        record["psi"][0] = psi
+        record["state"] = blob
+        record["step"] = step
+        self.records.flush()
+        record["seq"] = next_seq
+        self.records.flush()
+
+    def restore(self, psi):
+        """
+        Copy the newest checkpoint into psi (and the RNG) and return its step,
+        or return 0 and leave psi alone if there is none.
+        """
+        slot = self.latest()
+        if slot is None:
+            return 0
+        record = self.records[slot]
+        state = json.loads(record["state"].decode())
+        if state["meta"] != json.loads(json.dumps(self.meta)):
+            raise ValueError(f"Checkpoint {self.path} was written for a different run: {state['meta']}")
+        if self.rng is not None and "rng" in state:
+            self.rng.bit_generator.state = state["rng"]
+        psi[...] = record["psi"]
+        return int(record["step"])
+
+
+class SnapshotStream:
+    """Append-only file of (step, float64[n]) detector-row records."""
+
+    def __init__(self, path, n):
+        self.path = path
+        self.n = n
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(_SNAP_MAGIC + np.int64(n).tobytes())
+        elif _read_header(path) != n:
+            raise ValueError(f"Snapshot file {path} holds rows of a different length")
+        self._fp = open(path, "ab")
+
+    def append(self, step, row):
+        record = np.empty(1, dtype=_snap_dtype(self.n))
+        record["step"] = step
+        record["row"] = row
+        self._fp.write(record.tobytes())
+        self._fp.flush()
+
+    def truncate(self, step):
+        """Drop records after `step` (written after the checkpoint being resumed)."""
+        # Binary search on the step fields with plain reads: a memmap of the
+        # file would still be open while it is truncated (an error on Windows).
+        itemsize = _snap_dtype(self.n).itemsize
+        lo, hi = 0, (os.path.getsize(self.path) - 16) // itemsize
+        with open(self.path, "rb") as f:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(16 + mid * itemsize)
+                if int(np.frombuffer(f.read(8), np.int64)[0]) <= step:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        self._fp.truncate(16 + lo * itemsize)
+        self._fp.seek(0, os.SEEK_END)
+
+    def close(self):
+        self._fp.close()
+
+
+def _snap_dtype(n):
+    return np.dtype([("step", np.int64), ("row", np.float64, (n,))])
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        header = f.read(16)
+    if len(header) != 16 or header[:8] != _SNAP_MAGIC:
+        raise ValueError(f"{path} is not a snapshot stream")
+    return int(np.frombuffer(header, np.int64, 1, 8)[0])
+
+
+def load_snapshots(path):
+    """
+    Read-only view of the records written so far:
+    res["step"] (k,), res["row"] (k, n).
+    """
+    dtype = _snap_dtype(_read_header(path))
+    count = (os.path.getsize(path) - 16) // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=16, shape=(count,))
@@ -5,7 +5,7 @@ References SHIFT, APPLY_BARRIER, EVOLVE, etc. from an external python file.
 import math
 import numpy as np
 
-from quantum_walk_blocks import APPLY_BARRIER, COLLAPSE_BARRIER, EVOLVE, GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION, SHIFT
+from quantum_walk_blocks import APPLY_BARRIER, COLLAPSE_BARRIER, CONSTRUCT_COIN, EVOLVE, GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION, SHIFT
 
 # ----- Generated classes below -----
 
@@ -98,6 +98,13 @@ class CoinOperator:
         """
         return np.allclose(np.matmul(self.Matrix, self.Matrix.conj().T), np.eye(8, dtype=np.complex128))
 
+    @property
+    def ConstructedMatrix(self):
+        """
+        Original formula: CONSTRUCT_COIN(construction_method, seed, construction_params)
+        """
+        return CONSTRUCT_COIN(self.construction_method, self.seed, self.construction_params)
+
 class WavefunctionInitial:
     def __init__(self, **kwargs):
         self.src_y = kwargs.get('src_y')
@@ -211,6 +218,8 @@ class QWalkRunner:
         self.steps_after_barrier = kwargs.get('steps_after_barrier')
         self.collapse_barrier = kwargs.get('collapse_barrier')
         self.step_order = kwargs.get('step_order')
+        self.coin_matrices = kwargs.get('coin_matrices')
+        self.psi_init_batch = kwargs.get('psi_init_batch')
 
     @property
     def final_wavefunction(self):
@@ -219,6 +228,13 @@ class QWalkRunner:
         """
         return EVOLVE(self.WavefunctionInitial.psi_init, self.steps_to_barrier, self.steps_after_barrier, self.collapse_barrier)
 
+    @property
+    def final_wavefunctions(self):
+        """
+        Original formula: EVOLVE(psi_init_batch, steps_to_barrier, steps_after_barrier, collapse_barrier, coin_matrices)
+        """
+        return EVOLVE(self.psi_init_batch, self.steps_to_barrier, self.steps_after_barrier, self.collapse_barrier, self.coin_matrices)
+
 class RandomnessControl:
     def __init__(self, **kwargs):
         self.global_seed = kwargs.get('global_seed')
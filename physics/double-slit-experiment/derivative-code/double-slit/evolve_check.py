@@ -0,0 +1,66 @@
+# evolve_check.py
+"""
+Self-check for EVOLVE: the fast_forward and active_region paths agree with
+the plain walk, including for offsets that move more than one row a step,
+and snapshots without a detector_row are refused up front.
+
+    python evolve_check.py
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from checkpoints import SnapshotStream
+from quantum_walk_blocks import EVOLVE
+
+OFFSETS_8DIR = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+OFFSETS_REACH_2 = [(-2, 0), (-1, 1), (0, 2), (2, 1), (2, 0), (1, -1), (0, -2), (-2, -1)]
+OFFSETS_ROWLESS = [(0, 1), (0, -1), (0, 2), (0, -2), (0, 1), (0, -1), (0, 0), (0, 3)]
+
+
+def _packet(ny, nx, src_y):
+    """A flat 3 x 5 block of amplitude: no tails, so the barrier gap is exact."""
+    psi = np.zeros((ny, nx, 8), dtype=np.complex128)
+    psi[src_y - 1:src_y + 2, nx // 2 - 2:nx // 2 + 3, :] = 1
+    return psi / np.sqrt(np.sum(np.abs(psi) ** 2))
+
+
+def check_paths_match(offsets, src_y, collapse):
+    ny, nx = 64, 48
+    barrier = dict(barrier_row=40, slit1_xstart=18, slit1_xend=21, slit2_xstart=27, slit2_xend=30)
+    coin = np.fft.fft(np.eye(8)) / np.sqrt(8)
+    args = (_packet(ny, nx, src_y), 12, 9, collapse, coin, offsets, *barrier.values())
+    plain = EVOLVE(*args)
+    for flags in ({"fast_forward": True}, {"active_region": True},
+                  {"fast_forward": True, "active_region": True}):
+        got = EVOLVE(*args, **flags)
+        err = float(np.max(np.abs(got - plain)))
+        assert err < 1e-12, (offsets, src_y, collapse, flags, err)
+
+
+def check_snapshots_need_detector_row():
+    with tempfile.TemporaryDirectory() as tmp:
+        snaps = SnapshotStream(os.path.join(tmp, "run.snap"), 48)
+        try:
+            EVOLVE(_packet(64, 48, 12), 4, 4, False, None, OFFSETS_8DIR, 40, 18, 21, 27, 30,
+                   snapshots=snaps, snapshot_every=2)
+        except ValueError as exc:
+            assert "detector_row" in str(exc), exc
+        else:
+            raise AssertionError("EVOLVE took snapshots without a detector_row")
+        finally:
+            snaps.close()
+
+
+def main():
+    for offsets in (OFFSETS_8DIR, OFFSETS_REACH_2, OFFSETS_ROWLESS):
+        for src_y in (12, 20, 30, 40):
+            for collapse in (False, True):
+                check_paths_match(offsets, src_y, collapse)
+    check_snapshots_need_detector_row()
+    print("EVOLVE: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from array_backend import to_host
+
 # Import the classes/functions from the auto-generated helper
 # (Replace "my_exp_helper" with the actual module name you generated)
 from double_slit_helpers import (
@@ -94,7 +96,7 @@ def main():
     #    dint = DetectorIntensity(row_amp=row_amp)
     #    intensity_1d = dint.intensity_1d
     # Otherwise, do it manually:
-    row_amp = final_psi[grid.detector_row, :, :]  # shape = (nx,8)
+    row_amp = to_host(final_psi[grid.detector_row, :, :])  # shape = (nx,8), on the CPU
     intensity_1d = np.sum(np.abs(row_amp)**2, axis=-1)
 
     # 7) Plot or print some results
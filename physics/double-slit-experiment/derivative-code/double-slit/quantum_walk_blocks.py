@@ -1,74 +1,175 @@
 # quantum_walk_blocks.py
 
+import os
+import sys
+
 import numpy as np
 
+import array_backend as backend
+
+TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "tools")
+if TOOLS not in sys.path:
+    sys.path.insert(0, TOOLS)
+
+from cmcc_profile import profiled   # noqa: E402  blocks and kernels report to cmcc_profile when CMCC_PROFILE is set
+
+def _roll_into(dst, src, dy, dx):
+    """
+    dst[...] = np.roll(src, (dy, dx), axis=(-2, -1)) for arrays whose last
+    two axes are (y, x), as four periodic-wrap slice copies with no
+    temporaries.
+    """
+    ny, nx = src.shape[-2:]
+    dy %= ny
+    dx %= nx
+    dst[..., dy:, dx:] = src[..., :ny - dy, :nx - dx]
+    dst[..., dy:, :dx] = src[..., :ny - dy, nx - dx:]
+    dst[..., :dy, dx:] = src[..., ny - dy:, :nx - dx]
+    dst[..., :dy, :dx] = src[..., ny - dy:, nx - dx:]
+
+@profiled()
 def SHIFT(psi_in, offsets):
     """
     SHIFT each spin component by the specified (dy, dx).
-    psi_in: shape = (ny, nx, spin_dim)
+    psi_in: shape = (ny, nx, spin_dim), or (batch, ny, nx, spin_dim)
     offsets: list of (ofy, ofx), e.g. for an 8D walk
     """
-    ny, nx, spin_dim = psi_in.shape
-    psi_out = np.zeros_like(psi_in)
+    psi_out = backend.array_module(psi_in).zeros_like(psi_in)
     for d, (dy, dx) in enumerate(offsets):
-        rolled = np.roll(psi_in[:, :, d], shift=dy, axis=0)
-        rolled = np.roll(rolled, shift=dx, axis=1)
-        psi_out[:, :, d] = rolled
+        _roll_into(psi_out[..., d], psi_in[..., d], dy, dx)
     return psi_out
 
+@profiled()
 def APPLY_BARRIER(psi_in, barrier_row, slit1_xstart, slit1_xend, slit2_xstart, slit2_xend):
     """
     Zero out wavefunction in barrier_row except for the slit columns.
     """
     psi_out = psi_in.copy()
-    psi_out[barrier_row, :, :] = 0
-    psi_out[barrier_row, slit1_xstart:slit1_xend, :] = psi_in[barrier_row, slit1_xstart:slit1_xend, :]
-    psi_out[barrier_row, slit2_xstart:slit2_xend, :] = psi_in[barrier_row, slit2_xstart:slit2_xend, :]
+    psi_out[..., barrier_row, :, :] = 0
+    psi_out[..., barrier_row, slit1_xstart:slit1_xend, :] = psi_in[..., barrier_row, slit1_xstart:slit1_xend, :]
+    psi_out[..., barrier_row, slit2_xstart:slit2_xend, :] = psi_in[..., barrier_row, slit2_xstart:slit2_xend, :]
     return psi_out
 
+@profiled()
 def COLLAPSE_BARRIER(psi_in, barrier_row, slit1_xstart, slit1_xend, slit2_xstart, slit2_xend):
     """
     Example barrier measurement: amplitude outside the slits is lost.
     """
-    psi_out = np.zeros_like(psi_in)
+    xp = backend.array_module(psi_in)
+    psi_out = xp.zeros_like(psi_in)
     # Sum intensities across directions
-    row_intens = np.sum(np.abs(psi_in[barrier_row, :, :])**2, axis=-1)
-    keep = np.zeros_like(row_intens)
-    keep[slit1_xstart:slit1_xend] = row_intens[slit1_xstart:slit1_xend]
-    keep[slit2_xstart:slit2_xend] = row_intens[slit2_xstart:slit2_xend]
-    amps = np.sqrt(keep)
+    row_intens = xp.sum(xp.abs(psi_in[..., barrier_row, :, :])**2, axis=-1)
+    keep = xp.zeros_like(row_intens)
+    keep[..., slit1_xstart:slit1_xend] = row_intens[..., slit1_xstart:slit1_xend]
+    keep[..., slit2_xstart:slit2_xend] = row_intens[..., slit2_xstart:slit2_xend]
+    amps = xp.sqrt(keep)
     # Place them in direction=0 (say "up")
     d_up = 0
-    psi_out[barrier_row, :, d_up] = amps
+    psi_out[..., barrier_row, :, d_up] = amps
     return psi_out
 
+@profiled()
 def GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION(src_y, sigma_y, ny, nx, spin_dim):
     """
-    Returns a np array (ny, nx, spin_dim) that is Gaussian in y
-    but uniform in x & directions.
+    Returns an array (ny, nx, spin_dim) of backend.complex_dtype on the
+    current backend that is Gaussian in y but uniform in x & directions.
     """
-    arr = np.zeros((ny, nx, spin_dim), dtype=np.complex128)
-    ycoords = np.arange(ny)
-    gauss_y = np.exp(-0.5*((ycoords - src_y)/sigma_y)**2)
+    xp = backend.xp
+    ycoords = xp.arange(ny)
+    gauss_y = xp.exp(-0.5*((ycoords - src_y)/sigma_y)**2)
     # Normalize in y
-    norm_factor = np.sqrt(np.sum(np.abs(gauss_y)**2))
+    norm_factor = xp.sqrt(xp.sum(xp.abs(gauss_y)**2))
     gauss_y /= norm_factor
 
     # Fill across x & directions
-    for d in range(spin_dim):
-        for x in range(nx):
-            arr[:, x, d] = gauss_y
+    arr = xp.empty((ny, nx, spin_dim), dtype=backend.complex_dtype)
+    arr[...] = gauss_y[:, None, None]
     return arr
 
+@profiled()
+def CONSTRUCT_COIN(construction_method, seed=None, construction_params=None):
+    """
+    The 8x8 unitary coin (a host NumPy array) for a CoinOperator
+    construction_method: "DFT" (EVOLVE's default coin), "Hadamard" (H x H x H),
+    "Grover" (2/8 J - I), "random_unitary" (a complex Gaussian matrix drawn
+    from `seed`, projected onto the unitaries by SVD) or "user_defined"
+    (construction_params["matrix"]).
+    """
+    if construction_method == "DFT":
+        return np.fft.fft(np.eye(8)) / np.sqrt(8)
+    if construction_method == "Hadamard":
+        h = np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2)
+        return np.kron(np.kron(h, h), h)
+    if construction_method == "Grover":
+        return np.full((8, 8), 2 / 8, dtype=np.complex128) - np.eye(8)
+    if construction_method == "random_unitary":
+        rng = np.random.default_rng(seed)
+        mat = rng.standard_normal((8, 8)) + 1j * rng.standard_normal((8, 8))
+        U, _, Vh = np.linalg.svd(mat)
+        return U @ Vh
+    if construction_method == "user_defined":
+        if not construction_params or "matrix" not in construction_params:
+            raise ValueError("user_defined coins need construction_params['matrix']")
+        return np.asarray(construction_params["matrix"], dtype=np.complex128)
+    raise ValueError(f"Unknown coin construction_method {construction_method!r}")
+
 
+@profiled()
+def FAST_FORWARD(psi_in, coin_matrix, offsets, steps):
+    """
+    `steps` coin+shift steps of the free (barrier-less, periodic) walk at once.
+    psi_in: shape = (ny, nx, spin_dim); returns a new array of the same shape.
+    """
+    xp = backend.array_module(psi_in)
+    coin = xp.asarray(coin_matrix)
+    coin = coin.astype(xp.result_type(psi_in.dtype, coin.dtype), copy=False)
+    psi = xp.moveaxis(psi_in, -1, 0).astype(coin.dtype)   # always a fresh copy
+    _fast_forward(psi, coin, offsets, steps)
+    return xp.ascontiguousarray(xp.moveaxis(psi, 0, -1))
+
+
+@profiled()
 def EVOLVE(psi_init, steps_to_barrier, steps_after_barrier, collapse_barrier,
            coin_matrix=None, offsets=None,
            barrier_row=None, slit1_xstart=None, slit1_xend=None,
-           slit2_xstart=None, slit2_xend=None):
+           slit2_xstart=None, slit2_xend=None, *,
+           checkpoints=None, checkpoint_every=None,
+           snapshots=None, snapshot_every=None, detector_row=None,
+           fast_forward=False, active_region=False,
+           dtype=None, norm_check_every=None, norm_tol=1e-4, on_drift="renormalize"):
     """
     EVOLVE can be called with 4 or up to 11 arguments. The last 7 can be None,
     in which case we define defaults or skip them.
+
+    Optional persistence (see checkpoints.py): with a CheckpointRing the walk
+    saves psi every `checkpoint_every` steps and resumes from the newest
+    checkpoint; with a SnapshotStream it appends the detector_row intensity
+    every `snapshot_every` steps.
+
+    fast_forward=True jumps the steps before the wave can reach the barrier
+    row in one spectral FAST_FORWARD instead of stepping through them.
+    active_region=True steps only the window of rows/columns that holds
+    amplitude, grown by the offset reach each step.
+
+    Batched runs: psi_init of shape (B, ny, nx, spin_dim) and/or coin_matrix
+    of shape (B, spin_dim, spin_dim) evolve B walks together (a single
+    initial state or coin is shared across the batch); the result is
+    (B, ny, nx, spin_dim).  Each step is one batched matmul, and the shifts
+    and barrier act on the whole stack at once.
+
+    Precision: the walk runs in `dtype` (default backend.complex_dtype).
+    Every `norm_check_every` steps (default: _NORM_CHECK_EVERY for
+    complex64, never for complex128; 0 disables) each walk's
+    WavefunctionNorm.total_norm is compared with its norm at the start (or
+    the last collapse) minus what the barrier has absorbed since.  If the
+    relative drift exceeds norm_tol the walk is rescaled to the expected
+    norm, and with on_drift="promote" the remaining steps run in
+    complex128.  The coin must pass CoinOperator.UnitarityCheck.
+    Checkpoints keep the ring's own psi dtype: after a promotion a
+    complex64 CheckpointRing stores the walk rounded to complex64, and a
+    resumed run restarts in `dtype` either way.
     """
+    xp = backend.xp
     # Example defaults if not provided:
     if coin_matrix is None:
         # e.g. 8D DFT coin
@@ -89,34 +190,371 @@ def EVOLVE(psi_init, steps_to_barrier, steps_after_barrier, collapse_barrier,
     if slit2_xend is None:
         slit2_xend = 110
 
-    psi = psi_init
-    # same logic as your original EVOLVE
-    for _ in range(steps_to_barrier):
-        # coin step
-        ny, nx, spin_dim = psi.shape
-        psi_flat = psi.reshape(ny*nx, spin_dim)
-        out_flat = psi_flat @ coin_matrix.T
-        psi_coin = out_flat.reshape((ny,nx,spin_dim))
-
-        psi_shift = SHIFT(psi_coin, offsets)
-        psi = APPLY_BARRIER(psi_shift, barrier_row,
-                            slit1_xstart, slit1_xend,
-                            slit2_xstart, slit2_xend)
-
-    if collapse_barrier:
-        psi = COLLAPSE_BARRIER(psi, barrier_row,
-                               slit1_xstart, slit1_xend,
-                               slit2_xstart, slit2_xend)
-
-    for _ in range(steps_after_barrier):
-        ny, nx, spin_dim = psi.shape
-        psi_flat = psi.reshape(ny*nx, spin_dim)
-        out_flat = psi_flat @ coin_matrix.T
-        psi_coin = out_flat.reshape((ny,nx,spin_dim))
-
-        psi_shift = SHIFT(psi_coin, offsets)
-        psi = APPLY_BARRIER(psi_shift, barrier_row,
-                            slit1_xstart, slit1_xend,
-                            slit2_xstart, slit2_xend)
-
-    return psi
\ No newline at end of file
+    # Ping-pong engine: the walk lives in two preallocated buffers laid out
+    # ([B,] spin_dim, ny, nx) so every component is a contiguous plane.  Each
+    # step is coin (psi -> scratch, one matmul with out=), shift (scratch ->
+    # psi, periodic slice copies) and the barrier (masking one row in place),
+    # so no step allocates a grid-sized temporary.
+    psi_init = backend.asarray(psi_init)
+    coin = backend.asarray(coin_matrix)
+    ny, nx, spin_dim = psi_init.shape[-3:]
+    batch = np.broadcast_shapes(psi_init.shape[:-3], coin.shape[:-2])
+    if batch and (fast_forward or active_region or snapshots is not None):
+        raise ValueError("fast_forward, active_region and snapshots need a single (unbatched) walk")
+    if on_drift not in ("renormalize", "promote"):
+        raise ValueError(f"on_drift must be 'renormalize' or 'promote', not {on_drift!r}")
+    if snapshots is not None and detector_row is None:
+        raise ValueError("snapshots need a detector_row to record")
+    dtype = xp.dtype(dtype or backend.complex_dtype)
+    if norm_check_every is None:
+        norm_check_every = _NORM_CHECK_EVERY if dtype == xp.complex64 else 0
+    psi = xp.empty(batch + (spin_dim, ny, nx), dtype=dtype)
+    psi[...] = xp.moveaxis(psi_init, -1, -3)
+    scratch = xp.empty_like(psi)
+    coin = coin.astype(dtype, copy=False)
+    lost = None
+    if norm_check_every:
+        _require_unitary(coin_matrix)
+        lost = xp.zeros(max(1, int(np.prod(batch))), dtype=xp.float64)
+
+    blocked = np.ones(nx, dtype=bool)   # barrier-row columns outside both slits
+    blocked[slit1_xstart:slit1_xend] = False
+    blocked[slit2_xstart:slit2_xend] = False
+    blocked = backend.asarray(blocked)
+
+    if checkpoints is None and snapshots is None and not norm_check_every:
+        _advance(psi, scratch, coin, offsets, barrier_row, blocked, steps_to_barrier,
+                 fast_forward, active_region)
+        if collapse_barrier:
+            _collapse(psi, barrier_row, slit1_xstart, slit1_xend, slit2_xstart, slit2_xend)
+        _advance(psi, scratch, coin, offsets, barrier_row, blocked, steps_after_barrier,
+                 fast_forward, active_region)
+        return xp.ascontiguousarray(xp.moveaxis(psi, -3, -1))
+
+    # Persistent / monitored run: walk in segments between checkpoint,
+    # snapshot, norm-check and barrier steps.  A checkpoint at
+    # steps_to_barrier holds the state *before* the collapse, so resuming
+    # there collapses again exactly once.
+    step = 0
+    if checkpoints is not None:
+        host = backend.to_host(xp.moveaxis(psi, -3, -1)).copy()
+        step = checkpoints.restore(host)
+        psi[...] = xp.moveaxis(backend.asarray(host), -1, -3)
+    if snapshots is not None:
+        snapshots.truncate(step)
+    total = steps_to_barrier + steps_after_barrier
+    reference = _walk_norms(psi) if norm_check_every else None
+    while True:
+        if step == steps_to_barrier and collapse_barrier:
+            _collapse(psi, barrier_row, slit1_xstart, slit1_xend, slit2_xstart, slit2_xend)
+            if norm_check_every:
+                reference = _walk_norms(psi)
+                lost[...] = 0
+        if step >= total:
+            break
+        stop = total if step >= steps_to_barrier else steps_to_barrier
+        for every in (checkpoint_every if checkpoints is not None else None,
+                      snapshot_every if snapshots is not None else None,
+                      norm_check_every):
+            if every:
+                stop = min(stop, (step // every + 1) * every)
+        _advance(psi, scratch, coin, offsets, barrier_row, blocked, stop - step,
+                 fast_forward, active_region, lost)
+        step = stop
+        if norm_check_every and (step % norm_check_every == 0 or step == total):
+            drifted = _restore_norm(psi, reference - backend.to_host(lost), norm_tol * reference)
+            if drifted and on_drift == "promote" and psi.dtype != xp.complex128:
+                psi = psi.astype(xp.complex128)
+                scratch = xp.empty_like(psi)
+                coin = backend.asarray(coin_matrix).astype(xp.complex128)
+        if snapshots is not None and snapshot_every and step % snapshot_every == 0:
+            snapshots.append(step, backend.to_host(xp.sum(xp.abs(psi[:, detector_row, :]) ** 2, axis=0)))
+        if checkpoints is not None and checkpoint_every and step % checkpoint_every == 0:
+            checkpoints.save(step, backend.to_host(xp.moveaxis(psi, -3, -1)))
+
+    return xp.ascontiguousarray(xp.moveaxis(psi, -3, -1))
+
+
+@profiled()
+def _collapse(psi, barrier_row, slit1_xstart, slit1_xend, slit2_xstart, slit2_xend):
+    """COLLAPSE_BARRIER on the ([B,] spin_dim, ny, nx) engine layout, in place."""
+    xp = backend.array_module(psi)
+    psi[...] = xp.moveaxis(COLLAPSE_BARRIER(xp.moveaxis(psi, -3, -1), barrier_row,
+                                            slit1_xstart, slit1_xend,
+                                            slit2_xstart, slit2_xend), -1, -3)
+
+
+def _require_unitary(coin_matrix):
+    """Norm drift checks assume a norm-preserving coin: CoinOperator.UnitarityCheck on each coin."""
+    from double_slit_helpers import CoinOperator   # generated classes; they import this module
+    coins = backend.to_host(coin_matrix)
+    for matrix in coins.reshape((-1,) + coins.shape[-2:]):
+        if not CoinOperator(Matrix=matrix).UnitarityCheck:
+            raise ValueError("Norm drift checks need a unitary coin (pass norm_check_every=0 to skip them)")
+
+
+@profiled()
+def _walk_norms(psi):
+    """WavefunctionNorm.total_norm of each walk of psi ([B,] spin_dim, ny, nx), as a host float64 array."""
+    from double_slit_helpers import WavefunctionNorm
+    walks = psi.reshape((-1,) + psi.shape[-3:])
+    return np.array([float(WavefunctionNorm(psi_in=walk).total_norm) for walk in walks])
+
+
+def _restore_norm(psi, expected, tol):
+    """
+    Rescale, in place, every walk of psi whose norm is more than tol away
+    from expected (host arrays, one entry per walk).  True if any was.
+    """
+    norms = _walk_norms(psi)
+    expected = np.maximum(expected, 0)
+    drifted = np.abs(norms - expected) > tol
+    if not drifted.any():
+        return False
+    scale = np.ones_like(norms)
+    fix = drifted & (norms > 0)
+    scale[fix] = np.sqrt(expected[fix] / norms[fix])
+    psi *= backend.asarray(scale.reshape(psi.shape[:-3] + (1, 1, 1)), dtype=psi.real.dtype)
+    return True
+
+
+@profiled()
+def _walk(psi, scratch, coin, offsets, barrier_row, blocked, steps, lost=None):
+    """
+    Run `steps` coin+shift+barrier steps on psi ([B,] spin_dim, ny, nx) in
+    place, using scratch (same shape) as the second buffer.  coin is
+    (spin_dim, spin_dim) or one per batch entry ([B,] spin_dim, spin_dim).
+    On a multi-threaded CPU backend the coin runs on column bands of the
+    flattened grid and the shift on one spin plane per task.  Batched walks
+    are independent, so they are run through all `steps` a cache-sized
+    group at a time: small grids share each matmul/copy call across many
+    walks, large ones keep one walk's buffers in cache from step to step.
+    If given, lost (one float64 per walk) accumulates the |psi|^2 removed by
+    the barrier.
+    """
+    xp = backend.array_module(psi)
+    spin_dim, ny, nx = psi.shape[-3:]
+    stack = psi.reshape(-1, spin_dim, ny, nx)
+    stack_scratch = scratch.reshape(-1, spin_dim, ny, nx)
+    flat = stack.reshape(len(stack), spin_dim, -1)
+    flat_scratch = stack_scratch.reshape(len(stack), spin_dim, -1)
+    coins = coin.reshape(-1, spin_dim, spin_dim)
+    per_group = max(1, _WALK_GROUP_BYTES // (2 * stack[0].nbytes))
+    groups = backend.bands(len(stack), -(-len(stack) // per_group))
+    cells = backend.bands(flat.shape[-1])
+
+    for walks in groups:
+        group = stack[walks]
+        group_coin = coins[walks] if len(coins) > 1 else coins[0]
+
+        def coin_band(cols):
+            xp.matmul(group_coin, flat[walks, :, cols], out=flat_scratch[walks, :, cols])
+
+        def shift_plane(d):
+            _roll_into(group[:, d], stack_scratch[walks, d], *offsets[d])
+
+        for _ in range(steps):
+            backend.parallel_map(coin_band, cells)
+            backend.parallel_map(shift_plane, range(spin_dim))
+            if lost is not None:
+                lost[walks] += xp.sum(xp.abs(group[..., barrier_row, blocked]) ** 2, axis=(-2, -1))
+            group[..., barrier_row, blocked] = 0
+
+
+# Working-set budget for one group of batched walks in _walk (psi + scratch).
+_WALK_GROUP_BYTES = 1 << 22
+
+# Rows / columns whose peak |psi|^2 is below this fraction of the global peak
+# count as empty (how far the wave is from the barrier, active windows).
+_EMPTY_TOL = 1e-30
+# k-points per band in _fast_forward (bounds the (m, 8, 8) temporaries).
+_FAST_FORWARD_BAND = 1 << 15
+# Default norm-check interval of complex64 walks in EVOLVE.
+_NORM_CHECK_EVERY = 100
+
+
+def _advance(psi, scratch, coin, offsets, barrier_row, blocked, steps,
+             fast_forward=False, active_region=False, lost=None):
+    """
+    _walk, optionally jumping the leading steps that cannot touch the barrier
+    and/or restricted to the active window (_walk_active).
+
+    Offsets move amplitude at most `reach` = max |dy| rows per step, so if
+    the nearest occupied row is `gap` rows from barrier_row the mask is a
+    no-op for the next (gap - 1) // reach steps and the walk is
+    translation-invariant until then.
+    """
+    if fast_forward and steps > 1:
+        gap = _barrier_gap(psi, barrier_row)
+        reach = max(abs(dy) for dy, _ in offsets)
+        free = min(steps, (gap - 1) // reach if reach else steps if gap else 0)
+        if free > 1:
+            _fast_forward(psi, coin, offsets, free)
+            steps -= free
+    walk = _walk_active if active_region else _walk
+    walk(psi, scratch, coin, offsets, barrier_row, blocked, steps, lost)
+
+
+def _barrier_gap(psi, barrier_row):
+    """Periodic row distance from barrier_row to the nearest occupied row."""
+    ny = psi.shape[1]
+    occupied = _occupied(psi)[0].nonzero()[0]
+    if occupied.size == 0:
+        return ny
+    dist = np.abs(occupied - barrier_row)
+    return int(np.minimum(dist, ny - dist).min())
+
+
+@profiled()
+def _occupied(psi):
+    """Host boolean masks of the rows and of the columns holding amplitude."""
+    xp = backend.array_module(psi)
+    peak = xp.max(xp.abs(psi) ** 2, axis=0)     # (ny, nx)
+    cut = _EMPTY_TOL * peak.max()
+    if not cut > 0:
+        return np.zeros(psi.shape[1], dtype=bool), np.zeros(psi.shape[2], dtype=bool)
+    return (backend.to_host(peak.max(axis=1) > cut),
+            backend.to_host(peak.max(axis=0) > cut))
+
+
+def _arc(occupied):
+    """(start, length) of the shortest circular interval covering every True entry."""
+    n = len(occupied)
+    idx = occupied.nonzero()[0]
+    if idx.size == 0:
+        return 0, 0
+    gaps = np.diff(np.append(idx, idx[0] + n))  # circular distance to the next occupied cell
+    k = int(np.argmax(gaps))
+    return int(idx[(k + 1) % idx.size]), n - int(gaps[k]) + 1
+
+
+def _grow(window, by, n):
+    """Window (lo, hi) widened by `by` on both sides; None (whole axis) once it hits an edge."""
+    if window is None or window[0] - by < 0 or window[1] + by > n:
+        return None
+    return window[0] - by, window[1] + by
+
+
+def _axis_slices(window, off):
+    """(destination slice, source slice, periodic roll) for shifting by off along one axis."""
+    if window is None:
+        return slice(None), slice(None), off
+    lo, hi = window
+    return slice(lo, hi), slice(lo - off, hi - off), 0
+
+
+@profiled()
+def _walk_active(psi, scratch, coin, offsets, barrier_row, blocked, steps, lost=None):
+    """
+    _walk restricted to the rows/columns that hold amplitude.
+
+    The occupied window along each axis (a circular arc, since the grid is
+    periodic) is measured once; sub-_EMPTY_TOL tails outside it are dropped
+    and the grid is rolled so the window sits away from the seam.  Each step
+    then applies the coin on the window grown by twice the offset reach and
+    shifts into the window grown by the reach, which becomes the new window.
+    An axis switches to whole-axis (periodic) stepping once its window
+    reaches the frame edge.
+    """
+    if steps <= 0:
+        return
+    xp = backend.array_module(psi)
+    spin_dim, ny, nx = psi.shape
+    reach = (max(abs(dy) for dy, _ in offsets), max(abs(dx) for _, dx in offsets))
+    occupied_axes = _occupied(psi)
+    if not occupied_axes[0].any():
+        return      # no amplitude left (e.g. nothing passed a collapse): nothing moves
+    window, roll = [], []
+    for occupied, n, r in zip(occupied_axes, (ny, nx), reach):
+        start, length = _arc(occupied)
+        if length + 4 * r >= n:
+            window.append(None)
+            roll.append(0)
+        else:
+            lo = (n - length) // 2
+            window.append((lo, lo + length))
+            roll.append((lo - start) % n)
+    if window == [None, None]:
+        _walk(psi, scratch, coin, offsets, barrier_row, blocked, steps, lost)
+        return
+
+    def move(dy, dx):
+        for d in range(spin_dim):
+            _roll_into(scratch[d], psi[d], dy, dx)
+        psi[...] = scratch
+
+    move(*roll)
+    if window[0] is not None:
+        psi[:, :window[0][0], :] = 0
+        psi[:, window[0][1]:, :] = 0
+    if window[1] is not None:
+        psi[:, :, :window[1][0]] = 0
+        psi[:, :, window[1][1]:] = 0
+    frame_row = (barrier_row + roll[0]) % ny
+    frame_blocked = xp.roll(blocked, roll[1])
+
+    def shift_plane(d):
+        (ty, sy, ry), (tx, sx, rx) = (_axis_slices(t, o) for t, o in zip(target, offsets[d]))
+        _roll_into(psi[d][ty, tx], scratch[d][sy, sx], ry, rx)
+
+    for done in range(steps):
+        source = [_grow(w, 2 * r, n) for w, r, n in zip(window, reach, (ny, nx))]
+        if source == [None, None]:
+            # the window now spans the grid: finish with the full kernel
+            _walk(psi, scratch, coin, offsets, frame_row, frame_blocked, steps - done, lost)
+            break
+        target = [None if src is None else _grow(w, r, n)
+                  for src, w, r, n in zip(source, window, reach, (ny, nx))]
+        ys, xs = (slice(*w) if w else slice(None) for w in source)
+        if source[1] is None:
+            # whole rows: each spin plane of the band is contiguous
+            xp.matmul(coin, psi[:, ys, :].reshape(spin_dim, -1),
+                      out=scratch[:, ys, :].reshape(spin_dim, -1))
+        else:
+            xp.matmul(coin, psi[:, ys, xs].transpose(1, 0, 2),
+                      out=scratch[:, ys, xs].transpose(1, 0, 2))
+        backend.parallel_map(shift_plane, range(spin_dim))
+        if lost is not None:
+            lost += xp.sum(xp.abs(psi[:, frame_row, frame_blocked]) ** 2)
+        psi[:, frame_row, frame_blocked] = 0
+        window = target
+
+    move(-roll[0], -roll[1])
+
+
+@profiled()
+def _fast_forward(psi, coin, offsets, steps):
+    """
+    Free walk on psi (spin_dim, ny, nx) in place via its Fourier symbol.
+
+    One step is U(k) = diag(exp(-2 pi i (ky*dy/ny + kx*dx/nx)))_d @ coin per
+    wave vector, so `steps` steps are U(k)^steps, applied by binary powering
+    (log2(steps) batched 8x8 products) on bands of k-rows.
+    """
+    xp = backend.array_module(psi)
+    spin_dim, ny, nx = psi.shape
+    spec = xp.fft.fft2(psi, axes=(1, 2))
+    ky = xp.arange(ny)
+    kx = xp.arange(nx)
+    phase_y = xp.stack([xp.exp(-2j * np.pi * ky * (dy % ny) / ny) for dy, _ in offsets])
+    phase_x = xp.stack([xp.exp(-2j * np.pi * kx * (dx % nx) / nx) for _, dx in offsets])
+    phase_y = phase_y.astype(psi.dtype)
+    phase_x = phase_x.astype(psi.dtype)
+    rows_per_band = max(1, _FAST_FORWARD_BAND // nx)
+
+    def band(rows):
+        # (m, spin_dim, spin_dim) symbols and (m, spin_dim, 1) vectors for this band
+        phase = (phase_y[:, rows, None] * phase_x[:, None, :]).reshape(spin_dim, -1).T
+        u = phase[:, :, None] * coin[None, :, :]
+        vec = spec[:, rows, :].reshape(spin_dim, -1).T[:, :, None]
+        n = steps
+        while n:
+            if n & 1:
+                vec = u @ vec
+            n >>= 1
+            if n:
+                u = u @ u
+        spec[:, rows, :] = vec[:, :, 0].T.reshape(spin_dim, -1, nx)
+
+    backend.parallel_map(band, backend.bands(ny, -(-ny // rows_per_band)))
+    psi[...] = xp.fft.ifft2(spec, axes=(1, 2))
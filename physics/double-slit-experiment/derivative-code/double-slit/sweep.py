@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Parameter sweeps over the double-slit model (Grid / WavefunctionInitial /
+QWalkRunner / CoinOperator) without editing main.py between runs.
+
+    python sweep.py -o sweep.npy --slit_width 2 3 4 --slit_spacing 8 12 16 \
+                    --collapse_barrier 0 1 --seed 1 2 3
+
+Every configuration is an independent run, so they are fanned out across a
+process pool.  Results go to one structured .npy file: one column per swept
+parameter plus an `intensity` column holding the detector row.  The file is
+preallocated and memory-mapped; each worker writes its record straight into
+the shared mapping, so nothing but the parameters travels between processes
+and finished rows are on disk as soon as they are flushed.
+
+    res = load_sweep("sweep.npy")
+    res["slit_width"], res["intensity"]      # (n,), (n, nx)
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import array_backend
+from array_backend import to_host
+from double_slit_helpers import CoinOperator, Grid, QWalkRunner, WavefunctionInitial
+from quantum_walk_blocks import EVOLVE
+
+# Same configuration as main.py; any of these can be swept.
+DEFAULTS = {
+    # Grid
+    "nx": 201,
+    "ny": 201,
+    "Lx": 201.0,
+    "Ly": 201.0,
+    "barrier_y_phys": 0.0,
+    "detector_y_phys": 50.0,
+    "slit_width": 4,
+    "slit_spacing": 12,
+    # WavefunctionInitial
+    "src_y": -70,
+    "sigma_y": 10,
+    # QWalkRunner
+    "steps_to_barrier": 50,
+    "steps_after_barrier": 50,
+    "collapse_barrier": False,
+    # CoinOperator: seed None -> DFT-8 coin, otherwise a seeded random unitary
+    "seed": None,
+    # EVOLVE: complex64 halves memory / bandwidth for exploratory sweeps
+    "dtype": "complex128",
+}
+
+GRID_FIELDS = ("nx", "ny", "Lx", "Ly", "barrier_y_phys", "detector_y_phys", "slit_width", "slit_spacing")
+
+OFFSETS_8DIR = [(-1, 0), (-1, +1), (0, +1), (+1, +1), (+1, 0), (+1, -1), (0, -1), (-1, -1)]
+
+
+def parameter_grid(**axes):
+    """Cartesian product of the given value lists, as a list of parameter dicts."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def make_coin(seed):
+    """
+    CoinOperator with its Matrix built from the SSoT construction_method:
+    "DFT" for seed None, else a "random_unitary" drawn from the seed.
+    """
+    coin = CoinOperator(seed=seed, construction_method="DFT" if seed is None else "random_unitary")
+    coin.Matrix = coin.ConstructedMatrix
+    return coin
+
+
+def run_point(params):
+    """Run one configuration and return its detector-row intensity, shape (nx,)."""
+    p = dict(DEFAULTS, **params)
+    grid = Grid(boundary_conditions="periodic", **{k: p[k] for k in GRID_FIELDS})
+    wfi = WavefunctionInitial(src_y=p["src_y"], sigma_y=p["sigma_y"], kx=0.0, ky=0.0)
+    wfi.Grid = grid
+    coin = make_coin(p["seed"])
+    runner = QWalkRunner(steps_to_barrier=p["steps_to_barrier"],
+                         steps_after_barrier=p["steps_after_barrier"],
+                         collapse_barrier=p["collapse_barrier"])
+    # QWalkRunner.final_wavefunction's formula only passes EVOLVE four
+    # arguments (default coin and slits), so pass this grid's geometry here.
+    psi = EVOLVE(wfi.psi_init, runner.steps_to_barrier, runner.steps_after_barrier,
+                 bool(runner.collapse_barrier), coin.Matrix, OFFSETS_8DIR,
+                 grid.barrier_row, grid.slit1_xstart, grid.slit1_xend,
+                 grid.slit2_xstart, grid.slit2_xend, dtype=p["dtype"])
+    return np.sum(np.abs(to_host(psi[grid.detector_row])) ** 2, axis=-1)
+
+
+def _column_dtype(values):
+    present = [v for v in values if v is not None]
+    if len(present) == len(values):
+        if all(isinstance(v, (bool, np.bool_)) for v in present):
+            return np.bool_
+        if all(isinstance(v, (int, np.integer)) for v in present):
+            return np.int64
+    if all(isinstance(v, (int, float, np.number)) for v in present):
+        return np.float64      # None is stored as NaN
+    return f"U{max(len(str(v)) for v in present)}"
+
+
+def _run_into(path, index, params):
+    """Worker: run one point and write its record into the shared results file."""
+    intensity = run_point(params)
+    results = np.load(path, mmap_mode="r+")
+    results["intensity"][index] = intensity
+    results.flush()
+    return index
+
+
+def run_sweep(points, out_path, workers=None, progress=True):
+    """
+    Run every parameter dict in `points` and write the results to the
+    structured .npy file `out_path`.  All points must share the same nx.
+    Returns the results as a read-only memory map.
+
+    Pool workers run the walk kernels on one thread each (the pool already
+    fills the cores) unless QWALK_THREADS is set explicitly.
+    """
+    points = [dict(p) for p in points]
+    nx = {dict(DEFAULTS, **p)["nx"] for p in points}
+    if len(nx) != 1:
+        raise ValueError(f"All sweep points must share one nx (got {sorted(nx)})")
+    nx = nx.pop()
+
+    swept = sorted({k for p in points for k in p})
+    unknown = [k for k in swept if k not in DEFAULTS]
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {unknown}")
+    columns = {k: [dict(DEFAULTS, **p)[k] for p in points] for k in swept}
+    dtype = [(k, _column_dtype(v)) for k, v in columns.items()] + [("intensity", np.float64, (nx,))]
+
+    results = np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(len(points),))
+    for k, values in columns.items():
+        results[k] = [np.nan if v is None else v for v in values]
+    results["intensity"] = np.nan
+    results.flush()
+    del results
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(points) == 1:
+        done = (_run_into(out_path, i, p) for i, p in enumerate(points))
+        for n, _ in enumerate(done, 1):
+            if progress:
+                print(f"[{n}/{len(points)}] done")
+    else:
+        threads = int(os.environ.get("QWALK_THREADS", "0")) or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(points)),
+                                 initializer=array_backend.set_cpu_threads,
+                                 initargs=(threads,)) as pool:
+            futures = [pool.submit(_run_into, out_path, i, p) for i, p in enumerate(points)]
+            for n, future in enumerate(as_completed(futures), 1):
+                index = future.result()
+                if progress:
+                    print(f"[{n}/{len(points)}] point {index} done")
+    return load_sweep(out_path)
+
+
+def load_sweep(path):
+    """Open a sweep results file (columns by name, e.g. res['intensity'])."""
+    return np.load(path, mmap_mode="r")
+
+
+def _parse_value(text, default):
+    if text.lower() == "none":
+        return None
+    if isinstance(default, bool):
+        return text.lower() in ("1", "true", "yes")
+    if isinstance(default, str):
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep double-slit parameters across a process pool.")
+    parser.add_argument("-o", "--output", default="sweep.npy", help="Structured .npy results file.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    for name, default in DEFAULTS.items():
+        parser.add_argument(f"--{name}", nargs="+", metavar="V",
+                            help=f"values to sweep (default {default})")
+    args = parser.parse_args()
+
+    axes = {name: [_parse_value(v, DEFAULTS[name]) for v in getattr(args, name)]
+            for name in DEFAULTS if getattr(args, name) is not None}
+    points = parameter_grid(**axes)
+    results = run_sweep(points, args.output, workers=args.jobs)
+    peak = results["intensity"].argmax(axis=1)
+    for i, p in enumerate(points):
+        print(p, "-> detector peak at x =", int(peak[i]))
+    print(f"Wrote {len(points)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 #!/usr/bin/env python3
 
-import cupy as cp
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# numpy or cupy (and the CPU thread pool) come from the walk engine's
+# array_backend, so QWALK_BACKEND / QWALK_THREADS apply here too and the
+# script runs on CPU-only nodes.
+WALK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "derivative-code", "double-slit")
+if WALK_DIR not in sys.path:
+    sys.path.insert(0, WALK_DIR)
+import array_backend as backend  # noqa: E402
+from array_backend import to_host  # noqa: E402
+
+xp = backend.xp
+
 ##############################################################################
 # 8-DIRECTION QUANTUM WALK (GPU) WITH LOCAL UNITARY COIN
 # Produces 4 plots: Full Wave (2D & 1D) vs. Collapsed Wave (2D & 1D)
@@ -69,7 +82,7 @@ def make_coin_8():
     # SVD => force unitarity
     U, s, Vh = np.linalg.svd(mat, full_matrices=True)
     coin = U @ Vh
-    return cp.array(coin, dtype=cp.complex128)
+    return xp.array(coin, dtype=xp.complex128)
 
 coin_8 = make_coin_8()  # global coin
 
@@ -93,7 +106,11 @@ def coin_step(psi_in):
     # flatten => (ny*nx, 8)
     flat_in = psi_in.reshape((ny_*nx_, 8))
     # spin_out = spin_in @ coin_8.T  (or coin_8 @ spin_in, depending on your definition)
-    flat_out = flat_in @ coin_8.T
+    # one band of sites per CPU thread (a single band on the GPU)
+    flat_out = xp.empty_like(flat_in)
+    def coin_band(rows):
+        xp.matmul(flat_in[rows], coin_8.T, out=flat_out[rows])
+    backend.parallel_map(coin_band, backend.bands(ny_*nx_))
     return flat_out.reshape((ny_, nx_, 8))
 
 ##############################################################################
@@ -101,11 +118,14 @@ def coin_step(psi_in):
 ##############################################################################
 def shift_step(psi_in):
     ny_, nx_, _ = psi_in.shape
-    psi_out = cp.zeros_like(psi_in)
-    for d, (ofy, ofx) in enumerate(direction_offsets):
-        shifted = cp.roll(psi_in[:,:,d], shift=ofy, axis=0)
-        shifted = cp.roll(shifted, shift=ofx, axis=1)
+    psi_out = xp.zeros_like(psi_in)
+    # one direction per task on the CPU thread pool
+    def shift_plane(d):
+        ofy, ofx = direction_offsets[d]
+        shifted = xp.roll(psi_in[:,:,d], shift=ofy, axis=0)
+        shifted = xp.roll(shifted, shift=ofx, axis=1)
         psi_out[:,:,d] = shifted
+    backend.parallel_map(shift_plane, range(len(direction_offsets)))
     return psi_out
 
 ##############################################################################
@@ -131,16 +151,16 @@ def one_timestep(psi_in):
 # MEASUREMENT AT BARRIER => collapse amplitude in barrier row
 ##############################################################################
 def measure_collapse_barrier(psi_in):
-    psi_out = cp.zeros_like(psi_in)
+    psi_out = xp.zeros_like(psi_in)
     # sum intensities across directions
-    row_intens = cp.sum(cp.abs(psi_in[barrier_row,:,:])**2, axis=-1)
-    keep = cp.zeros_like(row_intens)
+    row_intens = xp.sum(xp.abs(psi_in[barrier_row,:,:])**2, axis=-1)
+    keep = xp.zeros_like(row_intens)
     keep[slit1_xstart:slit1_xend] = row_intens[slit1_xstart:slit1_xend]
     keep[slit2_xstart:slit2_xend] = row_intens[slit2_xstart:slit2_xend]
-    m = cp.max(keep)
+    m = xp.max(keep)
     if m>1e-30:
         keep /= m
-    amps = cp.sqrt(keep)
+    amps = xp.sqrt(keep)
     # Instead of distributing amps among all directions => only put it in direction=0 (say "up")
     # direction=0 is the up channel, for example:
     d_up = 0
@@ -151,7 +171,7 @@ def measure_collapse_barrier(psi_in):
 # UTILS
 ##############################################################################
 def norm_sq(psi_in):
-    return cp.sum(cp.abs(psi_in)**2)
+    return xp.sum(xp.abs(psi_in)**2)
 
 ##############################################################################
 # MAIN RUN
@@ -164,12 +184,12 @@ def run_experiment(collapse=False):
     4) Evolve 'steps_after_barrier' steps
     """
     # Initial wave
-    psi0 = cp.zeros((ny,nx,8), dtype=cp.complex128)
+    psi0 = xp.zeros((ny,nx,8), dtype=xp.complex128)
     src_y = 40  # near bottom
     sigma_y = 5.0
     for y in range(ny):
         dy = y - src_y
-        amp = cp.exp(-0.5*(dy/sigma_y)**2)
+        amp = xp.exp(-0.5*(dy/sigma_y)**2)
         # wide in x => fill entire row in all directions
         for d in range(8):
             psi0[y,:,d] = amp
@@ -196,19 +216,19 @@ def main():
     print(f"Final norm (collapsed)={norm_sq(psi_coll).item():.3g}")
 
     # measure intensity at the detector row => sum over directions => shape=(nx,)
-    int_full = cp.sum(cp.abs(psi_full[detector_row,:,:])**2, axis=-1)
-    int_coll= cp.sum(cp.abs(psi_coll[detector_row,:,:])**2, axis=-1)
+    int_full = xp.sum(xp.abs(psi_full[detector_row,:,:])**2, axis=-1)
+    int_coll= xp.sum(xp.abs(psi_coll[detector_row,:,:])**2, axis=-1)
 
     # normalize each
-    int_full /= cp.max(int_full)
-    int_coll /= cp.max(int_coll)
-    int_full_np = int_full.get()
-    int_coll_np = int_coll.get()
+    int_full /= xp.max(int_full)
+    int_coll /= xp.max(int_coll)
+    int_full_np = to_host(int_full)
+    int_coll_np = to_host(int_coll)
 
     # BUILD 2D "SCREEN" => tile 1D intensity
     screen_height = 60
-    screen_full = cp.tile(int_full, (screen_height,1)).get()
-    screen_coll = cp.tile(int_coll, (screen_height,1)).get()
+    screen_full = to_host(xp.tile(int_full, (screen_height,1)))
+    screen_coll = to_host(xp.tile(int_coll, (screen_height,1)))
 
     # Now produce the 4 plots:
     # (1) Full Wave - 2D screen
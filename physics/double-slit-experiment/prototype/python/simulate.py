@@ -1,7 +1,30 @@
-import cupy as cp
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# numpy or cupy comes from the walk engine's array_backend (QWALK_BACKEND:
+# CuPy only when a GPU is present), and the CPU FFTs use its QWALK_THREADS.
+WALK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "derivative-code", "double-slit")
+if WALK_DIR not in sys.path:
+    sys.path.insert(0, WALK_DIR)
+import array_backend as backend  # noqa: E402
+from array_backend import to_host  # noqa: E402
+
+xp = backend.xp
+_GPU = xp is not np
+if _GPU:
+    import cupyx.scipy.fft as xfft
+else:
+    try:
+        import scipy.fft as xfft
+    except ImportError:
+        xfft = None
+
+# numpy.fft only accepts out= from NumPy 2.0 on.
+_NUMPY_FFT_OUT = int(np.__version__.split(".")[0]) >= 2
+
 ##############################################################################
 #                             SPLIT OPERATOR 2D                              #
 ##############################################################################
@@ -14,9 +37,9 @@ Lx, Ly = 20.0, 20.0   # physical size of the region (for wavevectors)
 dx = Lx / nx
 dy = Ly / ny
 
-xvals = cp.linspace(-Lx/2, Lx/2 - dx, nx)
-yvals = cp.linspace(-Ly/2, Ly/2 - dy, ny)
-X, Y = cp.meshgrid(xvals, yvals)  # shape (ny, nx)
+xvals = xp.linspace(-Lx/2, Lx/2 - dx, nx)
+yvals = xp.linspace(-Ly/2, Ly/2 - dy, ny)
+X, Y = xp.meshgrid(xvals, yvals)  # shape (ny, nx)
 
 # Times
 dt = 0.02
@@ -40,7 +63,7 @@ slit1_center = -slit_spacing / 2
 slit2_center =  slit_spacing / 2
 
 def make_potential():
-    V = cp.zeros((ny, nx), dtype=cp.float64)
+    V = xp.zeros((ny, nx), dtype=xp.float64)
 
     # Horizontal barrier near y=0
     mask_barrier = (Y >= barrier_y_min) & (Y <= barrier_y_max)
@@ -69,15 +92,15 @@ V = make_potential()
 kx_vals = 2.0 * np.pi * np.fft.fftfreq(nx, d=dx)
 ky_vals = 2.0 * np.pi * np.fft.fftfreq(ny, d=dy)
 
-kx_vals = cp.array(kx_vals)
-ky_vals = cp.array(ky_vals)
+kx_vals = xp.array(kx_vals)
+ky_vals = xp.array(ky_vals)
 
-KX, KY = cp.meshgrid(kx_vals, ky_vals)  # shape (ny, nx)
+KX, KY = xp.meshgrid(kx_vals, ky_vals)  # shape (ny, nx)
 k2 = (KX**2 + KY**2)
 
 # Exponential factor for the free propagation step: e^{- i (1/2) k^2 dt}
 def kinetic_phase(k2, dt):
-    return cp.exp(-0.5j * k2 * dt)
+    return xp.exp(-0.5j * k2 * dt)
 
 # ---------------------------
 # Initialize wavefunction
@@ -91,37 +114,71 @@ def make_initial_wave():
     k0 = 2.0  # initial upward wave number
 
     # Make a float array, then cast to complex
-    psi = cp.exp(-((X)**2 + (Y - y0)**2) / (2*sigma**2)).astype(cp.complex128)
+    psi = xp.exp(-((X)**2 + (Y - y0)**2) / (2*sigma**2)).astype(xp.complex128)
     
     # Multiply by plane-wave factor
-    plane_factor = cp.exp(1j * k0 * (Y - y0))
+    plane_factor = xp.exp(1j * k0 * (Y - y0))
     psi *= plane_factor
 
     # Normalize
-    norm = cp.sqrt(cp.sum(cp.abs(psi)**2))
+    norm = xp.sqrt(xp.sum(xp.abs(psi)**2))
     psi /= norm
     return psi
 
 # ---------------------------
 # SPLIT STEP: one time step
 # ---------------------------
-def split_step(psi, V, dt):
+class SplitOperatorPropagator:
     """
     i d/dt Psi = -1/2 laplacian(Psi) + V Psi
     => Psi_{new} ~ e^{-i V dt/2} FFT -> e^{-i (k^2/2) dt} -> IFFT -> e^{-i V dt/2}
-    """
-    # 1) half-step in potential
-    psi *= cp.exp(-0.5j * V * dt)
 
-    # 2) full-step in kinetic
-    psi_k = cp.fft.fft2(psi)
-    psi_k *= kinetic_phase(k2, dt)
-    psi = cp.fft.ifft2(psi_k)
+    Both phase arrays are computed once per (V, dt), so a step is two FFTs
+    and three complex multiplies with no full-grid exp.  step() works in
+    place on psi; the FFTs reuse a cuFFT plan on the GPU, or run with
+    `workers` threads (default: array_backend's CPU threads) through
+    scipy.fft (numpy.fft otherwise, writing back into psi).
+    """
 
-    # 3) half-step in potential
-    psi *= cp.exp(-0.5j * V * dt)
+    def __init__(self, V, k2, dt, workers=None):
+        self.potential_half = xp.exp(-0.5j * V * dt)
+        self.kinetic = kinetic_phase(k2, dt)
+        self.workers = workers or backend.cpu_threads()
+        self.plan = None
+        if _GPU:
+            self.plan = xfft.get_fft_plan(self.kinetic, axes=(0, 1), value_type="C2C")
+
+    def _fft2(self, psi, inverse=False):
+        if _GPU:
+            fn = xfft.ifft2 if inverse else xfft.fft2
+            return fn(psi, overwrite_x=True, plan=self.plan)
+        if xfft is not None:
+            fn = xfft.ifft2 if inverse else xfft.fft2
+            return fn(psi, overwrite_x=True, workers=self.workers)
+        fn = np.fft.ifft2 if inverse else np.fft.fft2
+        if _NUMPY_FFT_OUT:
+            return fn(psi, out=psi)
+        psi[...] = fn(psi)
+        return psi
+
+    def step(self, psi):
+        """Advance psi by one dt (in place where the FFT allows) and return it."""
+        # 1) half-step in potential
+        psi *= self.potential_half
+
+        # 2) full-step in kinetic
+        psi_k = self._fft2(psi)
+        psi_k *= self.kinetic
+        psi = self._fft2(psi_k, inverse=True)
+
+        # 3) half-step in potential
+        psi *= self.potential_half
+
+        return psi
 
-    return psi
+def split_step(psi, V, dt):
+    """One step with a throwaway propagator; loops should reuse a SplitOperatorPropagator."""
+    return SplitOperatorPropagator(V, k2, dt).step(psi)
 
 # ---------------------------
 # Collapse at Slits
@@ -132,11 +189,11 @@ def collapse_wave_at_slits(psi, V):
     but only keep the amplitude in the slits (where V=0). Everything else zeroed.
     We'll also normalize that amplitude within the slit region.
     """
-    psi_host = psi.get()  # move to CPU to handle masking easily
-    V_host = V.get()
+    psi_host = to_host(psi)  # move to CPU to handle masking easily
+    V_host = to_host(V)
 
     # barrier region
-    mask_barrier = (Y.get() >= barrier_y_min) & (Y.get() <= barrier_y_max)
+    mask_barrier = (to_host(Y) >= barrier_y_min) & (to_host(Y) <= barrier_y_max)
     # slit region is where V=0 in that barrier
     mask_slit = (mask_barrier) & (np.abs(V_host) < 1e-12)
 
@@ -145,7 +202,7 @@ def collapse_wave_at_slits(psi, V):
     if slit_vals.size == 0:
         # no slit region found, just return zeros
         new_host = np.zeros_like(psi_host, dtype=np.complex128)
-        return cp.array(new_host)
+        return xp.array(new_host)
 
     max_val = slit_vals.max()
     new_host = np.zeros_like(psi_host, dtype=np.complex128)
@@ -153,7 +210,7 @@ def collapse_wave_at_slits(psi, V):
         # put normalized intensities only in the slit region
         new_host[mask_slit] = intensities[mask_slit] / max_val
 
-    return cp.array(new_host)
+    return xp.array(new_host)
 
 # ---------------------------
 # MAIN RUN
@@ -161,14 +218,15 @@ def collapse_wave_at_slits(psi, V):
 def run_experiment(collapse_at_slits=False):
     print(f"\n=== Running Experiment: collapse={collapse_at_slits} ===")
     psi = make_initial_wave()
+    propagator = SplitOperatorPropagator(V, k2, dt)
 
     # Evolve until wave reaches barrier
     print("Evolving to barrier...")
     nsteps_to_barrier = 400
     for step in range(nsteps_to_barrier):
-        psi = split_step(psi, V, dt)
+        psi = propagator.step(psi)
         if step % 100 == 0:
-            amp = cp.sum(cp.abs(psi)**2).item()
+            amp = xp.sum(xp.abs(psi)**2).item()
             print(f"  step {step:4d}  total |psi|^2 = {amp:.2e}")
 
     if collapse_at_slits:
@@ -179,9 +237,9 @@ def run_experiment(collapse_at_slits=False):
     print("Continuing from barrier to detector...")
     nsteps_to_detector = 600
     for step in range(nsteps_to_detector):
-        psi = split_step(psi, V, dt)
+        psi = propagator.step(psi)
         if step % 100 == 0:
-            amp = cp.sum(cp.abs(psi)**2).item()
+            amp = xp.sum(xp.abs(psi)**2).item()
             print(f"  step {step:4d}  total |psi|^2 = {amp:.2e}")
 
     # Suppose we detect around y = +5
@@ -189,8 +247,8 @@ def run_experiment(collapse_at_slits=False):
     idx_det = int((detector_y + Ly/2.0)/dy)
 
     row_psi = psi[idx_det, :]
-    intensity = cp.abs(row_psi)**2
-    intensity_np = intensity.get()
+    intensity = xp.abs(row_psi)**2
+    intensity_np = to_host(intensity)
     intensity_max = intensity_np.max()
     if intensity_max < 1e-30:
         intensity_max = 1.0
@@ -201,7 +259,7 @@ def run_experiment(collapse_at_slits=False):
     screen_image = np.tile(norm_intensity, (screen_height, 1))
 
     return {
-        "psi": psi.get(),
+        "psi": to_host(psi),
         "intensity": intensity_np,
         "screen_image": screen_image,
         "detector_index": idx_det
@@ -1,9 +1,22 @@
 #!/usr/bin/env python3
 
-import cupy as cp
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# numpy or cupy (and the CPU thread pool) come from the walk engine's
+# array_backend, so QWALK_BACKEND / QWALK_THREADS apply here too and the
+# script runs on CPU-only nodes.
+WALK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "derivative-code", "double-slit")
+if WALK_DIR not in sys.path:
+    sys.path.insert(0, WALK_DIR)
+import array_backend as backend  # noqa: E402
+from array_backend import to_host  # noqa: E402
+
+xp = backend.xp
+
 ##############################################################################
 # CLASSES
 ##############################################################################
@@ -42,9 +55,10 @@ class Grid:
 
 class CoinOperator:
     """
-    Stores the 8x8 matrix for the local coin operation on the GPU.
+    Stores the 8x8 matrix for the local coin operation on the array backend
+    (the GPU when array_backend picked CuPy).
     We replicate the 'make_coin_8()' approach from the first script (CPU-based
-    random seed + SVD => unify), then store the result as a CuPy array.
+    random seed + SVD => unify), then store the result as a backend array.
     """
     def __init__(self, seed=42):
         self.matrix = self._make_coin_8_cpu_then_gpu(seed)
@@ -57,7 +71,7 @@ class CoinOperator:
           2. mat = np.ones(...) - alpha on the diagonal
           3. small random
           4. svd => unitarize
-          5. convert to cp array
+          5. convert to a backend (xp) array
         """
         np.random.seed(seed)
         mat = np.ones((8,8), dtype=np.complex128)
@@ -70,8 +84,8 @@ class CoinOperator:
         # Force unitarity via SVD
         U, s, Vh = np.linalg.svd(mat, full_matrices=True)
         coin_cpu = U @ Vh
-        # Now store on GPU
-        return cp.array(coin_cpu, dtype=cp.complex128)
+        # Now store on the backend
+        return xp.array(coin_cpu, dtype=xp.complex128)
 
     def apply(self, spin_in):
         """
@@ -83,7 +97,7 @@ class CoinOperator:
 class Wavefunction:
     """
     An immutable snapshot of the wavefunction at a given time:
-      psi.shape = (ny, nx, 8), stored on the GPU (cp.complex128).
+      psi.shape = (ny, nx, 8), stored on the array backend (xp.complex128).
 
     We'll have a method evolve_one_step(...) that returns a NEW Wavefunction.
     """
@@ -98,9 +112,9 @@ class Wavefunction:
         (+1, +1),  # down-right
     ]
 
-    def __init__(self, grid: Grid, array_psi: cp.ndarray):
+    def __init__(self, grid: Grid, array_psi: xp.ndarray):
         """
-        array_psi is shape=(ny,nx,8), dtype=cp.complex128
+        array_psi is shape=(ny,nx,8), dtype=xp.complex128
         """
         self.grid = grid
         # We'll store a reference, but treat as immutable outside
@@ -113,14 +127,14 @@ class Wavefunction:
           - src_y=40, sigma_y=5
           - wide in x, same amplitude in all directions
         """
-        psi0 = cp.zeros((grid.ny, grid.nx, 8), dtype=cp.complex128)
+        psi0 = xp.zeros((grid.ny, grid.nx, 8), dtype=xp.complex128)
         src_y = 40
         sigma_y = 5.0
 
-        # We do it in pure CuPy:
+        # We do it in pure xp:
         for y in range(grid.ny):
             dy = y - src_y
-            amp = cp.exp(-0.5*(dy/sigma_y)**2)
+            amp = xp.exp(-0.5*(dy/sigma_y)**2)
             # wide in x => fill entire row for all directions
             for d in range(8):
                 psi0[y, :, d] = amp
@@ -144,15 +158,22 @@ class Wavefunction:
         # flatten (ny*nx, 8)
         psi_flat = self.psi.reshape((-1, 8))
         # multiply from the left by coin.matrix => shape stays (ny*nx, 8)
-        psi_coin_flat = psi_flat @ coin.matrix.T
+        # one band of sites per CPU thread (a single band on the GPU)
+        psi_coin_flat = xp.empty_like(psi_flat)
+        def coin_band(rows):
+            xp.matmul(psi_flat[rows], coin.matrix.T, out=psi_coin_flat[rows])
+        backend.parallel_map(coin_band, backend.bands(psi_flat.shape[0]))
         psi_coin = psi_coin_flat.reshape((ny, nx, 8))
 
         # 2) Shift step
-        psi_shift = cp.zeros_like(psi_coin)
-        for d, (ofy, ofx) in enumerate(self.DIRECTION_OFFSETS):
-            shifted_dir = cp.roll(psi_coin[:,:,d], shift=ofy, axis=0)
-            shifted_dir = cp.roll(shifted_dir, shift=ofx, axis=1)
+        psi_shift = xp.zeros_like(psi_coin)
+        # one direction per task on the CPU thread pool
+        def shift_plane(d):
+            ofy, ofx = self.DIRECTION_OFFSETS[d]
+            shifted_dir = xp.roll(psi_coin[:,:,d], shift=ofy, axis=0)
+            shifted_dir = xp.roll(shifted_dir, shift=ofx, axis=1)
             psi_shift[:,:,d] = shifted_dir
+        backend.parallel_map(shift_plane, range(len(self.DIRECTION_OFFSETS)))
 
         # 3) Barrier or measurement
         if measure_barrier:
@@ -186,18 +207,18 @@ class Wavefunction:
         br = self.grid.barrier_row
 
         # sum intensities across directions for that row
-        row_intens = cp.sum(cp.abs(psi_in[br,:,:])**2, axis=-1)  # shape=(nx,)
+        row_intens = xp.sum(xp.abs(psi_in[br,:,:])**2, axis=-1)  # shape=(nx,)
 
-        keep = cp.zeros_like(row_intens)
+        keep = xp.zeros_like(row_intens)
         s1s, s1e = self.grid.slit1_xstart, self.grid.slit1_xend
         s2s, s2e = self.grid.slit2_xstart, self.grid.slit2_xend
         keep[s1s:s1e] = row_intens[s1s:s1e]
         keep[s2s:s2e] = row_intens[s2s:s2e]
 
-        m = cp.max(keep)
+        m = xp.max(keep)
         if m > 1e-30:
             keep /= m
-        amps = cp.sqrt(keep)
+        amps = xp.sqrt(keep)
 
         psi_out[br,:,:] = 0
         # direction=0 is "up" – just put amplitude there
@@ -208,7 +229,7 @@ class Wavefunction:
         """
         Returns the sum of |psi|^2 over all y,x,d (on GPU).
         """
-        return cp.sum(cp.abs(self.psi)**2)
+        return xp.sum(xp.abs(self.psi)**2)
 
     def detector_row_intensity(self):
         """
@@ -216,7 +237,7 @@ class Wavefunction:
         """
         dr = self.grid.detector_row
         row_amp = self.psi[dr, :, :]  # shape=(nx,8)
-        row_intens = cp.sum(cp.abs(row_amp)**2, axis=-1)  # shape=(nx,)
+        row_intens = xp.sum(xp.abs(row_amp)**2, axis=-1)  # shape=(nx,)
         return row_intens
 
 
@@ -300,15 +321,15 @@ def main():
     int_coll = wave_coll.detector_row_intensity()
 
     # 7) Normalize each (on GPU), then bring to CPU
-    mf = cp.max(int_full)
+    mf = xp.max(int_full)
     if mf > 1e-30:
         int_full /= mf
-    mc = cp.max(int_coll)
+    mc = xp.max(int_coll)
     if mc > 1e-30:
         int_coll /= mc
 
-    int_full_cpu = int_full.get()
-    int_coll_cpu = int_coll.get()
+    int_full_cpu = to_host(int_full)
+    int_coll_cpu = to_host(int_coll)
 
     # 8) Build 2D "screen" => tile 1D intensity. For plotting we can do it in NumPy:
     screen_height = 60
@@ -17,10 +17,8 @@ def GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION(src_y, sigma_y, ny, nx, spin_di
     gauss = np.exp(-0.5 * ((y_coords - src_y) / sigma_y)**2)
     gauss /= np.sqrt(np.sum(np.abs(gauss)**2))  # normalize 1D in y
 
-    for x in range(nx):
-        for s in range(spin_dim):
-            for y_index in range(ny):
-                psi[y_index, x, s] = gauss[y_index]
+    # Broadcast the y-profile across every x column and spin direction
+    psi[...] = gauss[:, np.newaxis, np.newaxis]
     return psi
 
 def MATMUL(psi_in, coin_matrix):
@@ -29,13 +27,9 @@ def MATMUL(psi_in, coin_matrix):
     psi_in shape: (ny, nx, 8), coin_matrix shape: (8,8).
     We apply coin_matrix^T to each (ny,nx) site if that's the convention.
     """
-    ny, nx, spin_dim = psi_in.shape
-    out = np.zeros_like(psi_in)
-    # Apply coin_matrix^T to the spin dimension
-    for y_idx in range(ny):
-        for x_idx in range(nx):
-            out[y_idx, x_idx, :] = coin_matrix.T @ psi_in[y_idx, x_idx, :]
-    return out
+    # Apply coin_matrix^T to the spin dimension of every site at once:
+    # (coin_matrix^T @ v) == (v @ coin_matrix) for each site vector v.
+    return psi_in @ coin_matrix
 
 def SHIFT(psi_in, offsets):
     """
@@ -56,13 +50,11 @@ def APPLY_BARRIER(psi_in, barrier_row, slit1_xstart, slit1_xend,
     Zero out wavefunction in the barrier_row except within the two slit ranges.
     """
     psi_out = np.copy(psi_in)
-    ny, nx, spin_dim = psi_out.shape
-    for x in range(nx):
-        in_slit1 = (slit1_xstart <= x < slit1_xend)
-        in_slit2 = (slit2_xstart <= x < slit2_xend)
-        if not (in_slit1 or in_slit2):
-            # Zero out at barrier row
-            psi_out[barrier_row, x, :] = 0
+    x = np.arange(psi_out.shape[1])
+    in_slit1 = (slit1_xstart <= x) & (x < slit1_xend)
+    in_slit2 = (slit2_xstart <= x) & (x < slit2_xend)
+    # Zero out at barrier row
+    psi_out[barrier_row, ~(in_slit1 | in_slit2), :] = 0
     return psi_out
 
 def COLLAPSE_BARRIER(psi_in, barrier_row, slit1_xstart, slit1_xend,
@@ -108,6 +100,44 @@ def is_unitary(m):
     return np.allclose(m @ m.conj().T, np.eye(m.shape[0]))
 
 
+###############################################################################
+#     Loop reference versions (kept for parity checks, see PAPER_04-parity.py) #
+###############################################################################
+
+def _reference_GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION(src_y, sigma_y, ny, nx, spin_dim):
+    psi = np.zeros((ny, nx, spin_dim), dtype=np.complex128)
+    y_coords = np.arange(ny) - (ny // 2)
+    gauss = np.exp(-0.5 * ((y_coords - src_y) / sigma_y)**2)
+    gauss /= np.sqrt(np.sum(np.abs(gauss)**2))  # normalize 1D in y
+
+    for x in range(nx):
+        for s in range(spin_dim):
+            for y_index in range(ny):
+                psi[y_index, x, s] = gauss[y_index]
+    return psi
+
+def _reference_MATMUL(psi_in, coin_matrix):
+    ny, nx, spin_dim = psi_in.shape
+    out = np.zeros_like(psi_in)
+    # Apply coin_matrix^T to the spin dimension
+    for y_idx in range(ny):
+        for x_idx in range(nx):
+            out[y_idx, x_idx, :] = coin_matrix.T @ psi_in[y_idx, x_idx, :]
+    return out
+
+def _reference_APPLY_BARRIER(psi_in, barrier_row, slit1_xstart, slit1_xend,
+                             slit2_xstart, slit2_xend):
+    psi_out = np.copy(psi_in)
+    ny, nx, spin_dim = psi_out.shape
+    for x in range(nx):
+        in_slit1 = (slit1_xstart <= x < slit1_xend)
+        in_slit2 = (slit2_xstart <= x < slit2_xend)
+        if not (in_slit1 or in_slit2):
+            # Zero out at barrier row
+            psi_out[barrier_row, x, :] = 0
+    return psi_out
+
+
 ###############################################################################
 #                        AUTO-GENERATED CLASSES FROM JSON                     #
 ###############################################################################
@@ -0,0 +1,81 @@
+# PAPER_04-parity.py
+"""
+Parity check for PAPER_04's vectorized building blocks against the loop
+reference versions kept alongside them (_reference_*), on a few small grids.
+
+    python PAPER_04-parity.py
+"""
+
+import importlib.util
+import os
+
+import numpy as np
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_spec = importlib.util.spec_from_file_location(
+    "paper_04", os.path.join(_HERE, "PAPER_04-Json-no-schrodinger-derived-declarative.py"))
+paper = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(paper)
+
+GRIDS = [(1, 1, 8), (5, 7, 8), (12, 9, 8), (31, 40, 8), (16, 16, 4)]
+
+# (slit1_xstart, slit1_xend, slit2_xstart, slit2_xend), relative to nx where
+# noted; includes empty, negative and out-of-range bounds.
+SLITS = [
+    lambda nx: (nx // 4, nx // 4 + 2, nx // 2, nx // 2 + 3),
+    lambda nx: (0, nx, 0, 0),
+    lambda nx: (-3, 1, nx - 1, nx + 5),
+    lambda nx: (3, 2, 5, 5),
+]
+
+
+def _random_psi(rng, shape):
+    return rng.standard_normal(shape) + 1j * rng.standard_normal(shape)
+
+
+def _random_coin(rng, spin_dim):
+    q, _ = np.linalg.qr(_random_psi(rng, (spin_dim, spin_dim)))
+    return q
+
+
+def check_gaussian():
+    for ny, nx, spin_dim in GRIDS:
+        for src_y, sigma_y in ((0, 2.0), (ny // 3, 0.7), (-2, 5.5)):
+            got = paper.GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION(src_y, sigma_y, ny, nx, spin_dim)
+            want = paper._reference_GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION(
+                src_y, sigma_y, ny, nx, spin_dim)
+            assert got.dtype == want.dtype and np.array_equal(got, want), (ny, nx, spin_dim, src_y)
+
+
+def check_matmul(rng):
+    for shape in GRIDS:
+        psi = _random_psi(rng, shape)
+        coin = _random_coin(rng, shape[2])
+        got, want = paper.MATMUL(psi, coin), paper._reference_MATMUL(psi, coin)
+        assert got.shape == want.shape and np.allclose(got, want, rtol=0, atol=1e-12), shape
+
+
+def check_barrier(rng):
+    for shape in GRIDS:
+        ny, nx, _ = shape
+        psi = _random_psi(rng, shape)
+        before = psi.copy()
+        for slits in SLITS:
+            bounds = slits(nx)
+            for row in {0, ny // 2, ny - 1}:
+                got = paper.APPLY_BARRIER(psi, row, *bounds)
+                want = paper._reference_APPLY_BARRIER(psi, row, *bounds)
+                assert np.array_equal(got, want), (shape, row, bounds)
+        assert np.array_equal(psi, before), "APPLY_BARRIER modified its input"
+
+
+def main():
+    rng = np.random.default_rng(4)
+    check_gaussian()
+    check_matmul(rng)
+    check_barrier(rng)
+    print("PAPER_04 parity: ok")
+
+
+if __name__ == "__main__":
+    main()
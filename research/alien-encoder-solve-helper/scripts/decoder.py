@@ -16,6 +16,8 @@ from utils import read_json, write_json
 # We capture whitespace, single characters, and sequences of letters/digits/operators,
 # so that we can re-inject them in the same order.
 _TOKEN_PATTERN = re.compile(r"\s+|[^\s]+")
+# The non-whitespace tokens of _TOKEN_PATTERN; whitespace between them is kept as-is.
+_WORD_PATTERN = re.compile(r"[^\s]+")
 
 def decode_file(
     mystery_json_path: str, 
@@ -42,8 +44,8 @@ def decode_file(
         solver_guesses = read_json(guesses_json_path)
         _merge_guesses(metadata, solver_guesses)
 
-    # 3. Decode the data recursively
-    decoded_data = _decode_value(mystery_data, metadata)
+    # 3. Decode the data recursively, with one dict lookup per token
+    decoded_data = _decode_value(mystery_data, _translation_table(metadata))
 
     # 4. Write the partially/fully decoded result
     write_json(decoded_data, output_json_path)
@@ -80,62 +82,53 @@ def _merge_guesses(metadata: Dict, solver_guesses: Dict):
     #     ...
     #   ]
     # }
-    # We'll do a simple loop to match zword => english_word
+    # We'll index the entries by zword once, then match zword => english_word
+    index = {}
+    for entry in metadata.get("entries", []):
+        index.setdefault(entry.get("zword"), entry)
     for guess in solver_guesses["Guesses"]:
         zword = guess.get("zword")
         english_word = guess.get("english_word")
         if not zword or not english_word:
             continue
 
-        for entry in metadata.get("entries", []):
-            if entry.get("zword") == zword:
-                entry["bestGuess"] = english_word
-                # Optionally append to 'translations', etc.
-                # e.g. entry["translations"].append({
-                #   "generation": <someGenNumber>,
-                #   "word": english_word
-                # })
-                break
-
-def _decode_value(value: Any, metadata: Dict) -> Any:
+        entry = index.get(zword)
+        if entry is not None:
+            entry["bestGuess"] = english_word
+            # Optionally append to 'translations', etc.
+            # e.g. entry["translations"].append({
+            #   "generation": <someGenNumber>,
+            #   "word": english_word
+            # })
+
+def _decode_value(value: Any, table: Dict[str, str]) -> Any:
     """
     Recursively decodes a JSON structure (dict, list, or string).
     For each string, we split into tokens, decode them, and rejoin.
     """
     if isinstance(value, dict):
-        return {k: _decode_value(v, metadata) for k, v in value.items()}
+        return {k: _decode_value(v, table) for k, v in value.items()}
 
     elif isinstance(value, list):
-        return [_decode_value(item, metadata) for item in value]
+        return [_decode_value(item, table) for item in value]
 
     elif isinstance(value, str):
-        return _decode_string(value, metadata)
+        return _decode_string(value, table)
 
     # Numbers, booleans, or None remain unchanged
     return value
 
-def _decode_string(s: str, metadata: Dict) -> str:
+def _decode_string(s: str, table: Dict[str, str]) -> str:
     """
-    Splits the alien string into tokens, checks metadata for a 'bestGuess' of each token,
-    and rejoins them to produce a partially/fully decoded string.
+    Replaces each alien token of the string with its 'bestGuess' from the
+    translation table (tokens not in it stay alien), keeping the whitespace.
     """
-    tokens = _TOKEN_PATTERN.findall(s)
-    decoded_pieces = []
-
-    for t in tokens:
-        if t.isspace():
-            decoded_pieces.append(t)
-        else:
-            # Attempt to decode the token via metadata
-            decoded_token = _lookup_best_guess(t, metadata)
-            decoded_pieces.append(decoded_token)
+    return _WORD_PATTERN.sub(lambda m: table.get(m.group(), m.group()), s)
 
-    return "".join(decoded_pieces)
-
-def _lookup_best_guess(alien_token: str, metadata: Dict) -> str:
+def _translation_table(metadata: Dict) -> Dict[str, str]:
     """
-    Given an alien token, look up the 'bestGuess' in metadata.
-    If not found, return the token as-is (still 'alien').
+    Precompile metadata into a zword -> 'bestGuess' dict, so decoding a token
+    is one lookup instead of a scan of every entry.
     The structure of metadata might differ in your puzzle; adapt as needed.
     """
     # Suppose metadata is of the form:
@@ -150,10 +143,8 @@ def _lookup_best_guess(alien_token: str, metadata: Dict) -> str:
     #     ...
     #   ]
     # }
+    # The first entry for a zword wins, as in a front-to-back scan.
+    table = {}
     for entry in metadata.get("entries", []):
-        zword = entry.get("zword")
-        best_guess = entry.get("bestGuess", "")
-        if alien_token == zword:
-            return best_guess
-
-    return alien_token  # If not in metadata, leave it unchanged
+        table.setdefault(entry.get("zword"), entry.get("bestGuess", ""))
+    return table
@@ -2,17 +2,20 @@
 #
 # Contains the main encoding logic:
 # 1. Parse English JSON
-# 2. For each token, transform it to alien form.
-# 3. Update metadata.
+# 2. Collect its distinct tokens and freeze their alien forms (seeded, so
+#    every run encodes the same document identically).
+# 3. Transform every string, subtrees in parallel worker processes.
 # 4. Write zlang_mystery.json
 
+import argparse
 import os
 import re
 import sys
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List
 
-from utils import read_json, write_json
-from token_processor import process_token
+from rosetta_stone import ROSETTA_ENGLISH_TO_ALIEN
+from utils import ZwordAllocator, assign_single_chars, read_json, write_json
 
 # A regex that captures:
 #   - Whitespace sequences
@@ -22,10 +25,20 @@ from token_processor import process_token
 #   - Other single non-alphanumeric characters (punctuation, etc.)
 _TOKEN_PATTERN = re.compile(r"\s+|[0-9]|[+\-\*\/=\^#]|[A-Za-z]+|[^A-Za-z0-9\s]")
 
-def encode_file(input_json_path: str, output_json_path: str):
+# Documents with less string text than this (in characters) are encoded
+# in-process; starting the worker pool would cost more than it saves.
+_MIN_PARALLEL_CHARS = 1 << 20
+# Subtrees per worker process the document is split into (for load balance).
+_PARTS_PER_WORKER = 4
+
+# The frozen token map inside a worker process (see _install_token_map).
+_worker_token_map = None
+
+def encode_file(input_json_path: str, output_json_path: str, seed: int = 0, workers: int = None):
     """
-    Read an English JSON from input_json_path, recursively transform all strings
-    into 'alien' equivalents using process_token(), and write the result to output_json_path.
+    Read an English JSON from input_json_path, transform all strings into
+    'alien' equivalents (see encode_data), and write the result to
+    output_json_path.
     """
     # Ensure paths are absolute
     input_json_path = os.path.abspath(input_json_path)
@@ -44,8 +57,8 @@ def encode_file(input_json_path: str, output_json_path: str):
         print(f"❌ ERROR: Unable to read {input_json_path}: {e}")
         sys.exit(1)
 
-    # 2. Recursively encode the entire data structure
-    encoded_data = _encode_value(data)
+    # 2. Encode the entire data structure
+    encoded_data = encode_data(data, seed, workers)
 
     # 3. Write out the result
     try:
@@ -55,35 +68,144 @@ def encode_file(input_json_path: str, output_json_path: str):
         print(f"❌ ERROR: Unable to write to {output_json_path}: {e}")
         sys.exit(1)
 
-def _encode_value(value: Any) -> Any:
+def encode_data(data: Any, seed: int = 0, workers: int = None) -> Any:
+    """
+    Encode every string of a JSON value.  The distinct tokens are collected
+    first and given their alien forms once (build_token_map), so each word
+    has one zword throughout the document and the result depends only on
+    the document and the seed.  Subtrees are then encoded in up to
+    `workers` processes (default: one per CPU), each holding the frozen map.
+    """
+    tokens, chars = _scan(data)
+    token_map = build_token_map(sorted(tokens), seed)
+    workers = workers or os.cpu_count() or 1
+    if chars < _MIN_PARALLEL_CHARS:
+        workers = 1
+    parts, depth = _split(data, workers * _PARTS_PER_WORKER)
+    if workers > 1 and len(parts) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(parts)),
+                                 initializer=_install_token_map, initargs=(token_map,)) as pool:
+            encoded = list(pool.map(_encode_part, parts, chunksize=max(1, len(parts) // (workers * 4))))
+    else:
+        encoded = [_encode_value(part, token_map) for part in parts]
+    return _join(data, depth, iter(encoded))
+
+def collect_vocabulary(data: Any) -> List[str]:
+    """The distinct tokens of every string in data (sorted, whitespace excluded)."""
+    return sorted(_scan(data)[0])
+
+def _scan(data: Any):
+    """(set of distinct non-whitespace tokens, total characters) of the strings in data."""
+    tokens = set()
+    chars = 0
+
+    def walk(value):
+        nonlocal chars
+        if isinstance(value, dict):
+            for val in value.values():
+                walk(val)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif isinstance(value, str):
+            tokens.update(_TOKEN_PATTERN.findall(value))
+            chars += len(value)
+    walk(data)
+    tokens = {t for t in tokens if not t.isspace()}
+    return tokens, chars
+
+def build_token_map(vocabulary: List[str], seed: int = 0) -> Dict[str, str]:
+    """
+    token -> alien form for every token of the vocabulary:
+      - digits and operators from the rosetta stone,
+      - words get zwords of their own length (at least 2) from a
+        ZwordAllocator seeded with `seed`, in vocabulary order,
+      - any other character a code from assign_single_chars.
+    """
+    token_map = {}
+    words, chars = [], []
+    for token in vocabulary:
+        if token in ROSETTA_ENGLISH_TO_ALIEN:
+            token_map[token] = ROSETTA_ENGLISH_TO_ALIEN[token]
+        elif token.isalpha() and token.isascii():
+            words.append(token)
+        else:
+            chars.append(token)
+
+    allocator = ZwordAllocator(seed)
+    for word in words:
+        token_map[word] = allocator.allocate(word)
+
+    token_map.update(assign_single_chars(chars))
+    return token_map
+
+def _encode_value(value: Any, token_map: Dict[str, str]) -> Any:
     """Recursively encodes a JSON value (dict, list, string, etc.)."""
     if isinstance(value, dict):
-        return {key: _encode_value(val) for key, val in value.items()}
+        return {key: _encode_value(val, token_map) for key, val in value.items()}
     elif isinstance(value, list):
-        return [_encode_value(item) for item in value]
+        return [_encode_value(item, token_map) for item in value]
     elif isinstance(value, str):
-        return _encode_string(value)
+        return _encode_string(value, token_map)
     else:
         return value
 
-def _encode_string(s: str) -> str:
-    """Splits and encodes each token in a string."""
-    tokens = _TOKEN_PATTERN.findall(s)
-    encoded_pieces = [process_token(t) if not t.isspace() else t for t in tokens]
-    return "".join(encoded_pieces)
+def _encode_string(s: str, token_map: Dict[str, str]) -> str:
+    """Splits and encodes each token in a string (whitespace is kept as-is)."""
+    return "".join([token_map.get(t, t) for t in _TOKEN_PATTERN.findall(s)])
+
+def _install_token_map(token_map: Dict[str, str]):
+    global _worker_token_map
+    _worker_token_map = token_map
+
+def _encode_part(part: Any) -> Any:
+    return _encode_value(part, _worker_token_map)
+
+def _split(data: Any, wanted: int) -> List[Any]:
+    """
+    Cut data into about `wanted` subtrees: the values at the shallowest
+    depth of nested dicts / lists that has that many (or has the most).
+    Returns (subtrees, depth); _join puts them back together.
+    """
+    depth = 0
+    parts = [data]
+    while len(parts) < wanted:
+        deeper = list(_parts_at(data, depth + 1))
+        if len(deeper) <= len(parts):
+            break
+        depth, parts = depth + 1, deeper
+    return parts, depth
+
+def _parts_at(value: Any, depth: int) -> Iterator[Any]:
+    if depth == 0 or not isinstance(value, (dict, list)):
+        yield value
+        return
+    for child in (value.values() if isinstance(value, dict) else value):
+        yield from _parts_at(child, depth - 1)
+
+def _join(data: Any, depth: int, encoded: Iterator[Any]) -> Any:
+    """data with its subtrees at `depth` (as cut by _split) replaced, in order, by the encoded ones."""
+    def rebuild(value, depth):
+        if depth == 0 or not isinstance(value, (dict, list)):
+            return next(encoded)
+        if isinstance(value, dict):
+            return {key: rebuild(val, depth - 1) for key, val in value.items()}
+        return [rebuild(item, depth - 1) for item in value]
+    return rebuild(data, depth)
 
 def main():
     """Handles command-line execution."""
-    if len(sys.argv) != 3:
-        print("❌ ERROR: Incorrect usage.")
-        print("Usage: python encoder.py <input_json> <output_json>")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Encode an English JSON document into ZLang.")
+    parser.add_argument("input_json")
+    parser.add_argument("output_json")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the zword assignment (same seed, same mystery file).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU; 1 encodes in-process).")
+    args = parser.parse_args()
 
     print(f"🛠️ Running encoder.py from: {os.getcwd()}")
-    encode_file(input_file, output_file)
+    encode_file(args.input_json, args.output_json, args.seed, args.workers)
 
 if __name__ == "__main__":
     main()
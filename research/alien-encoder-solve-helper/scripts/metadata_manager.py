@@ -6,7 +6,7 @@
 import os
 from typing import Any, Dict, List, Optional
 
-from utils import read_json, write_json
+from utils import calculate_approximate_progress, read_json, write_json
 
 class MetadataManager:
     """
@@ -30,6 +30,10 @@ class MetadataManager:
         "approximateDecoded": "XX% ±1%"
       }
     }
+
+    Entries are also indexed by zword (rebuilt on load, kept up to date by
+    add_token), and translation_table() maps each zword to its bestGuess,
+    so lookups never scan the entry list.
     """
 
     def __init__(self, path: str = "translation_metadata.json"):
@@ -43,6 +47,7 @@ class MetadataManager:
                     "approximateDecoded": "0% ±1%"
                 }
             }
+        self._reindex()
 
     def save(self):
         """Write the in-memory metadata to JSON on disk."""
@@ -86,6 +91,8 @@ class MetadataManager:
         new_entry["translations"].append({"generation": 0, "word": alien_representation})
 
         entries.append(new_entry)
+        self._index[alien_representation] = new_entry
+        self._table[alien_representation] = new_entry["bestGuess"]
 
     def update_guess(self, alien_token: str, new_guess: str):
         """
@@ -102,6 +109,7 @@ class MetadataManager:
         next_gen = max(existing_gens) + 1 if existing_gens else 1
 
         entry["bestGuess"] = new_guess
+        self._table[alien_token] = new_guess
         entry["translations"].append({
             "generation": next_gen,
             "word": new_guess
@@ -130,9 +138,17 @@ class MetadataManager:
         self._data["progress"]["approximateDecoded"] = approx_str
         return approx_str
 
+    def translation_table(self) -> Dict[str, str]:
+        """zword -> bestGuess for every entry (live; do not modify)."""
+        return self._table
+
+    def _reindex(self):
+        """Rebuild the zword indexes from the entry list (the first entry for a zword wins)."""
+        self._index: Dict[str, Dict[str, Any]] = {}
+        for entry in self._data["entries"]:
+            self._index.setdefault(entry["zword"], entry)
+        self._table: Dict[str, str] = {z: e["bestGuess"] for z, e in self._index.items()}
+
     def _find_entry(self, alien_representation: str) -> Optional[Dict[str, Any]]:
         """Helper to locate an entry in metadata by 'zword' field."""
-        for entry in self._data["entries"]:
-            if entry["zword"] == alien_representation:
-                return entry
-        return None
+        return self._index.get(alien_representation)
@@ -3,11 +3,15 @@
 # Common helpers: JSON reading/writing, shared text transformations, etc.
 # Provides functions to generate “pronounceable” alien zwords.
 #   - create_zword(original_word)
-#   - track used zwords to avoid duplicates
+#   - ZwordAllocator: collision-free zwords in a seeded order, with reverse lookup
+#   - zword_for_index(index, length[, alphabets]): the zword space, enumerated in order
 
 import re
 import json
+import math
 import random
+from typing import List, Optional, Sequence, Tuple
+
 from rosetta_stone import ROSETTA_ENGLISH_TO_ALIEN
 
 def read_json(filepath: str):
@@ -28,46 +32,120 @@ _CONSONANTS = [
     'v', 'w', 'x', 'y', 'z'
 ]
 
-_used_zwords = set()  # Track all generated zwords to avoid duplicates
+def zword_count(length: int) -> int:
+    """Number of zwords of the given length: 'z', then consonant, vowel, consonant, ..."""
+    count = 1
+    for position in range(length - 1):
+        count *= len(_CONSONANTS) if position % 2 == 0 else len(_VOWELS)
+    return count
+
+def _alphabets(length: int) -> List[List[str]]:
+    """The alphabet of each letter after the 'z': consonant, vowel, consonant, ..."""
+    return [_CONSONANTS if position % 2 == 0 else _VOWELS for position in range(length - 1)]
+
+def zword_for_index(index: int, length: int, alphabets: Optional[Sequence[Sequence[str]]] = None) -> str:
+    """
+    The index-th zword of the given length, reading the alternating
+    consonant/vowel letters as the digits of a mixed-radix counter.  A
+    bijection from range(zword_count(length)) onto the zwords of that
+    length, so distinct indexes never collide.  `alphabets` may give a
+    reordering of each position's alphabet to count in.
+    """
+    if not 0 <= index < zword_count(length):
+        raise ValueError(f"index {index} out of range for zwords of length {length}")
+    letters = []
+    for alphabet in reversed(alphabets or _alphabets(length)):
+        index, digit = divmod(index, len(alphabet))
+        letters.append(alphabet[digit])
+    return 'z' + ''.join(reversed(letters))
+
+class ZwordAllocator:
+    """
+    Hands out zwords without collisions and without probing a used set.
+
+    The n-th word allocated at a length gets slot (a * n + b) mod
+    zword_count(length) of that length, with a coprime to the count, so the
+    slots are a seeded permutation of all of them.  The slot is spelled by
+    zword_for_index with a seeded shuffle of the alphabet at each position,
+    so consecutive words do not share prefixes.  Both steps are
+    bijective: allocation is O(word length), and index_of() / english()
+    undo it.  A length whose zwords are all taken continues in the next
+    one.  Asking again for a word returns its zword.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._spaces = {}    # length -> (count, a, a^-1, b, alphabets, letter positions)
+        self._next = {}      # length -> words allocated at that length
+        self._zwords = {}    # english word -> zword
+        self._english = {}   # zword -> english word
+
+    def allocate(self, english_word: str) -> str:
+        zword = self._zwords.get(english_word)
+        if zword is not None:
+            return zword
+        length = max(2, len(english_word))
+        while self._next.get(length, 0) >= self._space(length)[0]:
+            length += 1
+        n = self._next.get(length, 0)
+        self._next[length] = n + 1
+        zword = self.zword_at(n, length)
+        self._zwords[english_word] = zword
+        self._english[zword] = english_word
+        return zword
+
+    def zword_at(self, n: int, length: int) -> str:
+        """The zword of the n-th allocation at a length."""
+        count, a, _, b, alphabets, _ = self._space(length)
+        return zword_for_index((a * n + b) % count, length, alphabets)
+
+    def index_of(self, zword: str) -> Tuple[int, int]:
+        """(length, n) such that zword_at(n, length) == zword."""
+        length = len(zword)
+        count, _, a_inverse, b, alphabets, positions = self._space(length)
+        if not zword.startswith('z') or any(letter not in position for position, letter in zip(positions, zword[1:])):
+            raise ValueError(f"{zword!r} is not a zword")
+        slot = 0
+        for alphabet, position, letter in zip(alphabets, positions, zword[1:]):
+            slot = slot * len(alphabet) + position[letter]
+        return length, (slot - b) * a_inverse % count
+
+    def english(self, zword: str) -> Optional[str]:
+        """Reverse lookup: the English word zword was allocated to, or None."""
+        return self._english.get(zword)
+
+    def _space(self, length: int):
+        space = self._spaces.get(length)
+        if space is None:
+            rng = random.Random(f"{self.seed}:{length}")
+            count = zword_count(length)
+            a = rng.randrange(1, count) if count > 1 else 1
+            while math.gcd(a, count) != 1:
+                a += 1
+            b = rng.randrange(count)
+            alphabets = [rng.sample(alphabet, len(alphabet)) for alphabet in _alphabets(length)]
+            positions = [{letter: i for i, letter in enumerate(alphabet)} for alphabet in alphabets]
+            space = (count, a, pow(a, -1, count), b, alphabets, positions)
+            self._spaces[length] = space
+        return space
+
+_allocator = ZwordAllocator()  # Backs create_zword / english_for_zword
 
 def create_zword(english_word: str) -> str:
     """
     Generate a 'pronounceable' alien token for the given English word.
     1. Always starts with 'z'.
-    2. Then alternates consonants and vowels in a naive approach.
-    3. Matches or approximates the length of the English word (up to you).
-    4. Ensures uniqueness by checking _used_zwords.
+    2. Then alternates consonants and vowels.
+    3. Matches the length of the English word (at least 2), or is longer
+       once every zword of that length is taken.
+    4. Is unique: the module's ZwordAllocator never hands out a zword twice,
+       and the same word always gets the same zword.
     """
+    return _allocator.allocate(english_word)
 
-    # If you want the length to be the same as the original:
-    target_length = max(2, len(english_word))  # at least 2 chars
-    # We'll build from 'z', so we have 1 char used up
-    length_needed = target_length - 1
-
-    # Build alternating sequence: consonant -> vowel -> consonant -> ...
-    # Start with random choice of consonant or vowel each time for variety,
-    # or do a consistent pattern. Let's do consonant -> vowel -> ...
-    is_consonant = True
-
-    z_body = []
-    for _ in range(length_needed):
-        if is_consonant:
-            z_body.append(random.choice(_CONSONANTS))
-        else:
-            z_body.append(random.choice(_VOWELS))
-        is_consonant = not is_consonant
-
-    candidate = 'z' + ''.join(z_body)
-
-    # If we want to handle collisions deterministically, we can keep
-    # generating new patterns (e.g., by flipping random seeds or adding suffixes)
-    # until we find a unique one.
-    while candidate in _used_zwords:
-        # If collision, append a random letter and check again
-        candidate += random.choice(_VOWELS + _CONSONANTS)
-
-    _used_zwords.add(candidate)
-    return candidate
+def english_for_zword(zword: str) -> Optional[str]:
+    """Reverse lookup of create_zword (None for zwords it has not handed out)."""
+    return _allocator.english(zword)
 
 
 # zlang/token_processor.py
@@ -164,6 +242,24 @@ _current_codepoint = _SINGLE_CHAR_START
 _assigned_map = {}
 
 
+def assign_single_chars(chars) -> dict:
+    """
+    Map each of the given single characters, in sorted order, to its own
+    code >= _SINGLE_CHAR_START outside the rosetta stone.  Unlike
+    map_single_char this uses no module state: the same characters always
+    get the same codes.
+    """
+    taken = set(ROSETTA_ALIEN_TO_ENGLISH)
+    codepoint = _SINGLE_CHAR_START
+    assigned = {}
+    for char in sorted(chars):
+        while chr(codepoint) in taken:
+            codepoint += 1
+        assigned[char] = chr(codepoint)
+        codepoint += 1
+    return assigned
+
+
 def map_single_char(char: str) -> str:
     """
     Return a unique alien code (e.g. extended ASCII >= 130) for the given single character.
@@ -184,7 +280,7 @@ def map_single_char(char: str) -> str:
     while True:
         candidate = chr(_current_codepoint)
         # Check if candidate is used by rosetta or already taken by some other punctuation
-        if candidate not in ROSETTA_ALIEN_TO_ENGLISH.values() and candidate not in _assigned_map.values():
+        if candidate not in ROSETTA_ALIEN_TO_ENGLISH and candidate not in _assigned_map.values():
             alien_char = candidate
             break
         _current_codepoint += 1
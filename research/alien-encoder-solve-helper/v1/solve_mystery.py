@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import difflib
+import hashlib
 import json
 import os
 import re
@@ -12,6 +14,12 @@ WORD_PATTERN = re.compile(r'\b\w+\b', re.IGNORECASE)
 # Name of the persistent dictionary file.
 PERSISTENT_DICT_FILENAME = "current_solve.json"
 
+# A JSON string literal, and an escape sequence inside one.
+STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"')
+ESCAPE_PATTERN = re.compile(r'\\(?:u[0-9a-fA-F]{4}|.)')
+# A word at a known offset (which may directly follow an escape like \n).
+WORD_RUN = re.compile(r'\w+')
+
 # --- Persistent Dictionary Functions ---
 def load_persistent_dictionary(base_dir):
     """
@@ -119,25 +127,37 @@ def merge_guesses(persistent_dict, new_guesses):
     return persistent_dict
 
 # --- Word Replacement ---
+def build_replacer(mappings):
+    """
+    Compile the mappings into one function text -> text.  The candidate of
+    every mapping with a non-empty "english" list is looked up once, here;
+    the function then makes a single scan of the text, replacing each word
+    that has a candidate while preserving the original word's case.
+    """
+    table = {source: entry["english"][0] for source, entry in mappings.items() if entry["english"]}
+
+    def replacement(match):
+        word = match.group(0)
+        candidate = table.get(word.lower())
+        return word if candidate is None else match_case(word, candidate)
+    return lambda text: WORD_PATTERN.sub(replacement, text) if table else text
+
+def match_case(word, candidate):
+    """candidate, in the case of the word it replaces (lower, Capitalized or UPPER)."""
+    if word.islower():
+        return candidate
+    elif word[0].isupper():
+        return candidate.capitalize()
+    else:
+        return candidate.upper()
+
 def replace_words_preserving_punctuation(text, mappings):
     """
     Replace words in the text using the persistent mappings.
     For each match (word), if there is a non-empty "english" array in the mapping,
     use the first candidate as the replacement while preserving the original word's case.
     """
-    def replacement(match):
-        word = match.group(0)
-        lower = word.lower()
-        if lower in mappings and mappings[lower]["english"]:
-            candidate = mappings[lower]["english"][0]
-            if word.islower():
-                return candidate
-            elif word[0].isupper():
-                return candidate.capitalize()
-            else:
-                return candidate.upper()
-        return word
-    return re.sub(WORD_PATTERN, replacement, text)
+    return build_replacer(mappings)(text)
 
 def replace_text(text, mappings):
     return replace_words_preserving_punctuation(text, mappings)
@@ -146,18 +166,130 @@ def replace_tokens_in_data(obj, mappings):
     """
     Recursively replace words in JSON keys and string values using the mappings.
     """
-    if isinstance(obj, dict):
-        return { replace_text(k, mappings): replace_tokens_in_data(v, mappings)
-                 for k, v in obj.items() }
-    elif isinstance(obj, list):
-        return [replace_tokens_in_data(item, mappings) for item in obj]
-    elif isinstance(obj, str):
-        return replace_text(obj, mappings)
-    else:
-        return obj
+    replace = build_replacer(mappings)
+
+    def walk(value):
+        if isinstance(value, dict):
+            return {replace(k): walk(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [walk(item) for item in value]
+        elif isinstance(value, str):
+            return replace(value)
+        else:
+            return value
+    return walk(obj)
+
+# --- Incremental Rounds ---
+def build_token_index(text):
+    """
+    {word (lowercase): [offsets]} of every word inside a JSON string literal
+    of the mystery text.  Escape sequences are not words.
+    """
+    index = {}
+    for literal in STRING_PATTERN.finditer(text):
+        body = ESCAPE_PATTERN.sub(lambda m: " " * len(m.group()), literal.group())
+        for match in WORD_PATTERN.finditer(body):
+            index.setdefault(match.group().lower(), []).append(literal.start() + match.start())
+    return index
+
+def load_round_index(index_path, text):
+    """
+    The round index saved by the last incremental round: the sha256 of the
+    mystery text, the "v" of every mapping applied to it ("applied") and
+    the guesses file it was made from.  A fresh index (nothing applied) if
+    there is none, or if the mystery file has changed since.  Word offsets
+    are not stored; build_token_index recomputes them from the text.
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("sha256") == digest:
+            return state
+    return {"sha256": digest, "applied": {}, "guesses": ""}
+
+def patch_tokens(text, tokens, table):
+    """
+    Replace the indexed occurrences of every word in table (lowercase word
+    -> candidate), preserving case.  Returns the new text and the edits as
+    [offset, old, new] (offsets into the old text).  Raises ValueError if
+    the index does not match the text.
+    """
+    targets = sorted((start, word) for word in table for start in tokens.get(word, ()))
+    pieces, edits, last = [], [], 0
+    for start, word in targets:
+        match = WORD_RUN.match(text, start)
+        if match is None or match.group().lower() != word:
+            raise ValueError(f"token index is out of date at offset {start}")
+        old = match.group()
+        new = match_case(old, table[word])
+        pieces += [text[last:start], new]
+        edits.append([start, old, new])
+        last = match.end()
+    pieces.append(text[last:])
+    return "".join(pieces), edits
+
+def revert_edits(text, edits):
+    """Undo patch_tokens: the text the edits (as stored in a round diff) were made to."""
+    pieces, last, shift = [], 0, 0
+    for start, old, new in edits:
+        at = start + shift
+        pieces += [text[last:at], old]
+        last = at + len(new)
+        shift += len(new) - len(old)
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+def incremental_round(mystery_path, text, persistent_dict, guesses_text, diff_path, index_path):
+    """
+    Apply only the mappings whose "v" changed since the last incremental
+    round (as recorded in the round index), patching the words they affect
+    in place.  Their offsets come from a token index that is rebuilt from
+    the text every round, not persisted: the round index only keeps the
+    sha256, the applied "v"s and the guesses file.  The round is backed up
+    as a diff (the edits and the change to the guesses file) instead of
+    full copies.  Returns the number of edits.
+
+    Unlike a full pass this never revisits words a mapping did not change:
+    a candidate that is itself a mapped word is replaced in the round after
+    its mapping next changes (or by a full pass).
+    """
+    state = load_round_index(index_path, text)
+    mappings = persistent_dict["mappings"]
+    applied = state["applied"]
+    table = {source: entry["english"][0] for source, entry in mappings.items()
+             if entry["english"] and applied.get(source) != entry["v"]}
+    unsafe = [source for source, candidate in table.items()
+              if json.dumps(candidate, ensure_ascii=False)[1:-1] != candidate]
+    if unsafe:
+        raise ValueError(f"candidates of {', '.join(sorted(unsafe))} would need JSON escaping")
+    new_text, edits = patch_tokens(text, build_token_index(text), table)
+
+    round_diff = {
+        "generation": persistent_dict["meta"]["current_generation"],
+        "sha256_before": state["sha256"],
+        "sha256_after": hashlib.sha256(new_text.encode("utf-8")).hexdigest(),
+        "edits": edits,
+        "guesses_diff": "".join(difflib.unified_diff(state["guesses"].splitlines(True),
+                                                     guesses_text.splitlines(True),
+                                                     "guesses", "guesses", n=0)),
+    }
+    with open(diff_path, "w", encoding="utf-8") as f:
+        json.dump(round_diff, f, indent=2, ensure_ascii=False)
+    if edits:
+        with open(mystery_path, "w", encoding="utf-8") as f:
+            f.write(new_text)
+    state = {
+        "sha256": round_diff["sha256_after"],
+        "applied": {source: entry["v"] for source, entry in mappings.items() if entry["english"]},
+        "guesses": guesses_text,
+    }
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    return len(edits)
 
 # --- Main Function ---
-def main(mystery_path):
+def main(mystery_path, incremental=False):
     base_dir = os.path.dirname(os.path.abspath(mystery_path))
     filename_base = os.path.basename(mystery_path).replace("_mystery.json", "")
 
@@ -165,18 +297,20 @@ def main(mystery_path):
     def find_latest_round():
         rounds = []
         for file in os.listdir(base_dir):
-            match = re.match(rf"{filename_base}_mystery_guesses_round_(\d+)\.json", file)
+            match = re.match(rf"{filename_base}_mystery_(?:guesses_round_(\d+)\.json|round_(\d+)\.diff\.json)", file)
             if match:
-                rounds.append(int(match.group(1)))
+                rounds.append(int(match.group(1) or match.group(2)))
         return max(rounds) if rounds else 0
 
     next_round = find_latest_round() + 1
     new_mystery_backup = os.path.join(base_dir, f"{filename_base}_mystery_round_{next_round}.json")
     new_guesses_backup = os.path.join(base_dir, f"{filename_base}_mystery_guesses_round_{next_round}.json")
-    while os.path.exists(new_mystery_backup) or os.path.exists(new_guesses_backup):
+    new_round_diff = os.path.join(base_dir, f"{filename_base}_mystery_round_{next_round}.diff.json")
+    while os.path.exists(new_mystery_backup) or os.path.exists(new_guesses_backup) or os.path.exists(new_round_diff):
         next_round += 1
         new_mystery_backup = os.path.join(base_dir, f"{filename_base}_mystery_round_{next_round}.json")
         new_guesses_backup = os.path.join(base_dir, f"{filename_base}_mystery_guesses_round_{next_round}.json")
+        new_round_diff = os.path.join(base_dir, f"{filename_base}_mystery_round_{next_round}.diff.json")
 
     # Path to guesses file (e.g., "filename_mystery_guesses.txt")
     guesses_file = os.path.join(base_dir, f"{filename_base}_mystery_guesses.txt")
@@ -184,9 +318,11 @@ def main(mystery_path):
         print(f"❌ Error: No guesses file found at '{guesses_file}'.")
         sys.exit(1)
 
-    # Back up the current guesses file and mystery file
-    shutil.copy(guesses_file, new_guesses_backup)
-    shutil.copy(mystery_path, new_mystery_backup)
+    # Back up the current guesses file and mystery file (incremental rounds
+    # back up a diff instead, below)
+    if not incremental:
+        shutil.copy(guesses_file, new_guesses_backup)
+        shutil.copy(mystery_path, new_mystery_backup)
 
     # Load the mystery JSON (as text)
     with open(mystery_path, "r", encoding="utf-8") as f:
@@ -216,6 +352,21 @@ def main(mystery_path):
     # Save the updated persistent dictionary.
     save_persistent_dictionary(base_dir, persistent_dict)
 
+    if incremental:
+        with open(guesses_file, "r", encoding="utf-8") as f:
+            guesses_text = f.read()
+        index_path = os.path.join(base_dir, f"{filename_base}_mystery_index.json")
+        try:
+            count = incremental_round(mystery_path, original_text, persistent_dict, guesses_text,
+                                      new_round_diff, index_path)
+        except ValueError as e:
+            print(f"❌ Incremental round failed: {e}")
+            sys.exit(1)
+        print(f"✅ {count} words patched; round diff saved as '{new_round_diff}'")
+        print(f"✅ Updated mystery file saved as '{mystery_path}'")
+        print(f"✅ Persistent dictionary updated in '{os.path.join(base_dir, PERSISTENT_DICT_FILENAME)}'")
+        return
+
     # Now replace words in the original mystery JSON text.
     updated_text = replace_text(original_text, persistent_dict["mappings"])
 
@@ -236,8 +387,12 @@ def main(mystery_path):
     print(f"✅ Persistent dictionary updated in '{os.path.join(base_dir, PERSISTENT_DICT_FILENAME)}'")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python mystery_replace.py <path_to_mystery.json>")
+    args = sys.argv[1:]
+    incremental = "--incremental" in args
+    if incremental:
+        args.remove("--incremental")
+    if len(args) != 1:
+        print("Usage: python mystery_replace.py [--incremental] <path_to_mystery.json>")
         sys.exit(1)
-    mystery_path = sys.argv[1]
-    main(mystery_path)
+    mystery_path = args[0]
+    main(mystery_path, incremental)
@@ -1,25 +1,223 @@
 """
 Auto-generated Python code from your domain model.
-Now with advanced aggregator rewriting to reduce syntax errors.
+Now with aggregator rewriting that references core_lambda_functions.
 """
 import math
 import numpy as np
-import statistics
+import os
+import sys
+
+_TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools")
+if _TOOLS not in sys.path:
+    sys.path.insert(0, _TOOLS)
+
+from core_lambda_functions import COUNT, SUM, MAX, MIN, AVG, IF, CONTAINS, EQUAL, EXISTS, MINBY, MAXBY, MODE, TOPN
 
 import uuid
+import re
+
+_EXTENTS = {}
+_EXTENT_VERSIONS = {}
+
+def _register(obj):
+    """Remember every instance so 'Entity where ...' formulas can scan it."""
+    name = type(obj).__name__
+    _EXTENTS.setdefault(name, []).append(obj)
+    _EXTENT_VERSIONS[name] = _EXTENT_VERSIONS.get(name, 0) + 1
+
+def _extent(entity_name):
+    """All instances of entity_name created so far."""
+    return _EXTENTS.get(entity_name, [])
+
+def _forget_extents():
+    """Empty every extent; returns the instances they held."""
+    forgotten = [obj for objs in _EXTENTS.values() for obj in objs]
+    _EXTENTS.clear()
+    return forgotten
+
+def _new_collection():
+    return []
+
+def _index_rows(entity_name, bucket):
+    """A hash-index bucket ({id: obj}) as a list."""
+    return list(bucket.values()) if bucket else []
+
+def _column(rows, field):
+    """field of every row in rows (e.g. SUM(teams -> wins))."""
+    return [getattr(x, field) for x in rows]
+
+def _flatten(rows, collection):
+    """Concatenate the collection of every row (e.g. teams.roster)."""
+    return [y for x in rows for y in getattr(x, collection)]
+
+def _touch(obj, attr_name, _seen=None):
+    """
+    attr_name on obj changed: drop the memoized fields that depend on it,
+    bump obj's extent version, then tell every object that holds obj in
+    a collection or reference attribute.
+    """
+    if _seen is None:
+        _seen = set()
+    elif id(obj) in _seen:
+        return
+    _seen.add(id(obj))
+    memo = obj.__dict__.get('_memo')
+    if memo:
+        for dependent in getattr(type(obj), '_DEPENDENTS', {}).get(attr_name, ()):
+            memo.pop(dependent, None)
+    name = type(obj).__name__
+    _EXTENT_VERSIONS[name] = _EXTENT_VERSIONS.get(name, 0) + 1
+    containers = obj.__dict__.get('_containers')
+    if containers:
+        for parent, parent_attr in list(containers.values()):
+            _touch(parent, parent_attr, _seen)
+
+_INDEXES = {}            # (entity, input field) -> {value: {id(obj): obj}}
+_CALCULATED_INDEXES = {} # (entity, calculated field) -> (version stamp, index)
+
+def _lookup(entity_name, field, key):
+    """Instances of entity_name whose input field equals key, from the hash index."""
+    return _index_rows(entity_name, _INDEXES.get((entity_name, field), {}).get(key))
+
+def _lookup_calculated(entity_name, field, key):
+    """
+    As _lookup, for a calculated field.  Its index is rebuilt with one pass
+    over the extent whenever the versions of that extent (or of the
+    extents the field itself scans) have moved, so N probes between two
+    changes cost one scan instead of N.
+    """
+    cls = globals().get(entity_name)
+    deps = (entity_name,) + tuple(cls._EXTENT_DEPS.get(field, ()) if cls else ())
+    stamp = tuple(_EXTENT_VERSIONS.get(e, 0) for e in deps)
+    hit = _CALCULATED_INDEXES.get((entity_name, field))
+    if hit is None or hit[0] != stamp:
+        index = {}
+        for obj in _extent(entity_name):
+            index.setdefault(getattr(obj, field), {})[id(obj)] = obj
+        hit = _CALCULATED_INDEXES[(entity_name, field)] = (stamp, index)
+    return _index_rows(entity_name, hit[1].get(key))
+
+def _reindex(obj, field, value):
+    """Move obj to the `value` bucket of the (type, field) hash index."""
+    keys = obj.__dict__.setdefault('_index_keys', {})
+    if keys is None:
+        return      # forgotten by clear_extents()
+    index = _INDEXES.setdefault((type(obj).__name__, field), {})
+    if field in keys:
+        bucket = index[keys[field]]
+        del bucket[id(obj)]
+        if not bucket:
+            del index[keys[field]]
+    index.setdefault(value, {})[id(obj)] = obj
+    keys[field] = value
+
+def clear_extents():
+    """
+    Forget every instance created so far.  The extents and hash indexes
+    hold each instance for the life of the module, so a long-running
+    process that builds one model after another calls this between
+    them to let the old objects go.  Those objects keep working, but
+    'Entity where ...' scans and lookups no longer find them.
+    """
+    for obj in _forget_extents():
+        obj.__dict__['_index_keys'] = None
+    _INDEXES.clear()
+    _CALCULATED_INDEXES.clear()
+    for name in _EXTENT_VERSIONS:
+        _EXTENT_VERSIONS[name] += 1
+
+def _contain(item, parent, attr_name):
+    """Record that parent.attr_name holds item, so changes to item reach parent."""
+    if isinstance(item, _Entity):
+        item.__dict__.setdefault('_containers', {})[(id(parent), attr_name)] = (parent, attr_name)
+
+def _uncontain(item, parent, attr_name):
+    """parent.attr_name no longer holds item: stop telling parent about item's changes."""
+    if isinstance(item, _Entity):
+        containers = item.__dict__.get('_containers')
+        if containers:
+            containers.pop((id(parent), attr_name), None)
+
+class _Entity:
+    """Base for generated classes: every public attribute write invalidates its dependents."""
+    _DEPENDENTS = {}
+    _EXTENT_DEPS = {}
+    _SCALARS = frozenset()
+    _INDEXED = frozenset()
+
+    def __setattr__(self, name, value):
+        public = not name.startswith('_')
+        if name in type(self)._SCALARS:
+            table, row = self.__dict__['_table'], self.__dict__['_row']
+            old = table.get(row, name) if public else None
+            table.set(row, name, value)
+        else:
+            old = self.__dict__.get(name) if public else None
+            object.__setattr__(self, name, value)
+        if name in type(self)._INDEXED:
+            _reindex(self, name, value)
+        if public:
+            if old is not value:
+                _uncontain(old, self, name)
+            _contain(value, self, name)
+            _touch(self, name)
+
+class memoized_property:
+    """
+    A read-only @property cached per instance.  The entry is dropped by
+    _touch when an input changes, and is re-stamped against the
+    versions of any entity extents the formula scans.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        extents = type(obj)._EXTENT_DEPS.get(self.name)
+        stamp = tuple(_EXTENT_VERSIONS.get(e, 0) for e in extents) if extents else None
+        memo = obj.__dict__.get('_memo')
+        if memo is None:
+            memo = obj.__dict__['_memo'] = {}
+        hit = memo.get(self.name)
+        if hit is not None and hit[1] == stamp:
+            return hit[0]
+        value = self.func(obj)
+        memo[self.name] = (value, stamp)
+        return value
+
+    def __set__(self, obj, value):
+        raise AttributeError(f"can't set calculated field '{self.name}'")
 
-# A tiny helper so we can do object.some_collection.add(item).
 class CollectionWrapper:
+    """A tiny helper so we can do something like: obj.someLookup.add(item)."""
     def __init__(self, parent_object, attr_name):
         self.parent_object = parent_object
         self.attr_name = attr_name
         if not hasattr(parent_object, '_collections'):
             parent_object._collections = {}
         if attr_name not in parent_object._collections:
-            parent_object._collections[attr_name] = []
+            parent_object._collections[attr_name] = _new_collection()
+
+    @property
+    def items(self):
+        """The underlying list (or RowSet in --columnar modules)."""
+        return self.parent_object._collections[self.attr_name]
 
     def add(self, item):
         self.parent_object._collections[self.attr_name].append(item)
+        _contain(item, self.parent_object, self.attr_name)
+        _touch(self.parent_object, self.attr_name)
+
+    def remove(self, item):
+        """Remove the first occurrence of item (ValueError if absent)."""
+        items = self.parent_object._collections[self.attr_name]
+        items.remove(item)
+        if not any(x is item for x in items):
+            _uncontain(item, self.parent_object, self.attr_name)
+        _touch(self.parent_object, self.attr_name)
 
     def __iter__(self):
         return iter(self.parent_object._collections[self.attr_name])
@@ -31,955 +229,1110 @@ class CollectionWrapper:
         return self.parent_object._collections[self.attr_name][index]
 
 
-def _auto_id():
-    return str(uuid.uuid4())
-
-# aggregator placeholders:
-def _COUNT(expr):
-    # We'll guess if there's a 'WHERE' in expr, it was already replaced. 
-    # In practice we'd parse it properly, but let's fallback:
-    return f"/* _COUNT({expr}) not fully implemented */"
-
-def _SUM(expr):
-    return f"/* _SUM({expr}) not fully implemented */"
-
-def _AVG(expr):
-    return f"/* _AVG({expr}) not fully implemented */"
-
-def _MINBY(expr):
-    return f"/* _MINBY({expr}) not fully implemented */"
-
-def _MAXBY(expr):
-    return f"/* _MAXBY({expr}) not fully implemented */"
-
-def _MODE(expr):
-    return f"/* _MODE({expr}) not fully implemented */"
-
-def _TOPN(expr):
-    return f"/* _TOPN({expr}) not fully implemented */"
-
-def _EXISTS(expr):
-    return f"/* _EXISTS({expr}) not fully implemented */"
-
-
 # ----- Generated classes below -----
 
-class League:
+class League(_Entity):
     """Plain data container for League entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'teams': ('averageTeamERA', 'bestTeam', 'leagueMinERA', 'leagueOPSLeaders', 'leagueWalkToStrikeoutRatio', 'mostCommonBattingHand', 'teamCount', 'totalGamesPlayed', 'totalLeagueHomeRuns', 'totalLeagueStolenBases', 'worstTeam'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'leagueWalkToStrikeoutRatio': ('AtBat',),
+        'totalGamesPlayed': ('Game',),
+    }
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.leagueName = kwargs.get('leagueName')
 
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
         self.teams = CollectionWrapper(self, 'teams')
 
-    @property
+    @memoized_property
     def teamCount(self):
         """Number of teams in this league.
         Original formula: COUNT(teams)
         """
-        return _COUNT(teams)
+        return COUNT(self.teams)
 
-    @property
+    @memoized_property
     def totalGamesPlayed(self):
         """Sum of all Games completed by all Teams in the league. Implementation conceptual, scanning each team's 'gamesPlayed'.
         Original formula: SUM(teams.gamesPlayed)
         """
-        return _SUM(teams.gamesPlayed)
+        return SUM(_column(self.teams, 'gamesPlayed'))
 
-    @property
+    @memoized_property
     def bestTeam(self):
         """The team with the highest win percentage in this league (declarative aggregator).
         Original formula: MAXBY(teams, t => t.winPercentage)
         """
-        return _MAXBY(teams, t => t.winPercentage)
+        return MAXBY(self.teams, (lambda t: t.winPercentage))
 
-    @property
+    @memoized_property
     def worstTeam(self):
         """The team with the lowest win percentage in this league (declarative aggregator).
         Original formula: MINBY(teams, t => t.winPercentage)
         """
-        return _MINBY(teams, t => t.winPercentage)
+        return MINBY(self.teams, (lambda t: t.winPercentage))
 
-    @property
+    @memoized_property
     def averageTeamERA(self):
         """The average ERA across all teams in this league. Implementation conceptual, could sum or average pitchers’ ERA or overall team ERA.
         Original formula: AVG(teams -> eachTeamERA)
         """
-        return _AVG(teams -> eachTeamERA)
+        return AVG(x.eachTeamERA for x in self.teams)
 
-    @property
+    @memoized_property
     def totalLeagueHomeRuns(self):
         """The sum of all home runs hit by players on all teams in this league, purely data-based aggregator.
         Original formula: SUM(teams.roster -> careerHomeRuns)
         """
-        return _SUM(teams.roster -> careerHomeRuns)
+        return SUM(x.careerHomeRuns for x in _flatten(self.teams, 'roster'))
 
-    @property
+    @memoized_property
     def totalLeagueStolenBases(self):
         """The sum of all stolen bases by players on all teams in this league.
         Original formula: SUM(teams.roster -> careerStolenBases)
         """
-        return _SUM(teams.roster -> careerStolenBases)
+        return SUM(x.careerStolenBases for x in _flatten(self.teams, 'roster'))
 
-    @property
+    @memoized_property
     def leagueOPSLeaders(self):
         """Top 3 players in the league by OPS. Implementation conceptual using all rosters in this league.
         Original formula: TOPN(3, teams.roster, p => p.ops)
         """
-        return _TOPN(3, teams.roster, p => p.ops)
+        return TOPN(3, _flatten(self.teams, 'roster'), (lambda p: p.ops))
 
-    @property
+    @memoized_property
     def leagueMinERA(self):
         """Identifies the single pitcher in the league with the lowest ERA. Implementation conceptual—filters for pitchers only.
         Original formula: MINBY(teams.roster where playerIsPitcher=true, p => p.careerERA)
         """
-        return _MINBY(teams.roster where playerIsPitcher==True, p => p.careerERA)
+        return MINBY((x for x in _flatten(self.teams, 'roster') if (x.playerIsPitcher == True)), (lambda p: p.careerERA))
 
-    @property
+    @memoized_property
     def mostCommonBattingHand(self):
         """Identifies the batting hand (L, R, or S) that is most common among all players in the league's teams.
         Original formula: MODE(teams.roster.battingHand)
         """
-        return _MODE(teams.roster.battingHand)
+        return MODE(_column(_flatten(self.teams, 'roster'), 'battingHand'))
 
-    @property
+    @memoized_property
     def leagueWalkToStrikeoutRatio(self):
         """Computes total walks / total strikeouts across all players in the league. Conceptual aggregator.
         Original formula: SUM(teams.roster => careerWalks) / SUM(teams.roster => careerStrikeouts)
         """
-        return _SUM(teams.roster => careerWalks) / _SUM(teams.roster => careerStrikeouts)
+        return (SUM(_column(_flatten(self.teams, 'roster'), 'careerWalks')) / SUM(x2.careerStrikeouts for x2 in _flatten(self.teams, 'roster')))
 
-class Team:
+class Team(_Entity):
     """Plain data container for Team entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'gamesPlayed': ('homeRunsPerGame', 'winPercentage'),
+        'id': ('currentWinStreak', 'currentlyHasDHAvailable', 'gamesPlayed', 'hasActiveChickenDancer', 'homeRunsPerGame', 'isOverLuxuryTaxCap', 'losses', 'pythagWinPct', 'runsAllowed', 'shutoutsAchieved', 'teamErrorCount', 'teamStrikeoutRate', 'totalTeamRuns', 'winPercentage', 'winningPercentageInStadium', 'wins'),
+        'league_id': ('dhSlotInUse', 'extendedRosterAllowed', 'maxRosterSize'),
+        'pitcherCount': ('dhSlotInUse', 'hasExceededPitcherRosterLimit'),
+        'roster': ('averageFieldingPercentage', 'averageTeamBattingAverage', 'bestPitcher', 'dhSlotInUse', 'hasExceededPitcherRosterLimit', 'homeRunsPerGame', 'pitcherCount', 'rosterSize', 'teamSluggingPct', 'teamWalkRate', 'totalHitByPitch', 'totalTeamHomeRuns', 'totalTeamStolenBases', 'totalWalks'),
+        'runsAllowed': ('pythagWinPct',),
+        'totalTeamHomeRuns': ('homeRunsPerGame',),
+        'totalTeamRuns': ('pythagWinPct',),
+        'totalWalks': ('teamWalkRate',),
+        'wins': ('winPercentage',),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'averageFieldingPercentage': ('ErrorEvent', 'OutEvent'),
+        'averageTeamBattingAverage': ('AtBat',),
+        'gamesPlayed': ('Game',),
+        'hasActiveChickenDancer': ('Player', 'WeirdStanceEvent'),
+        'homeRunsPerGame': ('Game',),
+        'losses': ('Game',),
+        'pythagWinPct': ('GameInnings',),
+        'runsAllowed': ('GameInnings',),
+        'shutoutsAchieved': ('Game',),
+        'teamErrorCount': ('ErrorEvent',),
+        'teamSluggingPct': ('AtBat',),
+        'teamStrikeoutRate': ('AtBat',),
+        'teamWalkRate': ('AtBat',),
+        'totalHitByPitch': ('AtBat',),
+        'totalTeamRuns': ('GameInnings',),
+        'totalWalks': ('AtBat',),
+        'winPercentage': ('Game',),
+        'wins': ('Game',),
+    }
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.teamName = kwargs.get('teamName')
         self.league_id = kwargs.get('league_id')
 
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
         self.roster = CollectionWrapper(self, 'roster')
 
-    @property
+    @memoized_property
     def rosterSize(self):
         """Number of players on the team's active roster.
         Original formula: COUNT(roster)
         """
-        return _COUNT(roster)
+        return COUNT(self.roster)
 
-    @property
+    @memoized_property
     def gamesPlayed(self):
         """Number of Games in which this team has participated (data-based aggregator).
         Original formula: COUNT(Game where (homeTeamId=this.id OR awayTeamId=this.id))
         """
-        return _COUNT(Game where (homeTeamId==self.id  or  awayTeamId==self.id))
+        return COUNT([x for x in _extent('Game') if ((x.homeTeamId == self.id) or (x.awayTeamId == self.id))])
 
-    @property
+    @memoized_property
     def wins(self):
         """Count of Games this team has won (pure aggregator, no imperative updates).
         Original formula: COUNT(Game where (winnerId=this.id))
         """
-        return _COUNT(Game where (winnerId==self.id))
+        return COUNT(_lookup_calculated('Game', 'winnerId', self.id))
 
-    @property
+    @memoized_property
     def losses(self):
         """Count of Games this team has lost.
         Original formula: COUNT(Game where (loserId=this.id))
         """
-        return _COUNT(Game where (loserId==self.id))
+        return COUNT(_lookup_calculated('Game', 'loserId', self.id))
 
-    @property
+    @memoized_property
     def winPercentage(self):
         """wins / (wins + losses), if any games played. Null otherwise.
         Original formula: IF (gamesPlayed>0) THEN (wins / gamesPlayed) ELSE null
         """
-        return IF (gamesPlayed>0) THEN (wins / gamesPlayed) ELSE None
+        return ((self.wins / self.gamesPlayed) if (self.gamesPlayed > 0) else None)
 
-    @property
+    @memoized_property
     def averageTeamBattingAverage(self):
         """The average batting average among all players on the roster, purely aggregator.
         Original formula: AVG(roster.careerBattingAverage)
         """
-        return _AVG(roster.careerBattingAverage)
+        return AVG(_column(self.roster, 'careerBattingAverage'))
 
-    @property
+    @memoized_property
     def totalTeamRuns(self):
         """Total runs scored by this team (across all games). Implementation conceptual.
         Original formula: SUM(GameInnings where offense=this.id => runsScored )
         """
-        return _SUM(GameInnings where offense==self.id => runsScored)
+        return SUM(x.runsScored for x in _extent('GameInnings') if (x.offense == self.id))
 
-    @property
+    @memoized_property
     def totalTeamHomeRuns(self):
         """Sum of home runs hit by all players on this team.
         Original formula: SUM(roster -> careerHomeRuns)
         """
-        return _SUM(roster -> careerHomeRuns)
+        return SUM(x.careerHomeRuns for x in self.roster)
 
-    @property
+    @memoized_property
     def totalTeamStolenBases(self):
         """Sum of stolen bases by all players on this team.
         Original formula: SUM(roster -> careerStolenBases)
         """
-        return _SUM(roster -> careerStolenBases)
+        return SUM(x.careerStolenBases for x in self.roster)
 
-    @property
+    @memoized_property
     def averageFieldingPercentage(self):
         """The team’s overall fielding percentage, averaging all players’ fielding percentages who actively field.
         Original formula: AVG(roster -> careerFieldingPercentage )
         """
-        return _AVG(roster -> careerFieldingPercentage)
+        return AVG(_column(self.roster, 'careerFieldingPercentage'))
 
-    @property
+    @memoized_property
     def winningPercentageInStadium(self):
         """Team’s historical winning percentage in a given stadium—pure aggregator referencing stadium-based game data.
         Original formula: WIN_PCT_BY_STADIUM_FUNCTION(this.id)
         """
         return win_pct_by_stadium_function(self.id)
 
-    @property
+    @memoized_property
     def bestPitcher(self):
         """Finds the pitcher on this team with the lowest ERA (pure aggregator).
         Original formula: MINBY(roster where playerIsPitcher=true, p => p.careerERA)
         """
-        return _MINBY(roster where playerIsPitcher==True, p => p.careerERA)
+        return MINBY((x for x in self.roster if (x.playerIsPitcher == True)), (lambda p: p.careerERA))
 
-    @property
+    @memoized_property
     def totalWalks(self):
         """Sums all walks drawn by players on this team.
         Original formula: SUM(roster => careerWalks)
         """
-        return _SUM(roster => careerWalks)
+        return SUM(_column(self.roster, 'careerWalks'))
 
-    @property
+    @memoized_property
     def totalHitByPitch(self):
         """Sums all HBP events for players on this team.
         Original formula: SUM(roster => careerHitByPitch)
         """
-        return _SUM(roster => careerHitByPitch)
+        return SUM(_column(self.roster, 'careerHitByPitch'))
 
-    @property
+    @memoized_property
     def teamSluggingPct(self):
         """Overall slugging percentage for the team, computed by summing total bases across all players and dividing by total at-bats.
         Original formula: (SUM(roster => totalBases) / SUM(roster => careerAtBats))
         """
-        return (_SUM(roster => totalBases) / _SUM(roster => careerAtBats))
+        return (SUM(_column(self.roster, 'totalBases')) / SUM(_column(self.roster, 'careerAtBats')))
 
-    @property
+    @memoized_property
     def homeRunsPerGame(self):
         """Team’s home runs divided by the total games played, if gamesPlayed>0.
         Original formula: IF(gamesPlayed>0) THEN (totalTeamHomeRuns / gamesPlayed) ELSE null
         """
-        return IF(gamesPlayed>0) THEN (totalTeamHomeRuns / gamesPlayed) ELSE None
+        return ((self.totalTeamHomeRuns / self.gamesPlayed) if (self.gamesPlayed > 0) else None)
 
-    @property
+    @memoized_property
     def pitcherCount(self):
         """Number of players on the roster who are pitchers (or have pitched). Implementation conceptual if 'playerIsPitcher' is known.
         Original formula: COUNT(roster WHERE playerIsPitcher=true)
         """
-        return _COUNT(roster WHERE playerIsPitcher==True)
+        return COUNT([x for x in self.roster if (x.playerIsPitcher == True)])
 
-    @property
+    @memoized_property
     def shutoutsAchieved(self):
         """Count how many shutout wins this team has recorded. Conceptual aggregator scanning final games where runsAllowed=0.
         Original formula: COUNT(Game WHERE winnerId=this.id AND (IF homeTeamId=this.id THEN runsAway=0 ELSE runsHome=0))
         """
-        return _COUNT(Game WHERE winnerId==self.id  and  (IF homeTeamId==self.id THEN runsAway==0 ELSE runsHome==0))
+        return COUNT([x for x in _lookup_calculated('Game', 'winnerId', self.id) if ((x.runsAway == 0) if (x.homeTeamId == self.id) else (x.runsHome == 0))])
 
-    @property
+    @memoized_property
     def currentWinStreak(self):
         """How many consecutive games (starting with the most recent) the team has won. Implementation conceptual, purely aggregator-based.
         Original formula: CALC_CURRENT_WIN_STREAK(this.id)
         """
         return CALC_CURRENT_WIN_STREAK(self.id)
 
-    @property
+    @memoized_property
     def pythagWinPct(self):
         """Estimates winning percentage from runs scored vs. runs allowed (Pythagorean expectation).
         Original formula: IF(totalTeamRuns>0 OR runsAllowed>0) THEN (POWER(totalTeamRuns,2)/(POWER(totalTeamRuns,2)+POWER(runsAllowed,2))) ELSE null
         """
-        return IF(totalTeamRuns>0  or  runsAllowed>0) THEN ((totalTeamRuns**2)/((totalTeamRuns**2)+(runsAllowed**2))) ELSE None
+        return (((self.totalTeamRuns ** 2) / ((self.totalTeamRuns ** 2) + (self.runsAllowed ** 2))) if ((self.totalTeamRuns > 0) or (self.runsAllowed > 0)) else None)
 
-    @property
+    @memoized_property
     def teamWalkRate(self):
         """Walks drawn per plate appearance by the entire team.
         Original formula: totalWalks / totalPlateAppearances
         """
-        return totalWalks / totalPlateAppearances
+        return (self.totalWalks / self.totalPlateAppearances)
 
-    @property
+    @memoized_property
     def teamStrikeoutRate(self):
         """Team-wide ratio of strikeouts to total plate appearances.
         Original formula: (COUNT(AtBat WHERE offenseTeam=this.id AND result='STRIKEOUT')) / totalPlateAppearances
         """
-        return (_COUNT(AtBat WHERE offenseTeam==self.id  and  result=='STRIKEOUT')) / totalPlateAppearances
+        return (COUNT([x for x in _lookup('AtBat', 'result', 'STRIKEOUT') if (x.offenseTeam == self.id)]) / self.totalPlateAppearances)
 
-    @property
+    @memoized_property
     def runsAllowed(self):
         """Total runs allowed by this team across all games (aggregator from the defensive perspective).
         Original formula: SUM(GameInnings WHERE defenseTeamId=this.id => runsScored)
         """
-        return _SUM(GameInnings WHERE defenseTeamId==self.id => runsScored)
+        return SUM(x.runsScored for x in _extent('GameInnings') if (x.defenseTeamId == self.id))
 
-    @property
+    @memoized_property
     def hasExceededPitcherRosterLimit(self):
         """
         Original formula: pitcherCount > 13
         """
-        return pitcherCount > 13
+        return (self.pitcherCount > 13)
 
-    @property
+    @memoized_property
     def currentlyHasDHAvailable(self):
         """
         Original formula: NOT allDesignatedHittersUsedUp( this.id )
         """
-        return not  all_designated_hitters_used_up( self.id )
+        return (not all_designated_hitters_used_up(self.id))
 
-    @property
+    @memoized_property
     def teamErrorCount(self):
         """
         Original formula: COUNT( ErrorEvent WHERE ErrorEvent.teamId = this.id )
         """
-        return _COUNT(ErrorEvent WHERE ErrorEvent.teamId == self.id)
+        return COUNT([x for x in _extent('ErrorEvent') if (x.teamId == self.id)])
 
-    @property
+    @memoized_property
     def isOverLuxuryTaxCap(self):
         """
         Original formula: TEAM_PAYROLL( this.id ) > LUXURY_TAX_THRESHOLD
         """
-        return team_payroll( self.id ) > LUXURY_TAX_THRESHOLD
+        return (team_payroll(self.id) > LUXURY_TAX_THRESHOLD)
 
-    @property
+    @memoized_property
     def hasActiveChickenDancer(self):
         """
         Original formula: EXISTS( Player WHERE Player.team_id = this.id AND Player.chickenStanceIndicator = true )
         """
-        return _EXISTS( Player WHERE Player.team_id == self.id  and  Player.chickenStanceIndicator == True )
+        return EXISTS(x for x in _lookup('Player', 'team_id', self.id) if (x.chickenStanceIndicator == True))
 
-    @property
+    @memoized_property
     def dhSlotInUse(self):
         """If the rule set has DH enabled and the team has at least one pitcher, a DH slot may be in use. This aggregator references the team's league's rule set for demonstration.
         Original formula: IF (this.league_id.ruleSetId.dhEnabled = true AND pitcherCount > 0) THEN 'DH Slot Active' ELSE 'No DH Slot'
         """
-        return IF (self.league_id.ruleSetId.dhEnabled == True  and  pitcherCount > 0) THEN 'DH Slot Active' ELSE 'No DH Slot'
+        return ('DH Slot Active' if ((self.league_id.ruleSetId.dhEnabled == True) and (self.pitcherCount > 0)) else 'No DH Slot')
 
-    @property
+    @memoized_property
     def maxRosterSize(self):
         """Specifies maximum roster size allowed by the rule set. Some leagues limit rosters to fewer players.
         Original formula: IF (this.league_id.ruleSetId.ruleSetName='LittleLeague_2025') THEN 14 ELSE 26
         """
-        return IF (self.league_id.ruleSetId.ruleSetName=='LittleLeague_2025') THEN 14 ELSE 26
+        return (14 if (self.league_id.ruleSetId.ruleSetName == 'LittleLeague_2025') else 26)
 
-    @property
+    @memoized_property
     def extendedRosterAllowed(self):
         """Indicates if additional players are permitted on the roster temporarily (some leagues allow expanded rosters in certain months).
         Original formula: IF (this.league_id.ruleSetId.ruleSetName='September_Expansions') THEN true ELSE false
         """
-        return IF (self.league_id.ruleSetId.ruleSetName=='September_Expansions') THEN True ELSE False
+        return (True if (self.league_id.ruleSetId.ruleSetName == 'September_Expansions') else False)
 
-class Player:
+class Player(_Entity):
     """Plain data container for Player entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'careerAtBats': ('careerBattingAverage', 'careerIso', 'careerOPS', 'careerPlateAppearances', 'careerSluggingPct', 'isTwoWayPlayer', 'onBasePercentage', 'ops', 'sluggingPercentage'),
+        'careerBattingAverage': ('careerIso',),
+        'careerDefensiveChances': ('careerFieldingPercentage',),
+        'careerDefensiveErrors': ('careerDefensiveChances', 'careerFieldingPercentage'),
+        'careerHitByPitch': ('careerOPS', 'careerPlateAppearances', 'onBasePercentage', 'ops'),
+        'careerHits': ('careerBattingAverage', 'careerIso', 'careerOPS', 'onBasePercentage', 'ops'),
+        'careerInningsPitched': ('isTwoWayPlayer',),
+        'careerPitchCount': ('daysRestRequired', 'isEligiblePitcher', 'pitchCountLimitReached'),
+        'careerSacBunts': ('careerPlateAppearances',),
+        'careerSacFlies': ('careerOPS', 'careerPlateAppearances', 'onBasePercentage', 'ops'),
+        'careerSluggingPct': ('careerIso', 'careerOPS'),
+        'careerWalks': ('careerOPS', 'careerPlateAppearances', 'onBasePercentage', 'ops'),
+        'id': ('careerAtBats', 'careerBattingAverage', 'careerDefensiveChances', 'careerDefensiveErrors', 'careerDoublePlaysGroundedInto', 'careerDoublePlaysTurned', 'careerFieldingPercentage', 'careerGrandSlams', 'careerHitByPitch', 'careerHits', 'careerInningsPitched', 'careerIso', 'careerMaxHomeRunDistance', 'careerOPS', 'careerPitchCount', 'careerPlateAppearances', 'careerSacBunts', 'careerSacFlies', 'careerSluggingPct', 'careerStrikeoutsPitched', 'careerTriplePlaysTurned', 'careerWOBA', 'careerWRCPlus', 'careerWalkOffHits', 'careerWalks', 'chickenStanceIndicator', 'consecutiveGamesPlayedStreak', 'daysRestRequired', 'daysSinceLastRest', 'hasCycleInAnyGame', 'highestExitVelocity', 'hitsAbove100ExitVelo', 'isEligiblePitcher', 'isTooOldForLeague', 'isTwoWayPlayer', 'longestHitStreak', 'longestOnBaseStreak', 'lowestExitVelocity', 'onBasePercentage', 'ops', 'outsRecordedAsPitcher', 'pitchCountLimitReached', 'sluggingPercentage', 'totalBases'),
+        'onBasePercentage': ('careerOPS', 'ops'),
+        'pitchCountLimitReached': ('daysRestRequired',),
+        'sluggingPercentage': ('ops',),
+        'team_id': ('daysRestRequired', 'isEligiblePitcher', 'isTooOldForLeague', 'pitchCountLimitReached'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'careerAtBats': ('AtBat',),
+        'careerBattingAverage': ('AtBat',),
+        'careerDefensiveChances': ('ErrorEvent', 'OutEvent'),
+        'careerDefensiveErrors': ('ErrorEvent',),
+        'careerDoublePlaysGroundedInto': ('AtBat',),
+        'careerDoublePlaysTurned': ('OutEvent',),
+        'careerFieldingPercentage': ('ErrorEvent', 'OutEvent'),
+        'careerGrandSlams': ('AtBat',),
+        'careerHitByPitch': ('AtBat',),
+        'careerHits': ('AtBat',),
+        'careerIso': ('AtBat',),
+        'careerMaxHomeRunDistance': ('AtBat',),
+        'careerOPS': ('AtBat',),
+        'careerPitchCount': ('Pitch',),
+        'careerPlateAppearances': ('AtBat',),
+        'careerSacBunts': ('AtBat',),
+        'careerSacFlies': ('AtBat',),
+        'careerSluggingPct': ('AtBat',),
+        'careerStrikeoutsPitched': ('AtBat',),
+        'careerTriplePlaysTurned': ('OutEvent',),
+        'careerWalkOffHits': ('AtBat',),
+        'careerWalks': ('AtBat',),
+        'chickenStanceIndicator': ('WeirdStanceEvent',),
+        'daysRestRequired': ('Pitch',),
+        'hasCycleInAnyGame': ('AtBat', 'Game'),
+        'highestExitVelocity': ('AtBat',),
+        'hitsAbove100ExitVelo': ('AtBat',),
+        'isEligiblePitcher': ('Pitch',),
+        'isTwoWayPlayer': ('AtBat',),
+        'lowestExitVelocity': ('AtBat',),
+        'onBasePercentage': ('AtBat',),
+        'ops': ('AtBat',),
+        'outsRecordedAsPitcher': ('OutEvent',),
+        'pitchCountLimitReached': ('Pitch',),
+        'sluggingPercentage': ('AtBat',),
+        'totalBases': ('AtBat',),
+    }
+    # fields with a hash index, for 'Entity where field = ...' lookups
+    _INDEXED = frozenset(['team_id'])
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.fullName = kwargs.get('fullName')
         self.battingHand = kwargs.get('battingHand')
         self.throwingHand = kwargs.get('throwingHand')
         self.team_id = kwargs.get('team_id')
 
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
         self.defensivePositions = CollectionWrapper(self, 'defensivePositions')
 
-    @property
+    @memoized_property
     def careerAtBats(self):
         """How many official at-bats the player has had across all games.
         Original formula: COUNT( AtBat where (batterId=this.id) )
         """
-        return _COUNT(AtBat where (batterId==self.id) )
+        return COUNT(_lookup('AtBat', 'batterId', self.id))
 
-    @property
+    @memoized_property
     def careerHits(self):
         """How many hits the player has recorded across all at-bats.
         Original formula: COUNT( AtBat where (batterId=this.id AND result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN']) )
         """
-        return _COUNT(AtBat where (batterId==self.id  and  result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN']) )
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if (x.result in ['SINGLE', 'DOUBLE', 'TRIPLE', 'HOMERUN'])])
 
-    @property
+    @memoized_property
     def careerBattingAverage(self):
         """(careerHits / careerAtBats). Null if no at-bats.
         Original formula: IF (careerAtBats>0) THEN (careerHits / careerAtBats) ELSE null
         """
-        return IF (careerAtBats>0) THEN (careerHits / careerAtBats) ELSE None
+        return ((self.careerHits / self.careerAtBats) if (self.careerAtBats > 0) else None)
 
-    @property
+    @memoized_property
     def careerPitchCount(self):
         """Total number of pitches thrown by this player, if a pitcher.
         Original formula: COUNT( Pitch where (pitcherId=this.id) )
         """
-        return _COUNT(Pitch where (pitcherId==self.id) )
+        return COUNT([x for x in _extent('Pitch') if (x.pitcherId == self.id)])
 
-    @property
+    @memoized_property
     def careerStrikeoutsPitched(self):
         """How many strikeouts the player (as pitcher) has recorded.
         Original formula: COUNT( AtBat where (pitcherId=this.id AND result='STRIKEOUT') )
         """
-        return _COUNT(AtBat where (pitcherId==self.id  and  result=='STRIKEOUT') )
+        return COUNT([x for x in _lookup('AtBat', 'pitcherId', self.id) if (x.result == 'STRIKEOUT')])
 
-    @property
+    @memoized_property
     def careerInningsPitched(self):
         """Summation of partial innings if the player is a pitcher. Implementation conceptual.
         Original formula: AccumulateInningsFromOuts( sum_of_outs_where_pitcherId=this.id )
         """
-        return AccumulateInningsFromOuts( sum_of_outs_where_pitcherId==self.id )
+        return AccumulateInningsFromOuts((self.sum_of_outs_where_pitcherId == self.id))
 
-    @property
+    @memoized_property
     def onBasePercentage(self):
         """OBP = (H + BB + HBP) / (AB + BB + HBP + SF). Implementation conceptual if advanced data is tracked.
         Original formula: IF (plateAppearances>0) THEN ((careerHits + careerWalks + careerHitByPitch) / (careerAtBats + careerWalks + careerHitByPitch + careerSacFlies)) ELSE null
         """
-        return IF (plateAppearances>0) THEN ((careerHits + careerWalks + careerHitByPitch) / (careerAtBats + careerWalks + careerHitByPitch + careerSacFlies)) ELSE None
+        return ((((self.careerHits + self.careerWalks) + self.careerHitByPitch) / (((self.careerAtBats + self.careerWalks) + self.careerHitByPitch) + self.careerSacFlies)) if (self.plateAppearances > 0) else None)
 
-    @property
+    @memoized_property
     def sluggingPercentage(self):
         """Total bases / at-bats. Implementation conceptual if we track 2B,3B,HR, etc.
         Original formula: IF (careerAtBats>0) THEN (sumOfTotalBases / careerAtBats) ELSE null
         """
-        return IF (careerAtBats>0) THEN (sumOfTotalBases / careerAtBats) ELSE None
+        return ((self.sumOfTotalBases / self.careerAtBats) if (self.careerAtBats > 0) else None)
 
-    @property
+    @memoized_property
     def ops(self):
         """On-base plus slugging, purely aggregator of the OBP + SLG fields.
         Original formula: onBasePercentage + sluggingPercentage
         """
-        return onBasePercentage + sluggingPercentage
+        return (self.onBasePercentage + self.sluggingPercentage)
 
-    @property
+    @memoized_property
     def stolenBasePercentage(self):
         """stolenBases / (stolenBases + caughtStealing). Implementation conceptual if we track that data.
         Original formula: IF ((careerStolenBases + careerCaughtStealing) > 0) THEN (careerStolenBases / (careerStolenBases + careerCaughtStealing)) ELSE null
         """
-        return IF ((careerStolenBases + careerCaughtStealing) > 0) THEN (careerStolenBases / (careerStolenBases + careerCaughtStealing)) ELSE None
+        return ((self.careerStolenBases / (self.careerStolenBases + self.careerCaughtStealing)) if ((self.careerStolenBases + self.careerCaughtStealing) > 0) else None)
 
-    @property
+    @memoized_property
     def isTwoWayPlayer(self):
         """Boolean indicating if the player has pitched and also batted as a regular hitter. Implementation conceptual.
         Original formula: IF (careerInningsPitched > 0 AND careerAtBats > 0) THEN true ELSE false
         """
-        return IF (careerInningsPitched > 0  and  careerAtBats > 0) THEN True ELSE False
+        return (True if ((self.careerInningsPitched > 0) and (self.careerAtBats > 0)) else False)
 
-    @property
+    @memoized_property
     def careerWalks(self):
         """Count of times the player reached base via walk (BB).
         Original formula: COUNT( AtBat where batterId=this.id AND result='WALK' )
         """
-        return _COUNT(AtBat where batterId==self.id  and  result=='WALK')
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if (x.result == 'WALK')])
 
-    @property
+    @memoized_property
     def careerHitByPitch(self):
         """Count of times the player was hit by a pitch (HBP).
         Original formula: COUNT( AtBat where batterId=this.id AND result='HIT_BY_PITCH' )
         """
-        return _COUNT(AtBat where batterId==self.id  and  result=='HIT_BY_PITCH')
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if (x.result == 'HIT_BY_PITCH')])
 
-    @property
+    @memoized_property
     def careerSacFlies(self):
         """Count of official at-bats with a sac fly result.
         Original formula: COUNT( AtBat where batterId=this.id AND result='SAC_FLY')
         """
-        return _COUNT(AtBat where batterId==self.id  and  result=='SAC_FLY')
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if (x.result == 'SAC_FLY')])
 
-    @property
+    @memoized_property
     def careerDoublePlaysGroundedInto(self):
         """Number of times the player has grounded into a double play.
         Original formula: COUNT( AtBat where batterId=this.id AND result='GROUNDED_INTO_DOUBLE_PLAY')
         """
-        return _COUNT(AtBat where batterId==self.id  and  result=='GROUNDED_INTO_DOUBLE_PLAY')
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if (x.result == 'GROUNDED_INTO_DOUBLE_PLAY')])
 
-    @property
+    @memoized_property
     def highestExitVelocity(self):
         """Max exit velocity recorded for batted balls by this player (across all relevant at-bats).
         Original formula: MAX( AtBat where batterId=this.id => exitVelocity )
         """
-        return max( AtBat where batterId==self.id => exitVelocity )
+        return MAX(_column(_lookup('AtBat', 'batterId', self.id), 'exitVelocity'))
 
-    @property
+    @memoized_property
     def lowestExitVelocity(self):
         """Min exit velocity recorded for batted balls by this player.
         Original formula: MIN( AtBat where batterId=this.id => exitVelocity )
         """
-        return min( AtBat where batterId==self.id => exitVelocity )
+        return MIN(_column(_lookup('AtBat', 'batterId', self.id), 'exitVelocity'))
 
-    @property
+    @memoized_property
     def careerSluggingPct(self):
         """Slugging percentage across all at-bats in the player's career (total bases / careerAtBats). Implementation conceptual.
         Original formula: IF(careerAtBats>0) THEN (SUM_OF_PLAYER_TOTAL_BASES(this.id) / careerAtBats) ELSE null
         """
-        return IF(careerAtBats>0) THEN (SUM_OF_PLAYER_TOTAL_BASES(self.id) / careerAtBats) ELSE None
+        return ((SUM_OF_PLAYER_TOTAL_BASES(self.id) / self.careerAtBats) if (self.careerAtBats > 0) else None)
 
-    @property
+    @memoized_property
     def careerOPS(self):
         """Career On-base plus slugging for this player: onBasePercentage + careerSluggingPct.
         Original formula: onBasePercentage + careerSluggingPct
         """
-        return onBasePercentage + careerSluggingPct
+        return (self.onBasePercentage + self.careerSluggingPct)
 
-    @property
+    @memoized_property
     def hitsAbove100ExitVelo(self):
         """Number of hits where the exit velocity exceeded 100 mph.
         Original formula: COUNT( AtBat where batterId=this.id AND exitVelocity>100 AND result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN'])
         """
-        return _COUNT(AtBat where batterId==self.id  and  exitVelocity>100  and  result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN'])
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if ((x.exitVelocity > 100) and (x.result in ['SINGLE', 'DOUBLE', 'TRIPLE', 'HOMERUN']))])
 
-    @property
+    @memoized_property
     def outsRecordedAsPitcher(self):
         """How many outs this player has generated in a pitching role. Implementation conceptual—count OutEvents where pitcherId=this.id.
         Original formula: COUNT( OutEvent where (atBatId!=null AND AtBat.pitcherId=this.id) OR (someOtherPitcherOutRef) )
         """
-        return _COUNT(OutEvent where (atBatId!=None  and  AtBat.pitcherId==self.id)  or  (someOtherPitcherOutRef) )
+        return COUNT([x for x in _extent('OutEvent') if (((x.atBatId is not None) and (x.AtBat.pitcherId == self.id)) or x.someOtherPitcherOutRef)])
 
-    @property
+    @memoized_property
     def totalBases(self):
         """Sum of bases the player has earned via hits (1 for single, 2 for double, etc.). Implementation conceptual scanning all hits.
         Original formula: SUM( AtBat where batterId=this.id => mapHitToBases(result) )
         """
-        return _SUM(AtBat where batterId==self.id => mapHitToBases(result) )
+        return SUM(mapHitToBases(x.result) for x in _lookup('AtBat', 'batterId', self.id))
 
-    @property
+    @memoized_property
     def hasCycleInAnyGame(self):
         """Indicates whether the player has ever completed a single, double, triple, and home run in the same game.
         Original formula: EXISTS(Game WHERE EXISTS(AtBat[batterId=this.id AND gameId=Game.id AND result='SINGLE']) AND EXISTS(AtBat[batterId=this.id AND gameId=Game.id AND result='DOUBLE']) AND EXISTS(AtBat[batterId=this.id AND gameId=Game.id AND result='TRIPLE']) AND EXISTS(AtBat[batterId=this.id AND gameId=Game.id AND result='HOMERUN']))
         """
-        return _EXISTS(Game WHERE EXISTS(AtBat[batterId==self.id  and  gameId==Game.id  and  result=='SINGLE'])  and  _EXISTS(AtBat[batterId==self.id  and  gameId==Game.id  and  result=='DOUBLE'])  and  _EXISTS(AtBat[batterId==self.id  and  gameId==Game.id  and  result=='TRIPLE'])  and  _EXISTS(AtBat[batterId==self.id  and  gameId==Game.id  and  result=='HOMERUN']))
+        return EXISTS(x for x in _extent('Game') if (((EXISTS(x2 for x2 in _lookup('AtBat', 'batterId', self.id) if ((x2.gameId == x.id) and (x2.result == 'SINGLE'))) and EXISTS(x3 for x3 in _lookup('AtBat', 'batterId', self.id) if ((x3.gameId == x.id) and (x3.result == 'DOUBLE')))) and EXISTS(x4 for x4 in _lookup('AtBat', 'batterId', self.id) if ((x4.gameId == x.id) and (x4.result == 'TRIPLE')))) and EXISTS(x5 for x5 in _lookup('AtBat', 'batterId', self.id) if ((x5.gameId == x.id) and (x5.result == 'HOMERUN')))))
 
-    @property
+    @memoized_property
     def longestHitStreak(self):
         """The maximum consecutive-game hitting streak in the player's career.
         Original formula: CALCULATE_MAX_CONSECUTIVE_HIT_GAMES(playerId=this.id)
         """
-        return calculate_max_consecutive_hit_games(playerId==self.id)
+        return calculate_max_consecutive_hit_games((self.playerId == self.id))
 
-    @property
+    @memoized_property
     def longestOnBaseStreak(self):
         """The maximum consecutive-game streak where the player reached base at least once (hit, walk, HBP, etc.).
         Original formula: CALCULATE_MAX_CONSECUTIVE_ONBASE_GAMES(playerId=this.id)
         """
-        return calculate_max_consecutive_onbase_games(playerId==self.id)
+        return calculate_max_consecutive_onbase_games((self.playerId == self.id))
 
-    @property
+    @memoized_property
     def careerIso(self):
         """Isolated Power = slugging percentage - batting average.
         Original formula: IF(careerSluggingPct!=null AND careerBattingAverage!=null) THEN (careerSluggingPct - careerBattingAverage) ELSE null
         """
-        return IF(careerSluggingPct!=None  and  careerBattingAverage!=None) THEN (careerSluggingPct - careerBattingAverage) ELSE None
+        return ((self.careerSluggingPct - self.careerBattingAverage) if ((self.careerSluggingPct is not None) and (self.careerBattingAverage is not None)) else None)
 
-    @property
+    @memoized_property
     def careerDoublePlaysTurned(self):
         """How many double plays the player has been credited with turning on defense.
         Original formula: COUNT(OutEvent WHERE designation='DOUBLE_PLAY' AND fielderId=this.id)
         """
-        return _COUNT(OutEvent WHERE designation=='DOUBLE_PLAY'  and  fielderId==self.id)
+        return COUNT([x for x in _extent('OutEvent') if ((x.designation == 'DOUBLE_PLAY') and (x.fielderId == self.id))])
 
-    @property
+    @memoized_property
     def careerTriplePlaysTurned(self):
         """How many triple plays the player has been credited with turning on defense.
         Original formula: COUNT(OutEvent WHERE designation='TRIPLE_PLAY' AND fielderId=this.id)
         """
-        return _COUNT(OutEvent WHERE designation=='TRIPLE_PLAY'  and  fielderId==self.id)
+        return COUNT([x for x in _extent('OutEvent') if ((x.designation == 'TRIPLE_PLAY') and (x.fielderId == self.id))])
 
-    @property
+    @memoized_property
     def careerMaxHomeRunDistance(self):
         """Maximum recorded distance of any home run for this player.
         Original formula: MAX(AtBat WHERE batterId=this.id AND result='HOMERUN' => battedBallDistance)
         """
-        return max(AtBat WHERE batterId==self.id  and  result=='HOMERUN' => battedBallDistance)
+        return MAX(x.battedBallDistance for x in _lookup('AtBat', 'batterId', self.id) if (x.result == 'HOMERUN'))
 
-    @property
+    @memoized_property
     def careerGrandSlams(self):
         """Number of home runs with the bases loaded (4 RBI).
         Original formula: COUNT(AtBat WHERE batterId=this.id AND result='HOMERUN' AND baseStateBeforePitch='BASES_LOADED')
         """
-        return _COUNT(AtBat WHERE batterId==self.id  and  result=='HOMERUN'  and  baseStateBeforePitch=='BASES_LOADED')
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if ((x.result == 'HOMERUN') and (x.baseStateBeforePitch == 'BASES_LOADED'))])
 
-    @property
+    @memoized_property
     def careerWalkOffHits(self):
         """Count of game-ending hits delivered by the player (walk-off singles, doubles, etc.).
         Original formula: COUNT(AtBat WHERE batterId=this.id AND result IN ['SINGLE','DOUBLE','TRIPLE','HOMERUN'] AND AtBatEndsGame=true)
         """
-        return _COUNT(AtBat WHERE batterId==self.id  and  result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN']  and  AtBatEndsGame==True)
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if ((x.result in ['SINGLE', 'DOUBLE', 'TRIPLE', 'HOMERUN']) and (x.AtBatEndsGame == True))])
 
-    @property
+    @memoized_property
     def careerWOBA(self):
         """Weighted On-Base Average, using established wOBA coefficients.
         Original formula: CALCULATE_WOBA(this.id)
         """
         return calculate_woba(self.id)
 
-    @property
+    @memoized_property
     def careerWRCPlus(self):
         """Weighted Runs Created Plus, comparing player to league average = 100.
         Original formula: CALCULATE_WRC_PLUS(this.id, LEAGUE_OFFENSIVE_ENVIRONMENT)
         """
         return calculate_wrc_plus(self.id, LEAGUE_OFFENSIVE_ENVIRONMENT)
 
-    @property
+    @memoized_property
     def careerDefensiveErrors(self):
         """Number of times the player committed an error (tracked via ErrorEvent).
         Original formula: COUNT(ErrorEvent WHERE fielderId=this.id)
         """
-        return _COUNT(ErrorEvent WHERE fielderId==self.id)
+        return COUNT([x for x in _extent('ErrorEvent') if (x.fielderId == self.id)])
 
-    @property
+    @memoized_property
     def careerPlateAppearances(self):
         """Comprehensive aggregator for all times the player came to bat, including walks, HBP, sacrifices, etc.
         Original formula: (careerAtBats + careerWalks + careerHitByPitch + careerSacFlies + careerSacBunts)
         """
-        return (careerAtBats + careerWalks + careerHitByPitch + careerSacFlies + careerSacBunts)
+        return ((((self.careerAtBats + self.careerWalks) + self.careerHitByPitch) + self.careerSacFlies) + self.careerSacBunts)
 
-    @property
+    @memoized_property
     def careerDefensiveChances(self):
         """Sum of outs plus errors for which this player was the fielder (defensive opportunities).
         Original formula: (COUNT(OutEvent WHERE fielderId=this.id) + careerDefensiveErrors)
         """
-        return (_COUNT(OutEvent WHERE fielderId==self.id) + careerDefensiveErrors)
+        return (COUNT([x for x in _extent('OutEvent') if (x.fielderId == self.id)]) + self.careerDefensiveErrors)
 
-    @property
+    @memoized_property
     def careerFieldingPercentage(self):
         """Fielding percentage = (chances - errors) / chances, if chances > 0.
         Original formula: IF(careerDefensiveChances>0) THEN ((careerDefensiveChances - careerDefensiveErrors)/careerDefensiveChances) ELSE null
         """
-        return IF(careerDefensiveChances>0) THEN ((careerDefensiveChances - careerDefensiveErrors)/careerDefensiveChances) ELSE None
+        return (((self.careerDefensiveChances - self.careerDefensiveErrors) / self.careerDefensiveChances) if (self.careerDefensiveChances > 0) else None)
 
-    @property
+    @memoized_property
     def careerSacBunts(self):
         """Number of successful sacrifice bunts for the player.
         Original formula: COUNT(AtBat WHERE batterId=this.id AND result='SAC_BUNT')
         """
-        return _COUNT(AtBat WHERE batterId==self.id  and  result=='SAC_BUNT')
+        return COUNT([x for x in _lookup('AtBat', 'batterId', self.id) if (x.result == 'SAC_BUNT')])
 
-    @property
+    @memoized_property
     def consecutiveGamesPlayedStreak(self):
         """
         Original formula: CALCULATE_CONSECUTIVE_GAMES_PLAYED( this.id )
         """
-        return calculate_consecutive_games_played( self.id )
+        return calculate_consecutive_games_played(self.id)
 
-    @property
+    @memoized_property
     def chickenStanceIndicator(self):
         """
         Original formula: EXISTS( WeirdStanceEvent WHERE WeirdStanceEvent.playerId = this.id )
         """
-        return _EXISTS( WeirdStanceEvent WHERE WeirdStanceEvent.playerId == self.id )
+        return EXISTS(x for x in _extent('WeirdStanceEvent') if (x.playerId == self.id))
 
-    @property
+    @memoized_property
     def daysSinceLastRest(self):
         """
         Original formula: CURRENT_DATE - lastRestDate( this.id )
         """
-        return CURRENT_DATE - lastRestDate( self.id )
+        return (CURRENT_DATE - lastRestDate(self.id))
 
-    @property
+    @memoized_property
     def pitchCountLimitReached(self):
         """Check if this player has reached the max pitch count from the rule set, if any.
         Original formula: IF (this.team_id.league_id.ruleSetId.maxPitchCount > 0) THEN (careerPitchCount >= this.team_id.league_id.ruleSetId.maxPitchCount) ELSE false
         """
-        return IF (self.team_id.league_id.ruleSetId.maxPitchCount > 0) THEN (careerPitchCount >= self.team_id.league_id.ruleSetId.maxPitchCount) ELSE False
+        return ((self.careerPitchCount >= self.team_id.league_id.ruleSetId.maxPitchCount) if (self.team_id.league_id.ruleSetId.maxPitchCount > 0) else False)
 
-    @property
+    @memoized_property
     def isEligiblePitcher(self):
         """If the player has not exceeded pitch count and is a pitcher, they're still eligible to pitch.
         Original formula: IF ((careerPitchCount < this.team_id.league_id.ruleSetId.maxPitchCount) AND playerIsPitcher=true) THEN true ELSE false
         """
-        return IF ((careerPitchCount < self.team_id.league_id.ruleSetId.maxPitchCount)  and  playerIsPitcher==True) THEN True ELSE False
+        return (True if ((self.careerPitchCount < self.team_id.league_id.ruleSetId.maxPitchCount) and (self.playerIsPitcher == True)) else False)
 
-    @property
+    @memoized_property
     def daysRestRequired(self):
         """Some youth leagues require rest days if a pitch limit is reached. Implementation conceptual.
         Original formula: IF (pitchCountLimitReached = true) THEN CALCULATE_REST_DAYS(careerPitchCount, lastTimePitched) ELSE 0
         """
-        return IF (pitchCountLimitReached == True) THEN calculate_rest_days(careerPitchCount, lastTimePitched) ELSE 0
+        return (calculate_rest_days(self.careerPitchCount, self.lastTimePitched) if (self.pitchCountLimitReached == True) else 0)
 
-    @property
+    @memoized_property
     def isTooOldForLeague(self):
         """Checks if the player is beyond the age limit if the rule set has an overAgeLimit flag. Implementation conceptual.
         Original formula: IF (this.team_id.league_id.ruleSetId.overAgeLimit = true AND BIRTHDATE_CHECK(this.id)) THEN true ELSE false
         """
-        return IF (self.team_id.league_id.ruleSetId.overAgeLimit == True  and  BIRTHDATE_CHECK(self.id)) THEN True ELSE False
+        return (True if ((self.team_id.league_id.ruleSetId.overAgeLimit == True) and BIRTHDATE_CHECK(self.id)) else False)
 
-class DefensivePosition:
+class DefensivePosition(_Entity):
     """Plain data container for DefensivePosition entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {}
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.positionName = kwargs.get('positionName')
 
-class Game:
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+class Game(_Entity):
     """Plain data container for Game entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'awayTeamId': ('loserId', 'shutoutTeamId', 'winnerId'),
+        'currentInningNumber': ('isMercyRuleTriggered',),
+        'homeTeamId': ('loserId', 'shutoutTeamId', 'winnerId'),
+        'id': ('attendance', 'gameSuspendedDueToWeather', 'hadCycleAchieved', 'hasWalkOffOpportunity', 'largestLead', 'leadChanges', 'manfredRunnerInEffect', 'tieCount', 'totalPitchesInGame', 'totalWalksInGame', 'winningPitcherId'),
+        'innings': ('currentInningNumber', 'isExtraInnings', 'isMercyRuleTriggered', 'manfredRunnerInEffect'),
+        'isExtraInnings': ('manfredRunnerInEffect',),
+        'isShutout': ('shutoutTeamId',),
+        'ruleSetId': ('homeTeamBatsFirst', 'isMercyRuleTriggered', 'limitedInnings', 'skipBottomIfLeading', 'tieAllowed', 'timeLimit', 'useReplayReview'),
+        'runsAway': ('isMercyRuleTriggered', 'isShutout', 'isTieGameInProgress', 'loserId', 'shutoutTeamId', 'winnerId'),
+        'runsHome': ('isMercyRuleTriggered', 'isShutout', 'isTieGameInProgress', 'loserId', 'shutoutTeamId', 'winnerId'),
+        'status': ('isShutout', 'isTieGameInProgress', 'loserId', 'shutoutTeamId', 'winnerId'),
+        'winnerId': ('loserId',),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'gameSuspendedDueToWeather': ('SuspensionEvent',),
+        'hadCycleAchieved': ('BatterCycleEvent',),
+        'totalPitchesInGame': ('Pitch',),
+        'totalWalksInGame': ('AtBat',),
+    }
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.homeTeamId = kwargs.get('homeTeamId')
         self.awayTeamId = kwargs.get('awayTeamId')
         self.status = kwargs.get('status')
         self.ruleSetId = kwargs.get('ruleSetId')
 
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
         self.innings = CollectionWrapper(self, 'innings')
 
-    @property
+    @memoized_property
     def currentInningNumber(self):
         """Highest inningNumber in innings that have started or are in progress.
         Original formula: IF innings != null THEN MAX(innings.inningNumber) ELSE null
         """
-        return IF innings != None THEN max(innings.inningNumber) ELSE None
+        return (MAX(_column(self.innings, 'inningNumber')) if (self.innings is not None) else None)
 
-    @property
+    @memoized_property
     def runsHome(self):
         """Total runs scored by the home team, summing relevant half-innings for the home offense.
         Original formula: SUM( InningHalf.runsScored for all bottomHalves with offensiveTeamId=homeTeamId )
         """
-        return _SUM(InningHalf.runsScored for all bottomHalves with offensiveTeamId==homeTeamId)
+        # Parser error for formula: Expected ')', found 'FOR' at position 27
+        return None
 
-    @property
+    @memoized_property
     def runsAway(self):
         """Total runs scored by the away team, summing relevant half-innings for the away offense.
         Original formula: SUM( InningHalf.runsScored for all topHalves with offensiveTeamId=awayTeamId )
         """
-        return _SUM(InningHalf.runsScored for all topHalves with offensiveTeamId==awayTeamId)
+        # Parser error for formula: Expected ')', found 'FOR' at position 27
+        return None
 
-    @property
+    @memoized_property
     def winnerId(self):
         """If status='FINAL', whichever team has more runs. Null if tie or incomplete.
         Original formula: IF (status='FINAL') THEN (IF runsHome>runsAway THEN homeTeamId ELSE IF runsAway>runsHome THEN awayTeamId ELSE null) ELSE null
         """
-        return IF (status=='FINAL') THEN (IF runsHome>runsAway THEN homeTeamId ELSE IF runsAway>runsHome THEN awayTeamId ELSE None) ELSE None
+        return ((self.homeTeamId if (self.runsHome > self.runsAway) else (self.awayTeamId if (self.runsAway > self.runsHome) else None)) if (self.status == 'FINAL') else None)
 
-    @property
+    @memoized_property
     def loserId(self):
         """Symmetric aggregator to winnerId; identifies losing team if final and not tied.
         Original formula: IF status='FINAL' AND runsHome!=runsAway THEN (IF winnerId=homeTeamId THEN awayTeamId ELSE homeTeamId) ELSE null
         """
-        return IF status=='FINAL'  and  runsHome!=runsAway THEN (IF winnerId==homeTeamId THEN awayTeamId ELSE homeTeamId) ELSE None
+        return ((self.awayTeamId if (self.winnerId == self.homeTeamId) else self.homeTeamId) if ((self.status == 'FINAL') and (self.runsHome != self.runsAway)) else None)
 
-    @property
+    @memoized_property
     def totalPitchesInGame(self):
         """Total number of pitches thrown in this game (pure aggregator across all at-bats).
         Original formula: COUNT( Pitch where pitch.atBatId.inningHalfId.inningId.gameId=this.id )
         """
-        return _COUNT(Pitch where pitch.atBatId.inningHalfId.inningId.gameId==self.id)
+        return COUNT([x for x in _extent('Pitch') if (x.pitch.atBatId.inningHalfId.inningId.gameId == self.id)])
 
-    @property
+    @memoized_property
     def hasWalkOffOpportunity(self):
         """True if it's bottom of 9th+ with the home team trailing/tied so a scoring play could end the game. Implementation conceptual, purely declarative.
         Original formula: EVALUATE_WALKOFF_CONDITION(this.id)
         """
         return EVALUATE_WALKOFF_CONDITION(self.id)
 
-    @property
+    @memoized_property
     def attendance(self):
         """Reference or aggregator for game attendance, e.g., from an external record or data field.
         Original formula: LOOKUP_IN(GameAttendanceRecords, gameId=this.id => attendanceValue)
         """
-        return LOOKUP_IN(GameAttendanceRecords, gameId==self.id => attendanceValue)
+        return LOOKUP_IN(self.GameAttendanceRecords, [x.attendanceValue for x in (self.gameId == self.id)])
 
-    @property
+    @memoized_property
     def isExtraInnings(self):
         """Boolean indicating if the game went beyond the 9th inning.
         Original formula: MAX(innings.inningNumber) > 9
         """
-        return max(innings.inningNumber) > 9
+        return (MAX(_column(self.innings, 'inningNumber')) > 9)
 
-    @property
+    @memoized_property
     def largestLead(self):
         """Maximum difference in runs between the two teams at any point in this game.
         Original formula: CALCULATE_LARGEST_LEAD(gameId=this.id)
         """
-        return calculate_largest_lead(gameId==self.id)
+        return calculate_largest_lead((self.gameId == self.id))
 
-    @property
+    @memoized_property
     def isShutout(self):
         """True if one team finishes with 0 runs (and the game is FINAL).
         Original formula: IF (status='FINAL') THEN ((runsHome==0 AND runsAway>0) OR (runsAway==0 AND runsHome>0)) ELSE false
         """
-        return IF (status=='FINAL') THEN ((runsHome==0  and  runsAway>0)  or  (runsAway==0  and  runsHome>0)) ELSE False
+        return ((((self.runsHome == 0) and (self.runsAway > 0)) or ((self.runsAway == 0) and (self.runsHome > 0))) if (self.status == 'FINAL') else False)
 
-    @property
+    @memoized_property
     def shutoutTeamId(self):
         """If the game is a shutout, indicates which team allowed 0 runs. Null if no shutout or tie at 0-0.
         Original formula: IF (isShutout=true) THEN (IF runsHome==0 THEN awayTeamId ELSE IF runsAway==0 THEN homeTeamId ELSE null) ELSE null
         """
-        return IF (isShutout==True) THEN (IF runsHome==0 THEN awayTeamId ELSE IF runsAway==0 THEN homeTeamId ELSE None) ELSE None
+        return ((self.awayTeamId if (self.runsHome == 0) else (self.homeTeamId if (self.runsAway == 0) else None)) if (self.isShutout == True) else None)
 
-    @property
+    @memoized_property
     def totalWalksInGame(self):
         """Count of all at-bats with 'result=WALK' in both halves across all innings for this game.
         Original formula: COUNT(AtBat WHERE inningHalfId.inningId.gameId=this.id AND result='WALK')
         """
-        return _COUNT(AtBat WHERE inningHalfId.inningId.gameId==self.id  and  result=='WALK')
+        return COUNT([x for x in _lookup('AtBat', 'result', 'WALK') if (x.inningHalfId.inningId.gameId == self.id)])
 
-    @property
+    @memoized_property
     def leadChanges(self):
         """How many times the lead switched from one team to another during this game.
         Original formula: CALCULATE_LEAD_CHANGES(gameId=this.id)
         """
-        return calculate_lead_changes(gameId==self.id)
+        return calculate_lead_changes((self.gameId == self.id))
 
-    @property
+    @memoized_property
     def tieCount(self):
         """How many times the score returned to a tie after first pitch.
         Original formula: CALCULATE_TIE_COUNT(gameId=this.id)
         """
-        return calculate_tie_count(gameId==self.id)
+        return calculate_tie_count((self.gameId == self.id))
 
-    @property
+    @memoized_property
     def isTieGameInProgress(self):
         """
         Original formula: (status = 'IN_PROGRESS') AND (runsHome = runsAway)
         """
-        return (status == 'IN_PROGRESS')  and  (runsHome == runsAway)
+        return ((self.status == 'IN_PROGRESS') and (self.runsHome == self.runsAway))
 
-    @property
+    @memoized_property
     def manfredRunnerInEffect(self):
         """
         Original formula: isExtraInnings = true AND leagueImplementsExtraInningRunnerRule( this.id )
         """
-        return isExtraInnings == True  and  leagueImplementsExtraInningRunnerRule( self.id )
+        return ((self.isExtraInnings == True) and leagueImplementsExtraInningRunnerRule(self.id))
 
-    @property
+    @memoized_property
     def gameSuspendedDueToWeather(self):
         """
         Original formula: EXISTS( SuspensionEvent WHERE gameId = this.id AND reason = 'WEATHER' )
         """
-        return _EXISTS( SuspensionEvent WHERE gameId == self.id  and  reason == 'WEATHER' )
+        return EXISTS(x for x in _extent('SuspensionEvent') if ((x.gameId == self.id) and (x.reason == 'WEATHER')))
 
-    @property
+    @memoized_property
     def winningPitcherId(self):
         """
         Original formula: CALC_WINNING_PITCHER( this.id )
         """
-        return CALC_WINNING_PITCHER( self.id )
+        return CALC_WINNING_PITCHER(self.id)
 
-    @property
+    @memoized_property
     def hadCycleAchieved(self):
         """
         Original formula: EXISTS( BatterCycleEvent WHERE gameId = this.id )
         """
-        return _EXISTS( BatterCycleEvent WHERE gameId == self.id )
+        return EXISTS(x for x in _extent('BatterCycleEvent') if (x.gameId == self.id))
 
-    @property
+    @memoized_property
     def isMercyRuleTriggered(self):
         """Indicates if a mercy rule is triggered based on the rule set. If mercyRuleEnabled is true and run differential >= 10 after the specified inning threshold.
         Original formula: IF (this.ruleSetId.mercyRuleEnabled = true AND currentInningNumber >= this.ruleSetId.mercyRuleInningThreshold AND ABS(runsHome - runsAway) >= 10) THEN true ELSE false
         """
-        return IF (self.ruleSetId.mercyRuleEnabled == True  and  currentInningNumber >= self.ruleSetId.mercyRuleInningThreshold  and  abs(runsHome - runsAway) >= 10) THEN True ELSE False
+        return (True if (((self.ruleSetId.mercyRuleEnabled == True) and (self.currentInningNumber >= self.ruleSetId.mercyRuleInningThreshold)) and (abs((self.runsHome - self.runsAway)) >= 10)) else False)
 
-    @property
+    @memoized_property
     def limitedInnings(self):
         """Specifies how many total innings are played in this rule set. Some youth leagues play only 6 or 7 innings.
         Original formula: IF (this.ruleSetId.ruleSetName='LittleLeague_2025') THEN 6 ELSE IF (this.ruleSetId.ruleSetName='HighSchool_2025') THEN 7 ELSE 9
         """
-        return IF (self.ruleSetId.ruleSetName=='LittleLeague_2025') THEN 6 ELSE IF (self.ruleSetId.ruleSetName=='HighSchool_2025') THEN 7 ELSE 9
+        return (6 if (self.ruleSetId.ruleSetName == 'LittleLeague_2025') else (7 if (self.ruleSetId.ruleSetName == 'HighSchool_2025') else 9))
 
-    @property
+    @memoized_property
     def tieAllowed(self):
         """Whether a tie is allowed in this rule set if the game is not resolved by a certain time or innings limit.
         Original formula: IF (this.ruleSetId.ruleSetName='Friendly_Rec_League') THEN true ELSE false
         """
-        return IF (self.ruleSetId.ruleSetName=='Friendly_Rec_League') THEN True ELSE False
+        return (True if (self.ruleSetId.ruleSetName == 'Friendly_Rec_League') else False)
 
-    @property
+    @memoized_property
     def useReplayReview(self):
         """Whether official replay review is permitted in this rule set.
         Original formula: this.ruleSetId.usesReplayReview
         """
         return self.ruleSetId.usesReplayReview
 
-    @property
+    @memoized_property
     def timeLimit(self):
         """Specifies time limit in minutes if enforced. Some youth leagues have a 120 minute limit.
         Original formula: IF (this.ruleSetId.ruleSetName='LittleLeague_2025') THEN 120 ELSE null
         """
-        return IF (self.ruleSetId.ruleSetName=='LittleLeague_2025') THEN 120 ELSE None
+        return (120 if (self.ruleSetId.ruleSetName == 'LittleLeague_2025') else None)
 
-    @property
+    @memoized_property
     def homeTeamBatsFirst(self):
         """Some special tournaments might let the home team bat first. Usually false in standard baseball.
         Original formula: IF (this.ruleSetId.ruleSetName='SpecialTournament_2025') THEN true ELSE false
         """
-        return IF (self.ruleSetId.ruleSetName=='SpecialTournament_2025') THEN True ELSE False
+        return (True if (self.ruleSetId.ruleSetName == 'SpecialTournament_2025') else False)
 
-    @property
+    @memoized_property
     def skipBottomIfLeading(self):
         """If true, skip bottom half if the home team is ahead after top of final inning. This is the standard MLB end condition, but some leagues do it differently.
         Original formula: IF (this.ruleSetId.ruleSetName='College_2025') THEN true ELSE false
         """
-        return IF (self.ruleSetId.ruleSetName=='College_2025') THEN True ELSE False
+        return (True if (self.ruleSetId.ruleSetName == 'College_2025') else False)
 
-class Inning:
+class Inning(_Entity):
     """Plain data container for Inning entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'bottom': ('isComplete', 'runsThisInning'),
+        'id': ('averageExitVelocityInInning', 'balksInInning', 'largestLeadAtAnyPointThisInning', 'runnersAdvancedOnWildPitch', 'stealAttemptsInInning', 'totalWalksInInning'),
+        'inningNumber': ('isSeventhInningStretch',),
+        'top': ('isComplete', 'runsThisInning'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'averageExitVelocityInInning': ('AtBat',),
+        'balksInInning': ('BalkEvent',),
+        'runnersAdvancedOnWildPitch': ('RunnerAdvanceEvent',),
+        'stealAttemptsInInning': ('StealAttemptEvent',),
+        'totalWalksInInning': ('AtBat',),
+    }
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.gameId = kwargs.get('gameId')
         self.inningNumber = kwargs.get('inningNumber')
 
-    @property
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+    @memoized_property
     def isComplete(self):
         """True if top and bottom half are both complete, or if there's a walk-off scenario that ends the inning early.
         Original formula: top.isComplete AND (bottom==null OR bottom.isComplete)
         """
-        return top.isComplete  and  (bottom==None  or  bottom.isComplete)
+        return (self.top.isComplete and ((self.bottom is None) or self.bottom.isComplete))
 
-    @property
+    @memoized_property
     def runsThisInning(self):
         """Sum of runs in top and bottom half of this inning.
         Original formula: (IF top!=null THEN top.runsScored ELSE 0) + (IF bottom!=null THEN bottom.runsScored ELSE 0)
         """
-        return (IF top!=None THEN top.runsScored ELSE 0) + (IF bottom!=None THEN bottom.runsScored ELSE 0)
+        return ((self.top.runsScored if (self.top is not None) else 0) + (self.bottom.runsScored if (self.bottom is not None) else 0))
 
-    @property
+    @memoized_property
     def averageExitVelocityInInning(self):
         """Mean exit velocity of all batted balls (AtBat.exitVelocity) in top+bottom halves of this inning.
         Original formula: AVG(AtBat where AtBat.inningHalfId.inningId=this.id => exitVelocity)
         """
-        return _AVG(AtBat where AtBat.inningHalfId.inningId==self.id => exitVelocity)
+        return AVG(x.exitVelocity for x in _extent('AtBat') if (x.inningHalfId.inningId == self.id))
 
-    @property
+    @memoized_property
     def totalWalksInInning(self):
         """Count of at-bats with 'result=WALK' in the top and bottom half of this inning combined.
         Original formula: COUNT(AtBat where AtBat.inningHalfId.inningId=this.id AND result='WALK')
         """
-        return _COUNT(AtBat where AtBat.inningHalfId.inningId==self.id  and  result=='WALK')
+        return COUNT([x for x in _lookup('AtBat', 'result', 'WALK') if (x.inningHalfId.inningId == self.id)])
 
-    @property
+    @memoized_property
     def isSeventhInningStretch(self):
         """
         Original formula: inningNumber = 7
         """
-        return inningNumber == 7
+        return (self.inningNumber == 7)
 
-    @property
+    @memoized_property
     def balksInInning(self):
         """
         Original formula: COUNT( BalkEvent WHERE BalkEvent.inningId = this.id )
         """
-        return _COUNT(BalkEvent WHERE BalkEvent.inningId == self.id)
+        return COUNT([x for x in _extent('BalkEvent') if (x.inningId == self.id)])
 
-    @property
+    @memoized_property
     def stealAttemptsInInning(self):
         """
         Original formula: COUNT( StealAttemptEvent WHERE StealAttemptEvent.inningId = this.id )
         """
-        return _COUNT(StealAttemptEvent WHERE StealAttemptEvent.inningId == self.id)
+        return COUNT([x for x in _extent('StealAttemptEvent') if (x.inningId == self.id)])
 
-    @property
+    @memoized_property
     def runnersAdvancedOnWildPitch(self):
         """
         Original formula: COUNT( RunnerAdvanceEvent WHERE reason = 'WILD_PITCH' AND inningId = this.id )
         """
-        return _COUNT(RunnerAdvanceEvent WHERE reason == 'WILD_PITCH'  and  inningId == self.id)
+        return COUNT([x for x in _extent('RunnerAdvanceEvent') if ((x.reason == 'WILD_PITCH') and (x.inningId == self.id))])
 
-    @property
+    @memoized_property
     def largestLeadAtAnyPointThisInning(self):
         """
         Original formula: MAX( leadDifferentialDuringInning( this.id ) )
         """
-        return max( leadDifferentialDuringInning( self.id ) )
+        return MAX(leadDifferentialDuringInning(self.id))
 
-class InningHalf:
+class InningHalf(_Entity):
     """Plain data container for InningHalf entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'atBats': ('battersFaced', 'mostPitchesFacedBySingleBatter'),
+        'id': ('batterInterferenceCalls', 'catchersInterferenceCalls', 'hitByPitchInHalf', 'hitsInHalf', 'hitsWithExitVelocityAbove90', 'infieldFlyCallsInHalf', 'leftOnBase', 'sacrificeBuntsInHalf', 'walksInHalf'),
+        'inningId': ('mustEndDueToMercyRule', 'stealingAllowed'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'batterInterferenceCalls': ('AtBat',),
+        'catchersInterferenceCalls': ('AtBat',),
+        'hitByPitchInHalf': ('AtBat',),
+        'hitsInHalf': ('AtBat',),
+        'hitsWithExitVelocityAbove90': ('AtBat',),
+        'infieldFlyCallsInHalf': ('AtBat',),
+        'sacrificeBuntsInHalf': ('AtBat',),
+        'walksInHalf': ('AtBat',),
+    }
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.halfType = kwargs.get('halfType')
         self.offensiveTeamId = kwargs.get('offensiveTeamId')
@@ -988,102 +1341,125 @@ class InningHalf:
         self.runsScored = kwargs.get('runsScored')
         self.isComplete = kwargs.get('isComplete')
 
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
         self.atBats = CollectionWrapper(self, 'atBats')
 
-    @property
+    @memoized_property
     def battersFaced(self):
         """Number of batters who came up to the plate (size of atBats).
         Original formula: COUNT(atBats)
         """
-        return _COUNT(atBats)
+        return COUNT(self.atBats)
 
-    @property
+    @memoized_property
     def hitsInHalf(self):
         """How many hits (1B,2B,3B,HR) occurred in this half.
         Original formula: COUNT( AtBat where (inningHalfId=this.id AND result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN']) )
         """
-        return _COUNT(AtBat where (inningHalfId==self.id  and  result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN']) )
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if (x.result in ['SINGLE', 'DOUBLE', 'TRIPLE', 'HOMERUN'])])
 
-    @property
+    @memoized_property
     def leftOnBase(self):
         """How many baserunners remained stranded when the half-inning ended. Implementation conceptual, purely aggregator over base-runner state.
         Original formula: CALCULATE_STRANDED_RUNNERS(this.id)
         """
         return calculate_stranded_runners(self.id)
 
-    @property
+    @memoized_property
     def walksInHalf(self):
         """Count of at-bats with 'result= WALK' in this half-inning.
         Original formula: COUNT(AtBat where inningHalfId=this.id AND result='WALK')
         """
-        return _COUNT(AtBat where inningHalfId==self.id  and  result=='WALK')
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if (x.result == 'WALK')])
 
-    @property
+    @memoized_property
     def hitByPitchInHalf(self):
         """Count of at-bats with 'result=HIT_BY_PITCH' in this half-inning.
         Original formula: COUNT(AtBat where inningHalfId=this.id AND result='HIT_BY_PITCH')
         """
-        return _COUNT(AtBat where inningHalfId==self.id  and  result=='HIT_BY_PITCH')
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if (x.result == 'HIT_BY_PITCH')])
 
-    @property
+    @memoized_property
     def mostPitchesFacedBySingleBatter(self):
         """The maximum pitch count in any single AtBat within this half-inning.
         Original formula: MAX(atBats.pitchCountInAtBat)
         """
-        return max(atBats.pitchCountInAtBat)
+        return MAX(_column(self.atBats, 'pitchCountInAtBat'))
 
-    @property
+    @memoized_property
     def hitsWithExitVelocityAbove90(self):
         """Number of hits in this half-inning that had exitVelocity > 90 mph.
         Original formula: COUNT(AtBat where inningHalfId=this.id AND exitVelocity>90 AND result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN'])
         """
-        return _COUNT(AtBat where inningHalfId==self.id  and  exitVelocity>90  and  result in ['SINGLE','DOUBLE','TRIPLE','HOMERUN'])
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if ((x.exitVelocity > 90) and (x.result in ['SINGLE', 'DOUBLE', 'TRIPLE', 'HOMERUN']))])
 
-    @property
+    @memoized_property
     def catchersInterferenceCalls(self):
         """
         Original formula: COUNT( AtBat WHERE inningHalfId = this.id AND result = 'CATCHER_INTERFERENCE' )
         """
-        return _COUNT(AtBat WHERE inningHalfId == self.id  and  result == 'CATCHER_INTERFERENCE')
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if (x.result == 'CATCHER_INTERFERENCE')])
 
-    @property
+    @memoized_property
     def batterInterferenceCalls(self):
         """
         Original formula: COUNT( AtBat WHERE inningHalfId = this.id AND result = 'BATTER_INTERFERENCE' )
         """
-        return _COUNT(AtBat WHERE inningHalfId == self.id  and  result == 'BATTER_INTERFERENCE')
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if (x.result == 'BATTER_INTERFERENCE')])
 
-    @property
+    @memoized_property
     def sacrificeBuntsInHalf(self):
         """
         Original formula: COUNT( AtBat WHERE inningHalfId = this.id AND result = 'SAC_BUNT' )
         """
-        return _COUNT(AtBat WHERE inningHalfId == self.id  and  result == 'SAC_BUNT')
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if (x.result == 'SAC_BUNT')])
 
-    @property
+    @memoized_property
     def infieldFlyCallsInHalf(self):
         """
         Original formula: COUNT( AtBat WHERE inningHalfId = this.id AND specialCall = 'INFIELD_FLY' )
         """
-        return _COUNT(AtBat WHERE inningHalfId == self.id  and  specialCall == 'INFIELD_FLY')
+        return COUNT([x for x in _lookup('AtBat', 'inningHalfId', self.id) if (x.specialCall == 'INFIELD_FLY')])
 
-    @property
+    @memoized_property
     def mustEndDueToMercyRule(self):
         """If the game-level aggregator isMercyRuleTriggered is true, this half-inning must end immediately.
         Original formula: IF (this.inningId.gameId.isMercyRuleTriggered = true) THEN true ELSE false
         """
-        return IF (self.inningId.gameId.isMercyRuleTriggered == True) THEN True ELSE False
+        return (True if (self.inningId.gameId.isMercyRuleTriggered == True) else False)
 
-    @property
+    @memoized_property
     def stealingAllowed(self):
         """Indicates if base stealing is allowed. Some youth leagues restrict leads or steals entirely.
         Original formula: this.inningId.gameId.ruleSetId.allowLeadingOff
         """
         return self.inningId.gameId.ruleSetId.allowLeadingOff
 
-class AtBat:
+class AtBat(_Entity):
     """Plain data container for AtBat entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'ballCount': ('batterHasWalked',),
+        'id': ('ballCount', 'batterHasStruckOut', 'batterHasWalked', 'expectedBattingAverage', 'fouls', 'numberOfBalls', 'plateDisciplineIndex', 'strikeCount'),
+        'numberOfBalls': ('ballCount', 'batterHasWalked'),
+        'pitches': ('pitchCountInAtBat',),
+        'result': ('wasWalk',),
+        'strikeCount': ('batterHasStruckOut',),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'ballCount': ('Pitch',),
+        'batterHasStruckOut': ('Pitch',),
+        'batterHasWalked': ('Pitch',),
+        'fouls': ('Pitch',),
+        'numberOfBalls': ('Pitch',),
+        'strikeCount': ('Pitch',),
+    }
+    # fields with a hash index, for 'Entity where field = ...' lookups
+    _INDEXED = frozenset(['batterId', 'inningHalfId', 'pitcherId', 'result'])
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.inningHalfId = kwargs.get('inningHalfId')
         self.batterId = kwargs.get('batterId')
@@ -1093,118 +1469,139 @@ class AtBat:
         self.exitVelocity = kwargs.get('exitVelocity')
         self.launchAngle = kwargs.get('launchAngle')
 
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
         self.pitches = CollectionWrapper(self, 'pitches')
 
-    @property
+    @memoized_property
     def pitchCountInAtBat(self):
         """Number of pitches thrown in this at-bat.
         Original formula: COUNT(pitches)
         """
-        return _COUNT(pitches)
+        return COUNT(self.pitches)
 
-    @property
+    @memoized_property
     def fouls(self):
         """Number of foul pitches among 'pitches'.
         Original formula: COUNT( Pitch where (atBatId=this.id AND pitchResult='FOUL') )
         """
-        return _COUNT(Pitch where (atBatId==self.id  and  pitchResult=='FOUL') )
+        return COUNT([x for x in _lookup('Pitch', 'atBatId', self.id) if (x.pitchResult == 'FOUL')])
 
-    @property
+    @memoized_property
     def expectedBattingAverage(self):
         """A sabermetric measure (xBA) based on exit velocity, launch angle, etc. Implementation conceptual, purely aggregator.
         Original formula: SABERMETRIC_xBA_FORMULA(this.id)
         """
         return SABERMETRIC_xBA_FORMULA(self.id)
 
-    @property
+    @memoized_property
     def wasWalk(self):
         """Boolean aggregator: true if result='WALK'.
         Original formula: result == 'WALK'
         """
-        return result == 'WALK'
+        return (self.result == 'WALK')
 
-    @property
+    @memoized_property
     def plateDisciplineIndex(self):
         """Conceptual measure of a batter's plate discipline for this at-bat, e.g. proportion of 'chases' outside the zone vs. total pitches.
         Original formula: CALC_PLATE_DISCIPLINE(atBatId=this.id)
         """
-        return CALC_PLATE_DISCIPLINE(atBatId==self.id)
+        return CALC_PLATE_DISCIPLINE((self.atBatId == self.id))
 
-    @property
+    @memoized_property
     def numberOfBalls(self):
         """Count of pitches in this at-bat where pitchResult='BALL'.
         Original formula: COUNT( Pitch where atBatId=this.id AND pitchResult='BALL')
         """
-        return _COUNT(Pitch where atBatId==self.id  and  pitchResult=='BALL')
+        return COUNT([x for x in _lookup('Pitch', 'atBatId', self.id) if (x.pitchResult == 'BALL')])
 
-    @property
+    @memoized_property
     def strikeCount(self):
         """NEW: The count of pitches that are strikes: CALLED_STRIKE, SWINGING_STRIKE, or FOUL.
         Original formula: COUNT(Pitch where atBatId=this.id AND pitchResult IN ['CALLED_STRIKE','SWINGING_STRIKE','FOUL'])
         """
-        return _COUNT(Pitch where atBatId==self.id  and  pitchResult in ['CALLED_STRIKE','SWINGING_STRIKE','FOUL'])
+        return COUNT([x for x in _lookup('Pitch', 'atBatId', self.id) if (x.pitchResult in ['CALLED_STRIKE', 'SWINGING_STRIKE', 'FOUL'])])
 
-    @property
+    @memoized_property
     def ballCount(self):
         """NEW: The count of pitches that are balls.
         Original formula: numberOfBalls
         """
-        return numberOfBalls
+        return self.numberOfBalls
 
-    @property
+    @memoized_property
     def batterHasStruckOut(self):
         """NEW: True if strikeCount >= 3.
         Original formula: strikeCount >= 3
         """
-        return strikeCount >= 3
+        return (self.strikeCount >= 3)
 
-    @property
+    @memoized_property
     def batterHasWalked(self):
         """NEW: True if ballCount >= 4.
         Original formula: ballCount >= 4
         """
-        return ballCount >= 4
+        return (self.ballCount >= 4)
 
-class Pitch:
+class Pitch(_Entity):
     """Plain data container for Pitch entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'pitchResult': ('isStrike', 'isWildPitch'),
+        'pitchSpinRate': ('adjustedSpinRate', 'isQualityPitch'),
+        'pitchVelocity': ('adjustedSpinRate', 'isQualityPitch'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+    # fields with a hash index, for 'Entity where field = ...' lookups
+    _INDEXED = frozenset(['atBatId'])
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.atBatId = kwargs.get('atBatId')
         self.pitchResult = kwargs.get('pitchResult')
         self.pitchVelocity = kwargs.get('pitchVelocity')
         self.pitchSpinRate = kwargs.get('pitchSpinRate')
 
-    @property
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+    @memoized_property
     def isStrike(self):
         """Boolean aggregator: true if pitchResult is CALLED_STRIKE or SWINGING_STRIKE. Implementation conceptual.
         Original formula: pitchResult IN ['CALLED_STRIKE','SWINGING_STRIKE']
         """
-        return pitchResult in ['CALLED_STRIKE','SWINGING_STRIKE']
+        return (self.pitchResult in ['CALLED_STRIKE', 'SWINGING_STRIKE'])
 
-    @property
+    @memoized_property
     def isQualityPitch(self):
         """True if pitchVelocity > 95 and pitchSpinRate > 2200, purely an example threshold-based aggregator.
         Original formula: pitchVelocity>95 AND pitchSpinRate>2200
         """
-        return pitchVelocity>95  and  pitchSpinRate>2200
+        return ((self.pitchVelocity > 95) and (self.pitchSpinRate > 2200))
 
-    @property
+    @memoized_property
     def adjustedSpinRate(self):
         """Derived spin rate that might account for velocity or environmental factors. Implementation conceptual.
         Original formula: pitchSpinRate * ADJUSTMENT_FACTOR(pitchVelocity)
         """
-        return pitchSpinRate * ADJUSTMENT_FACTOR(pitchVelocity)
+        return (self.pitchSpinRate * ADJUSTMENT_FACTOR(self.pitchVelocity))
 
-    @property
+    @memoized_property
     def isWildPitch(self):
         """
         Original formula: pitchResult = 'WILD_PITCH'
         """
-        return pitchResult == 'WILD_PITCH'
+        return (self.pitchResult == 'WILD_PITCH')
 
-class Statistic:
+class Statistic(_Entity):
     """Plain data container for Statistic entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {}
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.entityType = kwargs.get('entityType')
         self.entityId = kwargs.get('entityId')
@@ -1213,104 +1610,166 @@ class Statistic:
         self.season = kwargs.get('season')
         self.lastUpdated = kwargs.get('lastUpdated')
 
-class Stadium:
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+class Stadium(_Entity):
     """Plain data container for Stadium entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'id': ('averageAttendance', 'averageHRPerGame', 'daysSinceLastGame', 'gamesPlayedInStadium', 'mostRunsInSingleGame'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'averageAttendance': ('GameAttendanceRecords',),
+        'averageHRPerGame': ('Game',),
+        'daysSinceLastGame': ('Game',),
+        'gamesPlayedInStadium': ('Game',),
+        'mostRunsInSingleGame': ('Game',),
+    }
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.stadiumName = kwargs.get('stadiumName')
         self.capacity = kwargs.get('capacity')
 
-    @property
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+    @memoized_property
     def gamesPlayedInStadium(self):
         """Number of games that have taken place in this stadium. Implementation conceptual, would require a link from Game to Stadium.
         Original formula: COUNT(Game where Game.stadiumId = this.id)
         """
-        return _COUNT(Game where Game.stadiumId == self.id)
+        return COUNT([x for x in _extent('Game') if (x.stadiumId == self.id)])
 
-    @property
+    @memoized_property
     def averageAttendance(self):
         """Average attendance across all games played here. Implementation conceptual.
         Original formula: AVG(GameAttendanceRecords where stadiumId=this.id)
         """
-        return _AVG(GameAttendanceRecords where stadiumId==self.id)
+        return AVG(x for x in _extent('GameAttendanceRecords') if (x.stadiumId == self.id))
 
-    @property
+    @memoized_property
     def mostRunsInSingleGame(self):
         """Maximum total runs (home + away) for any game played in this stadium.
         Original formula: MAX( Game where stadiumId=this.id => (runsHome + runsAway) )
         """
-        return max( Game where stadiumId==self.id => (runsHome + runsAway) )
+        return MAX((x.runsHome + x.runsAway) for x in _extent('Game') if (x.stadiumId == self.id))
 
-    @property
+    @memoized_property
     def averageHRPerGame(self):
         """Average number of home runs per game in this stadium. Implementation conceptual if we track HR data by stadium.
         Original formula: AVG(Game => totalHRsInGame) WHERE stadiumId=this.id
         """
-        return _AVG(Game => totalHRsInGame) WHERE stadiumId==self.id
+        return [x2 for x2 in AVG(x.totalHRsInGame for x in _extent('Game')) if (x2.stadiumId == self.id)]
 
-    @property
+    @memoized_property
     def daysSinceLastGame(self):
         """Time (in days) since the most recent game played here. Implementation conceptual—compares current date to the MAX(gameDate).
         Original formula: CURRENT_DATE - MAX(Game where stadiumId=this.id => gameDate)
         """
-        return CURRENT_DATE - max(Game where stadiumId==self.id => gameDate)
+        return (CURRENT_DATE - MAX(x.gameDate for x in _extent('Game') if (x.stadiumId == self.id)))
 
-class OutEvent:
+class OutEvent(_Entity):
     """Plain data container for OutEvent entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {}
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.inningHalfId = kwargs.get('inningHalfId')
         self.atBatId = kwargs.get('atBatId')
 
-class RunEvent:
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+class RunEvent(_Entity):
     """Plain data container for RunEvent entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {}
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.inningHalfId = kwargs.get('inningHalfId')
         self.atBatId = kwargs.get('atBatId')
         self.runCount = kwargs.get('runCount')
 
-class Season:
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+class Season(_Entity):
     """Plain data container for Season entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'seasonGames': ('gamesInSeason',),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.seasonName = kwargs.get('seasonName')
         self.startDate = kwargs.get('startDate')
         self.endDate = kwargs.get('endDate')
 
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
         self.seasonGames = CollectionWrapper(self, 'seasonGames')
 
-    @property
+    @memoized_property
     def gamesInSeason(self):
         """Counts how many games are in this season (pure aggregator).
         Original formula: COUNT(seasonGames)
         """
-        return _COUNT(seasonGames)
+        return COUNT(self.seasonGames)
 
-class SeasonTeamStats:
+class SeasonTeamStats(_Entity):
     """Plain data container for SeasonTeamStats entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {
+        'seasonId': ('runDifferential', 'teamWinningStreak'),
+        'teamId': ('runDifferential', 'teamWinningStreak'),
+    }
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {
+        'runDifferential': ('Game',),
+    }
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.seasonId = kwargs.get('seasonId')
         self.teamId = kwargs.get('teamId')
 
-    @property
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
+
+    @memoized_property
     def teamWinningStreak(self):
         """Longest consecutive wins streak for the team during this season. Implementation conceptual.
         Original formula: CALCULATE_MAX_WIN_STREAK(teamId, seasonId)
         """
-        return calculate_max_win_streak(teamId, seasonId)
+        return calculate_max_win_streak(self.teamId, self.seasonId)
 
-    @property
+    @memoized_property
     def runDifferential(self):
         """Runs scored minus runs allowed by a team in a given season.
         Original formula: (SUM(Game[seasonId=this.seasonId AND (homeTeamId=this.teamId OR awayTeamId=this.teamId) => runsScoredByTeam]) - SUM(Game[seasonId=this.seasonId AND (homeTeamId=this.teamId OR awayTeamId=this.teamId) => runsAllowedByTeam]))
         """
-        return (_SUM(Game[seasonId==self.seasonId  and  (homeTeamId==self.teamId  or  awayTeamId==self.teamId) => runsScoredByTeam]) - _SUM(Game[seasonId==self.seasonId  and  (homeTeamId==self.teamId  or  awayTeamId==self.teamId) => runsAllowedByTeam]))
+        return (SUM(x.runsScoredByTeam for x in _extent('Game') if ((x.seasonId == self.seasonId) and ((x.homeTeamId == self.teamId) or (x.awayTeamId == self.teamId)))) - SUM(x2.runsAllowedByTeam for x2 in _extent('Game') if ((x2.seasonId == self.seasonId) and ((x2.homeTeamId == self.teamId) or (x2.awayTeamId == self.teamId)))))
 
-class RuleSet:
+class RuleSet(_Entity):
     """Plain data container for RuleSet entities."""
+    # input name -> calculated fields to drop from the memo when it changes
+    _DEPENDENTS = {}
+    # calculated field -> entity extents whose versions stamp its memo entry
+    _EXTENT_DEPS = {}
+
     def __init__(self, **kwargs):
+        _register(self)
         self.id = kwargs.get('id')
         self.ruleSetName = kwargs.get('ruleSetName')
         self.dhEnabled = kwargs.get('dhEnabled')
@@ -1323,3 +1782,5 @@ class RuleSet:
         self.overAgeLimit = kwargs.get('overAgeLimit')
         self.usesReplayReview = kwargs.get('usesReplayReview')
         self.allowLeadingOff = kwargs.get('allowLeadingOff')
+
+        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the code generator, generated-SDK aggregations and the
+quantum-walk engine.
+
+    python tools/cmcc_bench.py -o bench.json
+    python tools/cmcc_bench.py -o new.json --baseline bench.json
+
+Workloads (pick with --only):
+  codegen    generate_module() on every domain meta-model in the repo and
+             on each domain of the SSoT cmcc-toe-meta-model.json
+  baseball   synthetic leagues of --pitches pitches: Team.wins,
+             AtBat.strikeCount and League.leagueOPSLeaders (TOPN)
+  triangle   triangleness Polygons with --edges edges/angles
+  evolve     EVOLVE coin+shift+barrier steps on --grids n x n grids
+
+SDK workloads regenerate their module from the meta-model with the current
+generator, so they measure generator changes too.  Each case is timed
+--repeat times on fresh objects and the best time is kept.  Results are
+written as JSON; with --baseline every case also reports its time ratio
+against the stored run, and the exit status is 1 if any case is more than
+--threshold (and over a millisecond) slower.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+TOOLS = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(TOOLS)
+SSOT = os.path.join(REPO, "SSoT", "cmcc-toe-meta-model.json")
+BASEBALL_MODEL = os.path.join(REPO, "sports", "baseball", "baseball-meta-model.json")
+TRIANGLE_MODEL = os.path.join(REPO, "math", "triangleness", "triangleness-cmcc-meta-model.json")
+WALK_DIR = os.path.join(REPO, "physics", "double-slit-experiment", "derivative-code", "double-slit")
+
+sys.path.insert(0, TOOLS)
+_spec = importlib.util.spec_from_file_location("json_toemm", os.path.join(TOOLS, "json-toemm-to-python-helper.py"))
+generator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generator)
+
+WORKLOADS = ("codegen", "baseball", "triangle", "evolve")
+
+
+def best_of(repeat, setup, run):
+    """Best wall time of `run(setup())` over `repeat` fresh setups, plus all times."""
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    return min(times), times
+
+
+def record(results, name, seconds, times, items, unit):
+    results[name] = {"seconds": seconds, "times": times, "items": items, "unit": unit,
+                     "rate": items / seconds if seconds > 0 else None}
+    print(f"  {name:<60} {seconds:>10.4f}s  {items / seconds if seconds > 0 else float('inf'):>14,.0f} {unit}/s")
+
+
+################################################################
+# Workloads                                                    #
+################################################################
+
+def bench_codegen(results, args):
+    models = []
+    for root, dirs, files in os.walk(REPO):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if name.endswith("meta-model.json") and os.path.join(root, name) != SSOT:
+                path = os.path.join(root, name)
+                with open(path, "r", encoding="utf-8") as f:
+                    try:
+                        entities = generator.load_entities(json.load(f))
+                    except (KeyError, TypeError, AttributeError):
+                        continue
+                models.append((os.path.relpath(path, REPO), entities))
+
+    for rel, entities in models:
+        seconds, times = best_of(args.repeat, lambda: None,
+                                 lambda _: generator.generate_module(entities))
+        record(results, f"codegen/{rel}", seconds, times, len(entities), "entities")
+
+    if os.path.exists(SSOT):
+        def run_ssot(_):
+            count = 0
+            for _, _, entities in generator.ssot_domains(SSOT, tempfile.gettempdir()):
+                generator.generate_module(entities)
+                count += len(entities)
+            run_ssot.count = count
+        seconds, times = best_of(args.repeat, lambda: None, run_ssot)
+        record(results, "codegen/SSoT/cmcc-toe-meta-model.json", seconds, times, run_ssot.count, "entities")
+
+
+def load_sdk(model_path, name, workdir, columnar=False):
+    """Generate the SDK for model_path into workdir and import it under a fresh name."""
+    with open(model_path, "r", encoding="utf-8") as f:
+        entities = generator.load_entities(json.load(f))
+    code, _, _ = generator.generate_module(entities, columnar)
+    path = os.path.join(workdir, f"{name}.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(code)
+
+    def fresh():
+        spec = importlib.util.spec_from_file_location(f"{name}_{time.perf_counter_ns()}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return fresh
+
+
+def build_league(sdk, pitches, seed=0):
+    """
+    A league with `pitches` pitches (~4 per at-bat, ~70 at-bats per game).
+
+    Game.runsHome/runsAway and Player.ops have formulas the model cannot
+    evaluate yet, so subclasses (registered under the same entity names)
+    take them as plain inputs.
+    """
+    rng = random.Random(seed)
+    Game = type("Game", (sdk.Game,), {"runsHome": None, "runsAway": None})
+    Player = type("Player", (sdk.Player,), {"ops": None})
+    league = sdk.League(id="L")
+    teams = []
+    for t in range(30):
+        team = sdk.Team(id=f"T{t}", league_id="L")
+        league.teams.add(team)
+        teams.append(team)
+    players = []
+    for p in range(max(26 * 30, pitches // 100)):
+        player = Player(id=f"P{p}", team_id=teams[p % 30].id)
+        player.ops = rng.random()
+        teams[p % 30].roster.add(player)
+        players.append(player)
+    at_bats = max(1, pitches // 4)
+    for g in range(max(1, at_bats // 70)):
+        home, away = rng.sample(teams, 2)
+        game = Game(id=f"G{g}", homeTeamId=home.id, awayTeamId=away.id, status="FINAL")
+        game.runsHome = rng.randrange(10)
+        game.runsAway = rng.randrange(10)
+    results = ("SINGLE", "DOUBLE", "STRIKEOUT", "WALK", "GROUNDOUT", "FLYOUT", "HOMERUN")
+    pitch_results = ("BALL", "CALLED_STRIKE", "SWINGING_STRIKE", "FOUL", "IN_PLAY")
+    all_at_bats = []
+    for a in range(at_bats):
+        at_bat = sdk.AtBat(id=f"A{a}", batterId=rng.choice(players).id, result=rng.choice(results))
+        all_at_bats.append(at_bat)
+    for p in range(pitches):
+        sdk.Pitch(id=f"X{p}", atBatId=f"A{p % at_bats}", pitchResult=rng.choice(pitch_results))
+    return league, teams, all_at_bats
+
+
+def bench_baseball(results, args, workdir):
+    fresh = load_sdk(BASEBALL_MODEL, "bench_baseball_sdk", workdir, args.columnar)
+    for pitches in args.pitches:
+        def setup():
+            return build_league(fresh(), pitches)
+
+        start = time.perf_counter()
+        setup()
+        build = time.perf_counter() - start
+        record(results, f"baseball/{pitches}/build", build, [build], pitches, "pitches")
+
+        seconds, times = best_of(args.repeat, setup,
+                                 lambda s: [team.wins for team in s[1]])
+        record(results, f"baseball/{pitches}/Team.wins", seconds, times, 30, "teams")
+        seconds, times = best_of(args.repeat, setup,
+                                 lambda s: [at_bat.strikeCount for at_bat in s[2]])
+        record(results, f"baseball/{pitches}/AtBat.strikeCount", seconds, times, max(1, pitches // 4), "at-bats")
+        seconds, times = best_of(args.repeat, setup,
+                                 lambda s: s[0].leagueOPSLeaders)
+        record(results, f"baseball/{pitches}/League.leagueOPSLeaders", seconds, times,
+               max(26 * 30, pitches // 100), "players")
+
+
+def bench_triangle(results, args, workdir):
+    fresh = load_sdk(TRIANGLE_MODEL, "bench_triangle_sdk", workdir, args.columnar)
+    fields = ("edge_count", "angle_count", "largest_angle", "sum_of_angles", "shape_type")
+    for edges in args.edges:
+        def setup():
+            sdk = fresh()
+            rng = random.Random(0)
+            polygon = sdk.Polygon()
+            for _ in range(edges):
+                polygon.edges.add(sdk.Edge())
+                angle = sdk.Angle()
+                angle.angle_degrees = rng.uniform(1, 179)
+                polygon.angles.add(angle)
+            return polygon
+
+        seconds, times = best_of(args.repeat, setup,
+                                 lambda polygon: [getattr(polygon, f) for f in fields])
+        record(results, f"triangle/{edges}/Polygon", seconds, times, edges, "edges")
+
+
+def bench_evolve(results, args):
+    sys.path.insert(0, WALK_DIR)
+    from quantum_walk_blocks import EVOLVE, GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION
+    offsets = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+    coin = np.fft.fft(np.eye(8)) / np.sqrt(8)
+    for n in args.grids:
+        steps = max(2, args.evolve_cells // (n * n))
+        psi_init = GAUSSIAN_IN_Y_AND_UNIFORM_IN_X_AND_DIRECTION(n // 2 - n // 8, n / 20, n, n, 8)
+        mid = n // 2
+        geometry = (offsets, mid, mid - 8, mid - 4, mid + 4, mid + 8)
+        seconds, times = best_of(args.repeat, lambda: None,
+                                 lambda _: EVOLVE(psi_init, steps, 0, False, coin, *geometry))
+        record(results, f"evolve/{n}x{n}", seconds, times, steps, "steps")
+        del psi_init
+
+
+################################################################
+# Results                                                      #
+################################################################
+
+def environment():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO, capture_output=True,
+                             text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        rev = None
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "cpus": os.cpu_count(), "git": rev,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+# Slowdowns smaller than this are timer noise, whatever their ratio.
+_NOISE_SECONDS = 1e-3
+
+
+def compare(results, baseline, threshold):
+    """Print each case's time against the baseline; return the names that regressed."""
+    regressed = []
+    print(f"\n{'case':<62} {'baseline s':>10} {'now s':>10} {'ratio':>7}")
+    for name, now in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:<62} {'-':>10} {now['seconds']:>10.4f} {'new':>7}")
+            continue
+        ratio = now["seconds"] / old["seconds"] if old["seconds"] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + threshold and now["seconds"] - old["seconds"] > _NOISE_SECONDS:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        print(f"{name:<62} {old['seconds']:>10.4f} {now['seconds']:>10.4f} {ratio:>7.2f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generator, generated SDKs and EVOLVE.")
+    parser.add_argument("-o", "--output", default="bench.json", help="JSON results file.")
+    parser.add_argument("--baseline", help="Earlier results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown ratio above which a case counts as a regression (default 0.10).")
+    parser.add_argument("--only", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--columnar", action="store_true", help="Generate the SDKs with --columnar.")
+    parser.add_argument("--pitches", type=int, nargs="+", default=[10**3, 10**4, 10**5],
+                        help="League sizes in pitches (10**7 needs tens of GB).")
+    parser.add_argument("--edges", type=int, nargs="+", default=[10**3, 10**4, 10**5])
+    parser.add_argument("--grids", type=int, nargs="+", default=[201, 701, 2001])
+    parser.add_argument("--evolve-cells", type=int, default=4 * 10**7,
+                        help="Grid cells stepped per EVOLVE case (steps = cells / n^2, at least 2).")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for workload in args.only:
+            print(f"[{workload}]")
+            if workload == "codegen":
+                bench_codegen(results, args)
+            elif workload == "baseball":
+                bench_baseball(results, args, workdir)
+            elif workload == "triangle":
+                bench_triangle(results, args, workdir)
+            elif workload == "evolve":
+                bench_evolve(results, args)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=1)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
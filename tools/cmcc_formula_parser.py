@@ -0,0 +1,965 @@
+#!/usr/bin/env python3
+"""
+cmcc_formula_parser.py
+
+Tokenizer + recursive-descent parser for CMCC aggregation formulas, and a
+Python emitter that walks the resulting AST once.
+
+    compile_formula("COUNT(Pitch where atBatId=this.id)", "AtBat", schema)
+
+Every formula is scanned exactly once by the tokenizer and every token is
+consumed exactly once by the parser, so translation cost is linear in the
+formula length no matter how deeply calls, IF/THEN/ELSE chains or WHERE
+clauses are nested.
+"""
+
+import re
+
+################################################################
+# 0) Errors                                                    #
+################################################################
+
+class FormulaSyntaxError(ValueError):
+    """Raised when a formula cannot be tokenized or parsed."""
+    def __init__(self, message, formula="", pos=None):
+        if pos is not None:
+            message = f"{message} at position {pos}"
+        super().__init__(message)
+        self.formula = formula
+        self.pos = pos
+
+
+################################################################
+# 1) Tokenizer                                                 #
+################################################################
+
+KEYWORDS = {
+    "AND", "OR", "NOT", "IF", "THEN", "ELSE", "WHERE", "IN",
+    "NULL", "TRUE", "FALSE", "LET", "FOR", "IS",
+}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<name>[^\W\d]\w*)
+  | (?P<op>=>|->|==|!=|<>|<=|>=|&&|\|\||[-+*/%^()\[\],.;<>=!])
+""", re.VERBOSE | re.UNICODE)
+
+
+class Token:
+    """A single lexical token: kind is one of number/string/name/keyword/op/eof."""
+    __slots__ = ("kind", "value", "pos")
+
+    def __init__(self, kind, value, pos):
+        self.kind = kind
+        self.value = value
+        self.pos = pos
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r}, {self.pos})"
+
+
+def tokenize(text: str):
+    """Split a formula into a list of Tokens in a single left-to-right scan."""
+    tokens = []
+    pos = 0
+    end = len(text)
+    match = _TOKEN_RE.match
+    while pos < end:
+        m = match(text, pos)
+        if not m:
+            raise FormulaSyntaxError(f"Unexpected character {text[pos]!r}", text, pos)
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "name" and value.upper() in KEYWORDS:
+            tokens.append(Token("keyword", value.upper(), pos))
+        elif kind == "op":
+            # Normalize the C-style spellings onto the formula keywords.
+            if value == "&&":
+                tokens.append(Token("keyword", "AND", pos))
+            elif value == "||":
+                tokens.append(Token("keyword", "OR", pos))
+            elif value == "!":
+                tokens.append(Token("keyword", "NOT", pos))
+            else:
+                tokens.append(Token("op", value, pos))
+        elif kind != "ws":
+            tokens.append(Token(kind, value, pos))
+        pos = m.end()
+    tokens.append(Token("eof", None, end))
+    return tokens
+
+
+################################################################
+# 2) AST nodes                                                 #
+################################################################
+
+class Node:
+    """Base class for formula AST nodes."""
+    __slots__ = ()
+    fields = ()
+
+    def children(self):
+        for name in self.fields:
+            value = getattr(self, name)
+            if isinstance(value, Node):
+                yield value
+            elif isinstance(value, list):
+                for v in value:
+                    if isinstance(v, Node):
+                        yield v
+
+    def walk(self):
+        """Yield this node and every descendant (pre-order)."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children())
+
+    def __repr__(self):
+        args = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.fields)
+        return f"{type(self).__name__}({args})"
+
+
+def _node(name, *field_names):
+    """Build a tiny Node subclass with positional fields."""
+    def __init__(self, *args):
+        for f, a in zip(field_names, args):
+            setattr(self, f, a)
+    return type(name, (Node,), {"__slots__": field_names, "fields": field_names, "__init__": __init__})
+
+
+Number   = _node("Number", "value")               # numeric literal text
+String   = _node("String", "value")               # decoded string literal
+Const    = _node("Const", "value")                # None / True / False
+Name     = _node("Name", "id")                    # bare identifier
+This     = _node("This")                          # 'this'
+Attr     = _node("Attr", "obj", "name")           # obj.name
+Call     = _node("Call", "func", "args")          # func is a Name or an Attr
+Index    = _node("Index", "obj", "index")         # obj[index]
+Filter   = _node("Filter", "obj", "cond")         # Entity[cond] / Entity[cond => proj]
+ListLit  = _node("ListLit", "items")              # [a, b, c]
+Unary    = _node("Unary", "op", "operand")        # -x / +x
+BinOp    = _node("BinOp", "op", "left", "right")  # + - * / % ^
+Compare  = _node("Compare", "op", "left", "right")# = != < > <= >= IN NOT IN
+BoolOp   = _node("BoolOp", "op", "left", "right") # AND / OR
+Not      = _node("Not", "operand")
+IfExpr   = _node("IfExpr", "cond", "then", "orelse")
+Where    = _node("Where", "source", "cond")       # source WHERE cond
+Arrow    = _node("Arrow", "left", "body")         # left => body / left -> body
+Let      = _node("Let", "name", "value", "body")  # LET name = value; body
+ForAll   = _node("ForAll", "var", "source", "cond", "body")
+AllRows  = _node("AllRows", "entity")             # Entity.*
+
+
+################################################################
+# 3) Recursive-descent parser                                  #
+################################################################
+
+# Binary operator precedence, loosest first.  'IN' / 'NOT IN' share the
+# comparison level; '^' is handled separately because it is right-assoc.
+_COMPARE_OPS = {"=", "==", "!=", "<>", "<", ">", "<=", ">="}
+_ADD_OPS = {"+", "-"}
+_MUL_OPS = {"*", "/", "%"}
+
+
+class Parser:
+    """
+    Grammar (loosest binding first):
+
+        formula   := LET name '=' expr ';' formula | expr
+        expr      := where ( ('=>' | '->') expr )?
+        where     := or_expr ( WHERE or_expr )?
+        or_expr   := and_expr ( OR and_expr )*
+        and_expr  := not_expr ( AND not_expr )*
+        not_expr  := NOT not_expr | compare
+        compare   := additive ( (cmp_op | IN | NOT IN | IS [NOT]) additive )*
+        additive  := term ( ('+'|'-') term )*
+        term      := unary ( ('*'|'/'|'%') unary )*
+        unary     := ('-'|'+') unary | power
+        power     := postfix ( '^' unary )?
+        postfix   := primary ( '.' name | '.' '*' | '(' args ')' | '[' expr ']' )*
+        primary   := number | string | NULL | TRUE | FALSE | this | name
+                   | '(' expr ')' | '[' items ']' | if_expr | for_all
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.i = 0
+
+    # -- token helpers -------------------------------------------------
+
+    @property
+    def tok(self):
+        return self.tokens[self.i]
+
+    def advance(self):
+        t = self.tokens[self.i]
+        self.i += 1
+        return t
+
+    def at_op(self, *ops):
+        t = self.tokens[self.i]
+        return t.kind == "op" and t.value in ops
+
+    def at_kw(self, *kws):
+        t = self.tokens[self.i]
+        return t.kind == "keyword" and t.value in kws
+
+    def expect_op(self, op):
+        if not self.at_op(op):
+            self.error(f"Expected {op!r}")
+        return self.advance()
+
+    def expect_kw(self, kw):
+        if not self.at_kw(kw):
+            self.error(f"Expected {kw}")
+        return self.advance()
+
+    def error(self, message):
+        t = self.tok
+        found = "end of formula" if t.kind == "eof" else repr(t.value)
+        raise FormulaSyntaxError(f"{message}, found {found}", self.text, t.pos)
+
+    # -- entry point ---------------------------------------------------
+
+    def parse(self):
+        node = self.parse_formula()
+        if self.tok.kind != "eof":
+            self.error("Unexpected trailing input")
+        return node
+
+    def parse_formula(self):
+        if self.at_kw("LET"):
+            self.advance()
+            if self.tok.kind != "name":
+                self.error("Expected a name after LET")
+            name = self.advance().value
+            if not self.at_op("=", "=="):
+                self.error("Expected '=' in LET")
+            self.advance()
+            value = self.parse_expr()
+            self.expect_op(";")
+            return Let(name, value, self.parse_formula())
+        return self.parse_expr()
+
+    # -- precedence levels --------------------------------------------
+
+    def parse_expr(self):
+        left = self.parse_where()
+        if self.at_op("=>", "->"):
+            self.advance()
+            return Arrow(left, self.parse_expr())
+        return left
+
+    def parse_where(self):
+        left = self.parse_or()
+        if self.at_kw("WHERE"):
+            self.advance()
+            return Where(left, self.parse_or())
+        return left
+
+    def parse_or(self, left=None):
+        left = self.parse_and(left)
+        while self.at_kw("OR"):
+            self.advance()
+            left = BoolOp("or", left, self.parse_and())
+        return left
+
+    def parse_and(self, left=None):
+        left = self.parse_not(left)
+        while self.at_kw("AND"):
+            self.advance()
+            left = BoolOp("and", left, self.parse_not())
+        return left
+
+    def parse_not(self, left=None):
+        if left is None and self.at_kw("NOT"):
+            self.advance()
+            return Not(self.parse_not())
+        return self.parse_compare(left)
+
+    def parse_compare(self, left=None):
+        left = self.parse_additive(left)
+        while True:
+            if self.tok.kind == "op" and self.tok.value in _COMPARE_OPS:
+                op = self.advance().value
+                left = Compare(op, left, self.parse_additive())
+            elif self.at_kw("IN"):
+                self.advance()
+                left = Compare("in", left, self.parse_additive())
+            elif self.at_kw("IS"):
+                self.advance()
+                op = "="
+                if self.at_kw("NOT"):
+                    self.advance()
+                    op = "!="
+                left = Compare(op, left, self.parse_additive())
+            elif self.at_kw("NOT") and self.tokens[self.i + 1].kind == "keyword" \
+                    and self.tokens[self.i + 1].value == "IN":
+                self.i += 2
+                left = Compare("not in", left, self.parse_additive())
+            else:
+                return left
+
+    def parse_additive(self, left=None):
+        left = self.parse_term(left)
+        while self.tok.kind == "op" and self.tok.value in _ADD_OPS:
+            op = self.advance().value
+            left = BinOp(op, left, self.parse_term())
+        return left
+
+    def parse_term(self, left=None):
+        left = self.parse_unary(left)
+        while self.tok.kind == "op" and self.tok.value in _MUL_OPS:
+            op = self.advance().value
+            left = BinOp(op, left, self.parse_unary())
+        return left
+
+    def parse_unary(self, left=None):
+        if left is None and self.at_op("-", "+"):
+            op = self.advance().value
+            return Unary(op, self.parse_unary())
+        return self.parse_power(left)
+
+    def parse_power(self, left=None):
+        base = self.parse_postfix(left)
+        if self.at_op("^"):
+            self.advance()
+            return BinOp("^", base, self.parse_unary())
+        return base
+
+    def parse_postfix(self, node=None):
+        if node is None:
+            node = self.parse_primary()
+        while True:
+            if self.at_op("."):
+                self.advance()
+                if self.at_op("*") and isinstance(node, Name):
+                    self.advance()
+                    node = AllRows(node.id)
+                    continue
+                t = self.tok
+                if t.kind not in ("name", "keyword"):
+                    self.error("Expected a name after '.'")
+                self.advance()
+                node = Attr(node, t.value)
+            elif self.at_op("("):
+                if not isinstance(node, (Name, Attr)):
+                    self.error("Only named functions can be called")
+                node = Call(node, self.parse_args())
+            elif self.at_op("["):
+                self.advance()
+                inner = self.parse_expr()
+                self.expect_op("]")
+                if isinstance(inner, (Compare, BoolOp, Not, Arrow)):
+                    node = Filter(node, inner)
+                else:
+                    node = Index(node, inner)
+            else:
+                return node
+
+    def parse_args(self):
+        self.expect_op("(")
+        args = []
+        if not self.at_op(")"):
+            args.append(self.parse_expr())
+            while self.at_op(","):
+                self.advance()
+                args.append(self.parse_expr())
+        self.expect_op(")")
+        return args
+
+    # -- primaries -----------------------------------------------------
+
+    def parse_primary(self):
+        t = self.tok
+        if t.kind == "number":
+            self.advance()
+            return Number(t.value)
+        if t.kind == "string":
+            self.advance()
+            return String(_decode_string(t.value))
+        if t.kind == "name":
+            self.advance()
+            if t.value.lower() == "this":
+                return This()
+            return Name(t.value)
+        if t.kind == "keyword":
+            if t.value == "NULL":
+                self.advance()
+                return Const(None)
+            if t.value == "TRUE":
+                self.advance()
+                return Const(True)
+            if t.value == "FALSE":
+                self.advance()
+                return Const(False)
+            if t.value == "IF":
+                return self.parse_if()
+            if t.value == "FOR":
+                return self.parse_for_all()
+        if self.at_op("("):
+            self.advance()
+            node = self.parse_expr()
+            self.expect_op(")")
+            return node
+        if self.at_op("["):
+            self.advance()
+            items = []
+            if not self.at_op("]"):
+                items.append(self.parse_expr())
+                while self.at_op(","):
+                    self.advance()
+                    items.append(self.parse_expr())
+            self.expect_op("]")
+            return ListLit(items)
+        self.error("Unexpected token")
+
+    def parse_if(self):
+        """
+        Accepts all three spellings used across the meta-models:
+            IF(cond, a, b)
+            IF (cond) THEN a ELSE b
+            IF cond THEN a [ELSE b]
+        """
+        self.expect_kw("IF")
+        if self.at_op("("):
+            args = self.parse_args()
+            if len(args) == 3 and not self.at_kw("THEN"):
+                return IfExpr(args[0], args[1], args[2])
+            if len(args) != 1:
+                self.error("IF(...) expects (cond, then, else)")
+            # '(cond)' was only the start of the condition; keep climbing.
+            cond = self.parse_or(args[0])
+        else:
+            cond = self.parse_or()
+        self.expect_kw("THEN")
+        then = self.parse_expr()
+        orelse = Const(None)
+        if self.at_kw("ELSE"):
+            self.advance()
+            orelse = self.parse_expr()
+        return IfExpr(cond, then, orelse)
+
+    def parse_for_all(self):
+        """FOR ALL|EACH var IN source [WHERE cond] => body"""
+        self.expect_kw("FOR")
+        if self.tok.kind == "name" and self.tok.value.upper() in ("ALL", "EACH"):
+            self.advance()
+        if self.tok.kind != "name":
+            self.error("Expected a loop variable after FOR")
+        var = self.advance().value
+        self.expect_kw("IN")
+        source = self.parse_or()
+        cond = None
+        if self.at_kw("WHERE"):
+            self.advance()
+            cond = self.parse_or()
+        if not self.at_op("=>", "->"):
+            self.error("Expected '=>' in FOR ALL")
+        self.advance()
+        return ForAll(var, source, cond, self.parse_expr())
+
+
+def _decode_string(literal):
+    body = literal[1:-1]
+    if "\\" in body:
+        body = re.sub(r"\\(.)", r"\1", body)
+    return body
+
+
+def parse_formula(text: str):
+    """Parse a formula string into an AST, raising FormulaSyntaxError on failure."""
+    return Parser(text).parse()
+
+
+################################################################
+# 4) Schema index used for name resolution                     #
+################################################################
+
+class EntityInfo:
+    """What the emitter needs to know about one entity: its members and lookups."""
+    def __init__(self, entity):
+        self.name = entity["name"]
+        self.members = set()
+        self.calculated = set() # members computed from a formula (no stored value)
+        self.collections = {}   # lookup name -> target entity (one_to_many / many_to_many)
+        self.references = {}    # lookup name -> target entity (one_to_one / many_to_one)
+        for f in entity.get("fields", []) + entity.get("aggregations", []):
+            name = f.get("name") or f.get("fieldName")   # a few models spell it fieldName
+            if name:
+                self.members.add(name)
+                if f.get("type") == "calculated" or "formula" in f:
+                    self.calculated.add(name)
+        for lu in entity.get("lookups", []):
+            name = lu.get("name")
+            if not name:
+                continue
+            self.members.add(name)
+            target = lu.get("target_entity") or ""
+            if target.lower() == "this":
+                self.calculated.add(name)
+                continue
+            if lu.get("type") in ("one_to_many", "many_to_many"):
+                self.collections[name] = target
+            else:
+                self.references[name] = target
+
+
+class SchemaIndex:
+    """Entity name -> EntityInfo, built once per generator run."""
+    def __init__(self, entities):
+        self.entities = {}
+        for e in entities:
+            info = EntityInfo(e)
+            self.entities[info.name] = info
+
+    def get(self, name):
+        return self.entities.get(name)
+
+    def __contains__(self, name):
+        return name in self.entities
+
+
+################################################################
+# 5) AST -> Python emitter                                     #
+################################################################
+
+# Formula function name -> (kind, python spelling).
+#   'call'  : rename and call normally
+#   'binop' : two-argument infix operator
+FUNCTION_MAP = {
+    "AVERAGE": ("call", "AVG"),
+    "MAX_BY": ("call", "MAXBY"),
+    "MIN_BY": ("call", "MINBY"),
+    "ABS": ("call", "abs"),
+    "GREATEST": ("call", "max"),
+    "LEAST": ("call", "min"),
+    "FLOOR": ("call", "math.floor"),
+    "CEIL": ("call", "math.ceil"),
+    "CEILING": ("call", "math.ceil"),
+    "SQRT": ("call", "math.sqrt"),
+    "ADD": ("binop", "+"),
+    "SUBTRACT": ("binop", "-"),
+    "MULTIPLY": ("binop", "*"),
+    "DIVIDE": ("binop", "/"),
+    "POWER": ("binop", "**"),
+    "TEAM_PAYROLL": ("call", "team_payroll"),
+    "WIN_PCT_BY_STADIUM_FUNCTION": ("call", "win_pct_by_stadium_function"),
+    "allDesignatedHittersUsedUp": ("call", "all_designated_hitters_used_up"),
+    "CHECK_NO_OVERLAP_IN_ROOM_WITHOUT_BUFFER": ("call", "check_no_overlap_in_room_without_buffer"),
+}
+
+# core_lambda_functions reducers that consume any iterable in one pass.
+STREAMING_FUNCS = {"SUM", "MAX", "MIN", "AVG", "EXISTS", "MINBY", "MAXBY", "MODE", "TOPN"}
+
+_BINOP_PY = {"+": "+", "-": "-", "*": "*", "/": "/", "%": "%", "^": "**"}
+_COMPARE_PY = {"=": "==", "==": "==", "!=": "!=", "<>": "!=", "<": "<", ">": ">",
+               "<=": "<=", ">=": ">=", "in": "in", "not in": "not in"}
+
+_CONSTANT_RE = re.compile(r"^[A-Z][A-Z0-9_]*$")
+_ENTITYLIKE_RE = re.compile(r"^[A-Z][A-Za-z0-9]*[a-z][A-Za-z0-9]*$")
+
+
+class _Value:
+    """An emitted Python expression plus what we know about its shape."""
+    __slots__ = ("code", "entity", "many", "lazy")
+
+    def __init__(self, code, entity=None, many=False, lazy=False):
+        self.code = code
+        self.entity = entity   # entity name of the value (or of its elements)
+        self.many = many       # True if the value is a collection of entities
+        self.lazy = lazy       # True if code is a [list comprehension] that may be streamed
+
+
+class _Element:
+    """One comprehension scope: `for var in source`, iterating `entity` rows."""
+    __slots__ = ("var", "entity")
+
+    def __init__(self, var, entity):
+        self.var = var
+        self.entity = entity
+
+
+class PythonEmitter:
+    """
+    Turns a formula AST into a single Python expression evaluated on `self`.
+
+    Bare names resolve to members of the current entity (self.name), or to
+    the current row inside WHERE / => / [..] scopes.  Entity names used as
+    the source of a WHERE / => / [..] scan every row via _extent('Entity').
+    Navigating through a one_to_many lookup flattens into a list
+    comprehension, so SUM(teams.roster -> careerHomeRuns) becomes
+    SUM(_column(_flatten(self.teams, 'roster'), 'careerHomeRuns')).
+    An extent scan whose condition pins a field to a value known outside
+    the scan (Game where winnerId = this.id AND ...) becomes a hash-index
+    probe, _lookup('Game', 'winnerId', self.id), filtered by the rest.
+
+    While emitting, the members read from `self`, the (entity, member)
+    pairs read from related rows and the entity extents scanned are
+    recorded; the generator turns these into each class's dependency graph.
+    """
+
+    def __init__(self, entity_name=None, schema=None):
+        self.schema = schema or SchemaIndex([])
+        self.this = self.schema.get(entity_name) if entity_name else None
+        self.elements = []      # stack of _Element scopes
+        self.bound = {}         # lambda / LET / FOR ALL variable -> entity (or None)
+        self.calls = set()      # every function name called, for import detection
+        self.reads = set()      # members of `self` this formula reads
+        self.foreign_reads = set()  # (entity, member) read from related rows
+        self.extents = set()    # entity names scanned via _extent(...) or _lookup(...)
+        self.probes = set()     # (entity, input field) pairs looked up via _lookup(...)
+        self._depth = 0
+
+    # -- entry point ---------------------------------------------------
+
+    def emit(self, node):
+        return self.visit(node).code
+
+    # -- dispatch ------------------------------------------------------
+
+    def visit(self, node):
+        return getattr(self, "visit_" + type(node).__name__)(node)
+
+    def visit_Number(self, node):
+        value = node.value
+        if value.isdigit():
+            value = str(int(value))    # '007' is not a valid Python literal
+        return _Value(value)
+
+    def visit_String(self, node):
+        return _Value(repr(node.value))
+
+    def visit_Const(self, node):
+        return _Value(repr(node.value))
+
+    def visit_This(self, node):
+        return _Value("self", self.this.name if self.this else None)
+
+    def visit_ListLit(self, node):
+        return _Value("[" + ", ".join(self.visit(i).code for i in node.items) + "]")
+
+    def visit_Unary(self, node):
+        return _Value(f"({node.op}{self.visit(node.operand).code})")
+
+    def visit_Not(self, node):
+        return _Value(f"(not {self.visit(node.operand).code})")
+
+    def visit_BinOp(self, node):
+        left = self.visit(node.left).code
+        right = self.visit(node.right).code
+        return _Value(f"({left} {_BINOP_PY[node.op]} {right})")
+
+    def visit_BoolOp(self, node):
+        left = self.visit(node.left).code
+        right = self.visit(node.right).code
+        return _Value(f"({left} {node.op} {right})")
+
+    def visit_Compare(self, node):
+        op = _COMPARE_PY[node.op]
+        if op in ("==", "!=") and (_is_null(node.left) or _is_null(node.right)):
+            op = "is" if op == "==" else "is not"
+        left = self.visit(node.left).code
+        right = self.visit(node.right).code
+        return _Value(f"({left} {op} {right})")
+
+    def visit_IfExpr(self, node):
+        cond = self.visit(node.cond).code
+        then = self.visit(node.then).code
+        orelse = self.visit(node.orelse).code
+        return _Value(f"({then} if {cond} else {orelse})")
+
+    def visit_Index(self, node):
+        obj = self.visit(node.obj).code
+        return _Value(f"{obj}[{self.visit(node.index).code}]")
+
+    def visit_AllRows(self, node):
+        self.extents.add(node.entity)
+        return _Value(f"_extent({node.entity!r})", node.entity, True)
+
+    def visit_Let(self, node):
+        value = self.visit(node.value)
+        saved = self.bound.get(node.name, _MISSING)
+        self.bound[node.name] = value.entity
+        body = self.visit(node.body).code
+        self._restore_bound(node.name, saved)
+        return _Value(f"(lambda {node.name}: {body})({value.code})")
+
+    # -- names and navigation -----------------------------------------
+
+    def visit_Name(self, node):
+        name = node.id
+        if name in self.bound:
+            return _Value(name, self.bound[name])
+        if self.elements:
+            # Inside WHERE / => / [..] bare names are columns of the current
+            # row; the outer entity is always reached through 'this.'.
+            el = self.elements[-1]
+            return self._member(_Value(el.var, el.entity), name)
+        if self.this is not None and name in self.this.members:
+            return self._member(_Value("self", self.this.name), name)
+        if name in self.schema:
+            return _Value(f"self.{name}", name)
+        if _CONSTANT_RE.match(name):
+            return _Value(name)
+        return _Value(f"self.{name}")
+
+    def visit_Attr(self, node):
+        obj = node.obj
+        # `Entity.field` inside a WHERE over Entity refers to the current row.
+        if isinstance(obj, Name) and obj.id not in self.bound:
+            for el in reversed(self.elements):
+                if el.entity == obj.id:
+                    return self._member(_Value(el.var, el.entity), node.name)
+        return self._member(self.visit(obj), node.name)
+
+    def _member(self, base, name):
+        if base.code == "self":
+            self.reads.add(name)
+        elif base.entity:
+            self.foreign_reads.add((base.entity, name))
+        info = self.schema.get(base.entity) if base.entity else None
+        target = None
+        many = False
+        if info is not None:
+            if name in info.collections:
+                target, many = info.collections[name], True
+            elif name in info.references:
+                target = info.references[name]
+        if not base.many:
+            return _Value(f"{base.code}.{name}", target, many)
+        # Projections over a collection go through the module's _column /
+        # _flatten helpers, which the --columnar store turns into gathers.
+        if many:
+            return _Value(f"_flatten({base.code}, {name!r})", target, True)
+        return _Value(f"_column({base.code}, {name!r})", target, False)
+
+    # -- collections: WHERE, [..], =>, FOR ALL -------------------------
+
+    def source(self, node):
+        """Emit a node used as the thing being filtered or projected."""
+        if isinstance(node, Name) and node.id not in self.bound:
+            is_member = (self.this is not None and node.id in self.this.members) or \
+                        any(self.schema.get(el.entity) and node.id in self.schema.get(el.entity).members
+                            for el in self.elements if el.entity)
+            if not is_member and (node.id in self.schema or _ENTITYLIKE_RE.match(node.id)):
+                self.extents.add(node.id)
+                return _Value(f"_extent({node.id!r})", node.id, True)
+        if isinstance(node, Where):
+            return self._comprehension(node.source, node.cond, None)
+        if isinstance(node, Filter):
+            return self.visit_Filter(node)
+        value = self.visit(node)
+        return _Value(value.code, value.entity, True)
+
+    def _comprehension(self, source_node, cond_node, body_node, var=None):
+        src = self.source(source_node)
+        if src.code == f"_extent({getattr(source_node, 'id', None)!r})":
+            src, cond_node = self._probe(src, cond_node)
+        if var is None:
+            var = self._fresh()
+            self.elements.append(_Element(var, src.entity))
+            leave = self.elements.pop
+        else:
+            saved = self.bound.get(var, _MISSING)
+            self.bound[var] = src.entity
+            leave = lambda: self._restore_bound(var, saved)
+        try:
+            cond = self.visit(cond_node).code if cond_node is not None else None
+            body = self.visit(body_node).code if body_node is not None else var
+        finally:
+            leave()
+        if cond is None and body_node is None:
+            return _Value(src.code, src.entity, True)
+        if cond is None and isinstance(body_node, Name) and body_node.id not in self.bound \
+                and src.entity and self.schema.get(src.entity) \
+                and body_node.id in self.schema.get(src.entity).members:
+            return _Value(f"_column({src.code}, {body_node.id!r})")
+        code = f"[{body} for {var} in {src.code}"
+        if cond is not None:
+            code += f" if {cond}"
+        code += "]"
+        if body_node is None:
+            return _Value(code, src.entity, True, lazy=True)
+        return _Value(code, lazy=True)
+
+    def _probe(self, src, cond_node):
+        """
+        `Entity where field = <outer value> AND ...` over a whole extent: take
+        the rows from the runtime hash index on Entity.field instead, keeping
+        the remaining conjuncts as the filter.  Returns (source, cond).
+        """
+        info = self.schema.get(src.entity)
+        if info is None or cond_node is None:
+            return src, cond_node
+        conjuncts = _conjuncts(cond_node)
+        candidates = []
+        for i, conj in enumerate(conjuncts):
+            if not (isinstance(conj, Compare) and _COMPARE_PY[conj.op] == "=="):
+                continue
+            for field_node, key_node in ((conj.left, conj.right), (conj.right, conj.left)):
+                field = self._row_field(field_node, src.entity)
+                if field in info.members and field not in info.collections \
+                        and self._is_outer(key_node, src.entity):
+                    # A key like this.id is far more selective than a literal.
+                    literal = isinstance(key_node, (Number, String, Const))
+                    candidates.append((literal, i, field, key_node))
+                    break
+        if not candidates:
+            return src, cond_node
+        _, i, field, key_node = min(candidates, key=lambda c: (c[0], c[1]))
+        key = self.visit(key_node).code
+        self.foreign_reads.add((src.entity, field))
+        cond = None
+        for c in conjuncts[:i] + conjuncts[i + 1:]:
+            cond = c if cond is None else BoolOp("and", cond, c)
+        if field in info.calculated:
+            return _Value(f"_lookup_calculated({src.entity!r}, {field!r}, {key})", src.entity, True), cond
+        self.probes.add((src.entity, field))
+        return _Value(f"_lookup({src.entity!r}, {field!r}, {key})", src.entity, True), cond
+
+    def _row_field(self, node, entity):
+        """Field name if node is a column of the row being scanned, else None."""
+        if isinstance(node, Name) and node.id not in self.bound:
+            return node.id
+        if isinstance(node, Attr) and isinstance(node.obj, Name) and node.obj.id == entity \
+                and entity not in self.bound:
+            return node.name
+        return None
+
+    def _is_outer(self, node, entity):
+        """True if node can be evaluated before entering the scan of `entity`."""
+        if isinstance(node, (Number, String, Const, This)):
+            return True
+        if isinstance(node, Name):
+            return node.id in self.bound
+        if isinstance(node, Attr):
+            obj = node.obj
+            if isinstance(obj, Name) and obj.id not in self.bound:
+                return obj.id != entity and any(el.entity == obj.id for el in self.elements)
+            return self._is_outer(obj, entity)
+        return False
+
+    def visit_Where(self, node):
+        return self._comprehension(node.source, node.cond, None)
+
+    def visit_Filter(self, node):
+        cond = node.cond
+        if isinstance(cond, Arrow):
+            return self._comprehension(node.obj, cond.left, cond.body)
+        return self._comprehension(node.obj, cond, None)
+
+    def visit_ForAll(self, node):
+        return self._comprehension(node.source, node.cond, node.body, var=node.var)
+
+    def visit_Arrow(self, node):
+        left = node.left
+        if isinstance(left, Name) and self._is_lambda_param(left.id, node.body):
+            saved = self.bound.get(left.id, _MISSING)
+            self.bound[left.id] = None
+            body = self.visit(node.body).code
+            self._restore_bound(left.id, saved)
+            return _Value(f"(lambda {left.id}: {body})")
+        if isinstance(left, Where):
+            return self._comprehension(left.source, left.cond, node.body)
+        if isinstance(left, Filter) and not isinstance(left.cond, Arrow):
+            return self._comprehension(left.obj, left.cond, node.body)
+        return self._comprehension(left, None, node.body)
+
+    def _is_lambda_param(self, name, body):
+        if name in self.bound or name in self.schema:
+            return False
+        if self.this is not None and name in self.this.members:
+            return False
+        for n in body.walk():
+            if isinstance(n, Name) and n.id == name:
+                return True
+        return False
+
+    # -- calls ---------------------------------------------------------
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, Attr):
+            obj = self.visit(func.obj).code
+            args = ", ".join(self.visit(a).code for a in node.args)
+            return _Value(f"{obj}.{func.name}({args})")
+
+        name = func.id
+        upper = name.upper()
+        kind, py_name = FUNCTION_MAP.get(name, FUNCTION_MAP.get(upper, ("call", None)))
+        if py_name is None:
+            if upper.startswith("CALCULATE_") and name == upper:
+                py_name = name.lower()
+            else:
+                py_name = name
+        values = [self.visit(a) for a in node.args]
+        args = [v.code for v in values]
+        if kind == "binop" and len(args) == 2:
+            return _Value(f"({args[0]} {py_name} {args[1]})")
+        if py_name in STREAMING_FUNCS:
+            # Single-pass reducers take a generator instead of a built list.
+            args = [f"({v.code[1:-1]})" if v.lazy else v.code for v in values]
+            if len(args) == 1 and values[0].lazy:
+                args = [args[0][1:-1]]
+        self.calls.add(py_name)
+        return _Value(f"{py_name}({', '.join(args)})")
+
+    # -- helpers -------------------------------------------------------
+
+    def _fresh(self):
+        self._depth += 1
+        return "x" if self._depth == 1 else f"x{self._depth}"
+
+    def _restore_bound(self, name, saved):
+        if saved is _MISSING:
+            self.bound.pop(name, None)
+        else:
+            self.bound[name] = saved
+
+
+_MISSING = object()
+
+
+def _conjuncts(node):
+    """Flatten an AND chain into its operands, left to right."""
+    if isinstance(node, BoolOp) and node.op == "and":
+        return _conjuncts(node.left) + _conjuncts(node.right)
+    return [node]
+
+
+def _is_null(node):
+    return isinstance(node, Const) and node.value is None
+
+
+################################################################
+# 6) Public helpers                                            #
+################################################################
+
+class CompiledFormula:
+    """The Python expression for one formula plus what it depends on."""
+    __slots__ = ("code", "calls", "reads", "foreign_reads", "extents", "probes")
+
+    def __init__(self, code, emitter):
+        self.code = code
+        self.calls = emitter.calls
+        self.reads = emitter.reads
+        self.foreign_reads = emitter.foreign_reads
+        self.extents = emitter.extents
+        self.probes = emitter.probes
+
+
+def compile_formula(formula: str, entity_name=None, schema=None):
+    """
+    Translate one formula into a CompiledFormula.
+
+    Raises FormulaSyntaxError if the formula is not in the supported grammar.
+    """
+    tree = parse_formula(formula)
+    emitter = PythonEmitter(entity_name, schema)
+    return CompiledFormula(emitter.emit(tree), emitter)
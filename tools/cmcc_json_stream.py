@@ -0,0 +1,224 @@
+# cmcc_json_stream.py
+"""
+Incremental reader for large JSON documents such as SSoT/cmcc-toe-meta-model.json.
+
+json.load builds the whole tree, including the narrative meta / Research
+sections that code generation never reads.  JSONStream instead walks the
+text in fixed-size chunks: objects and arrays are iterated one member at a
+time, and any member the caller does not read is skipped by a bracket /
+string scan without building Python objects.  Only values the caller asks
+for (read_value) are decoded, with json.loads on just their text.
+
+    with open(path, encoding="utf-8") as f:
+        for domain_id, nickname, entity in iter_ssot_entities(f):
+            ...
+
+Memory is bounded by the chunk size plus the largest value actually read
+(one entity), not by the document.
+"""
+
+import json
+import re
+
+_CHUNK_SIZE = 1 << 16
+
+_WS = re.compile(r"\s*")
+# A whole string, a bracket, or (last resort) a lone quote whose string runs
+# past the end of the buffer.
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]|"', re.S)
+_SCALAR = re.compile(r"[^\s,\]}]+")
+_DECODER = json.JSONDecoder()
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+def _number_may_continue(buf, end):
+    """True if a number decoded up to buf[end] could go on past it."""
+    return end == len(buf) or buf[end] in _NUMBER_CHARS
+
+
+class JSONStream:
+    """
+    Cursor over a JSON text read from a file object in chunks.
+
+    iter_object() / iter_array() are generators that leave the cursor on
+    each member's value; if the loop body neither reads nor iterates that
+    value it is skipped automatically.  A nested iterator must be
+    exhausted before its parent resumes.
+    """
+
+    def __init__(self, fp, chunk_size=_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.base = 0           # stream offset of buf[0]
+        self._mark = None       # start of the value being captured by read_value
+
+    # -- buffering -----------------------------------------------------
+
+    def _more(self):
+        """Read another chunk, dropping text that is no longer needed. False at EOF."""
+        data = self.fp.read(self.chunk_size)
+        if not data:
+            return False
+        keep = self.pos if self._mark is None else self._mark
+        self.buf = self.buf[keep:] + data
+        self.base += keep
+        self.pos -= keep
+        if self._mark is not None:
+            self._mark -= keep
+        return True
+
+    def _offset(self):
+        return self.base + self.pos
+
+    def _peek(self):
+        """Skip whitespace; return the next character ('' at EOF)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def _expect(self, ch):
+        if self._peek() != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self._offset()}")
+        self.pos += 1
+
+    # -- scanning ------------------------------------------------------
+
+    def skip_value(self):
+        """Move past the next value without decoding it."""
+        c = self._peek()
+        if c in ('"', "[", "{"):
+            depth = 0
+            while True:
+                m = _TOKEN.search(self.buf, self.pos)
+                if m is None or m.group() == '"':
+                    # need more text to finish the container / string
+                    self.pos = len(self.buf) if m is None else m.start()
+                    if not self._more():
+                        raise ValueError("Unexpected end of JSON input")
+                    continue
+                self.pos = m.end()
+                tok = m.group()
+                if tok in ("[", "{"):
+                    depth += 1
+                elif tok in ("]", "}"):
+                    depth -= 1
+                if depth == 0:
+                    return
+        elif c:
+            while True:
+                m = _SCALAR.match(self.buf, self.pos)
+                end = m.end() if m else self.pos
+                if end < len(self.buf) or not self._more():
+                    self.pos = end
+                    return
+        else:
+            raise ValueError("Unexpected end of JSON input")
+
+    def read_value(self):
+        """Decode the next value (and only it) into Python objects."""
+        self._peek()
+        self._mark = self.pos
+        try:
+            while True:
+                try:
+                    value, end = _DECODER.raw_decode(self.buf, self.pos)
+                except json.JSONDecodeError:
+                    value = end = None
+                # A number may continue in the next chunk ("0" of "0.1", "2" of
+                # "2e5"): it is only complete once a character that cannot
+                # extend it follows.  Anything else that decodes is complete.
+                if end is not None and not (isinstance(value, (int, float)) and _number_may_continue(self.buf, end)):
+                    self.pos = end
+                    return value
+                if not self._more():
+                    if end is None:
+                        raise ValueError(f"Invalid JSON at offset {self._offset()}")
+                    self.pos = end
+                    return value
+        finally:
+            self._mark = None
+
+    # -- containers ----------------------------------------------------
+
+    def iter_object(self):
+        """Yield each key of the next object, with the cursor on its value."""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self._expect(":")
+            self._peek()
+            start = self._offset()
+            yield key
+            if self._offset() == start:
+                self.skip_value()
+            c = self._peek()
+            self.pos += 1
+            if c == "}":
+                return
+            if c != ",":
+                raise ValueError(f"Expected ',' or '}}' at offset {self._offset() - 1}")
+
+    def iter_array(self):
+        """Yield the index of each element of the next array, with the cursor on it."""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            self._peek()
+            start = self._offset()
+            yield index
+            if self._offset() == start:
+                self.skip_value()
+            c = self._peek()
+            self.pos += 1
+            if c == "]":
+                return
+            if c != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self._offset() - 1}")
+            index += 1
+
+    def iter_values(self):
+        """Decode the elements of the next array one at a time."""
+        for _ in self.iter_array():
+            yield self.read_value()
+
+
+################################################################
+# Meta-model helpers                                           #
+################################################################
+
+def iter_ssot_entities(fp):
+    """
+    Yield (domain id, nickname, entity) for every entity of every domain in
+    the SSoT cmcc-toe-meta-model.json, in file order.  The narrative meta
+    and Research sections are skipped unread.
+    """
+    stream = JSONStream(fp)
+    for key in stream.iter_object():
+        if key != "CMCC_ToEMM_Domains":
+            continue
+        for domain_id in stream.iter_object():
+            nickname = domain_id
+            for dkey in stream.iter_object():
+                if dkey == "nickname":
+                    nickname = stream.read_value()
+                elif dkey == "schema":
+                    for skey in stream.iter_object():
+                        if skey == "entities":
+                            for entity in stream.iter_values():
+                                yield domain_id, nickname, entity
+
+
+def top_level_keys(fp):
+    """Keys of the document's top-level object, without decoding any value."""
+    return list(JSONStream(fp).iter_object())
@@ -0,0 +1,55 @@
+# cmcc_json_stream_check.py
+"""
+Self-check for cmcc_json_stream: values decode the same at every chunk
+size, including numbers split across a chunk boundary.
+
+    python tools/cmcc_json_stream_check.py
+"""
+
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cmcc_json_stream import JSONStream  # noqa: E402
+
+ARRAYS = [
+    "[0.1, 2]",
+    "[-25000000000.0]",
+    "[1e5,2E-3,-0.5e+2,7]",
+    '[true, false, null, 10, "x"]',
+]
+OBJECTS = [
+    '{"a": 12.5, "b": [3, -0.25], "c": {"d": 1e-7}}',
+]
+
+
+def check_chunk_boundaries():
+    for text in ARRAYS:
+        for chunk_size in range(1, 9):
+            got = list(JSONStream(io.StringIO(text), chunk_size).iter_values())
+            assert got == json.loads(text), (text, chunk_size, got)
+    for text in ARRAYS + OBJECTS:
+        for chunk_size in range(1, 9):
+            got = JSONStream(io.StringIO(text), chunk_size).read_value()
+            assert got == json.loads(text), (text, chunk_size, got)
+
+
+def check_skipped_members():
+    text = OBJECTS[0]
+    for chunk_size in range(1, 9):
+        stream = JSONStream(io.StringIO(text), chunk_size)
+        got = {key: stream.read_value() for key in stream.iter_object() if key != "b"}
+        assert got == {"a": 12.5, "c": {"d": 1e-7}}, (chunk_size, got)
+
+
+def main():
+    check_chunk_boundaries()
+    check_skipped_members()
+    print("cmcc_json_stream: ok")
+
+
+if __name__ == "__main__":
+    main()
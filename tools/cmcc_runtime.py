@@ -0,0 +1,230 @@
+# cmcc_runtime.py
+"""
+Load a meta-model JSON straight into a module of classes, without writing
+and importing a generated SDK file.
+
+    sdk = load_model("sports/baseball/baseball-meta-model.json")
+    team = sdk.Team(id="T1")
+    team.wins
+
+The module is what json-toemm-to-python-helper.py would generate: the same
+helper prelude (extents, hash indexes, memoized_property, CollectionWrapper)
+and one class per entity.  Each calculated field is translated once and its
+Python compiled into a code object; both are cached on disk in
+__cmcc_cache__/ next to the model, the translations by entity hash (as in
+the generator's batch cache) and the code objects by the hash of their
+source.  A warm start therefore neither parses a formula nor compiles any
+Python.
+
+A formula that does not parse or compile only breaks its own field: the
+field raises FormulaError when read, and every other field works.
+"""
+
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import sys
+import types
+
+TOOLS = os.path.dirname(os.path.abspath(__file__))
+if TOOLS not in sys.path:
+    sys.path.insert(0, TOOLS)
+
+from cmcc_formula_parser import SchemaIndex  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location("json_toemm", os.path.join(TOOLS, "json-toemm-to-python-helper.py"))
+generator = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(generator)
+
+CACHE_DIR = "__cmcc_cache__"
+
+
+class FormulaError(ValueError):
+    """Raised when a calculated field whose formula could not be compiled is read."""
+
+
+def load_model(path, domain=None, columnar=False, profile=False, cache=True, module_name=None):
+    """
+    Build the classes of the meta-model at `path` and return them as a module.
+
+    path may be any single-domain layout load_entities() understands, or,
+    with a `domain` nickname, the SSoT cmcc-toe-meta-model.json (streamed).
+    columnar / profile are the generator flags of the same names.  With
+    cache=False nothing is read from or written to __cmcc_cache__.
+    """
+    if domain is not None:
+        entities = next((e for nick, _, e in generator.ssot_domains(path, "") if nick == domain), None)
+        if entities is None:
+            raise ValueError(f"No domain {domain!r} in {path}")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and "CMCC_ToEMM_Domains" in data:
+            raise ValueError(f"{path} holds every domain; pass domain=<nickname>")
+        entities = generator.load_entities(data)
+
+    cache_path = _cache_path(path, domain)
+    stored = _read_cache(cache_path) if cache else {}
+    schema = SchemaIndex(entities)
+    translations, entries = generator.translate_entities(entities, schema, stored.get("translations"))
+    graph = generator.build_dependency_graph(translations)
+    probes = generator.collect_probes(translations)
+
+    stem = module_name or os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+    module = types.ModuleType(stem if domain is None else f"{stem}_{domain}")
+    module.__file__ = os.path.abspath(path)
+    code_cache = stored.get("code", {})
+    used = {}
+    exec(_compiled(generator.module_prelude((), columnar, profile), "<prelude>", code_cache, used),
+         module.__dict__)
+    _import_blocks(module.__dict__, translations)
+    for e in entities:
+        cls = _build_class(module, e, translations[e["name"]], graph[e["name"]],
+                           probes.get(e["name"], ()), columnar, profile, code_cache, used)
+        setattr(module, e["name"], cls)
+
+    if cache and (entries != stored.get("translations") or used != code_cache):
+        _write_cache(cache_path, {"translations": entries, "code": used})
+    return module
+
+
+################################################################
+# Classes                                                      #
+################################################################
+
+def _build_class(module, entity, translated, graph, indexed, columnar, profile, code_cache, used):
+    """The class generate_class_code() would emit for entity, built with type()."""
+    ns = module.__dict__
+    name = entity["name"]
+    dependents, extent_deps = graph
+    scalars = [f.get("name") or f["fieldName"] for f in entity.get("fields", [])
+               if f.get("type", "scalar") != "calculated"]
+    collections = [lu.get("name") for lu in entity.get("lookups", [])
+                   if lu.get("target_entity", "").lower() != "this"
+                   and lu.get("type") in ("one_to_many", "many_to_many")]
+
+    body = {
+        "__doc__": f"Plain data container for {name} entities.",
+        "__module__": module.__name__,
+        "_DEPENDENTS": {k: tuple(v) for k, v in dependents.items()},
+        "_EXTENT_DEPS": {k: tuple(v) for k, v in extent_deps.items()},
+        "__init__": _make_init(ns, scalars, collections),
+    }
+    if indexed:
+        body["_INDEXED"] = frozenset(indexed)
+    if columnar:
+        body["_SCALARS"] = frozenset(scalars)
+    for item in translated:
+        func = _field_function(ns, name, item, code_cache, used)
+        if func is None:
+            body[item["name"]] = _broken_field(name, item)
+            continue
+        if profile:
+            func = ns["profiled"](f"{name}.{item['name']}", item["formula"])(func)
+        body[item["name"]] = ns["memoized_property"](func)
+    return type(name, (ns["_Entity"],), body)
+
+
+def _make_init(ns, scalars, collections):
+    register, wrapper = ns["_register"], ns["CollectionWrapper"]
+
+    def __init__(self, **kwargs):
+        register(self)
+        for field in scalars:
+            setattr(self, field, kwargs.get(field))
+        for attr in collections:
+            setattr(self, attr, wrapper(self, attr))
+    return __init__
+
+
+def _field_function(ns, class_name, item, code_cache, used):
+    """
+    The getter for one calculated field, from its cached code object when
+    there is one.  None if the formula did not translate or compile.
+    """
+    compiled = item["compiled"]
+    if item["error"] is not None or compiled is None:
+        return None
+    source = f"def {item['name']}(self):\n    return {compiled.code}\n"
+    try:
+        module_code = _compiled(source, f"<formula {class_name}.{item['name']}>", code_cache, used)
+    except SyntaxError as exc:
+        item["error"] = f"generated code does not compile: {exc.msg}"
+        return None
+    code = next(c for c in module_code.co_consts if isinstance(c, types.CodeType))
+    func = types.FunctionType(code, ns, item["name"])
+    func.__doc__ = f"{item['description']}\nOriginal formula: {item['formula']}"
+    func.__qualname__ = f"{class_name}.{item['name']}"
+    return func
+
+
+def _compiled(source, filename, code_cache, used):
+    """compile(source), or its cached code object (keyed by the source's hash)."""
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    code = code_cache.get(key)
+    if code is None:
+        code = compile(source, filename, "exec")
+    used[key] = code
+    return code
+
+
+def _broken_field(class_name, item):
+    message = f"{class_name}.{item['name']}: {item['error'] or 'formula is empty'} (formula: {item['formula']})"
+
+    def broken(self):
+        raise FormulaError(message)
+    broken.__doc__ = f"{item['description']}\nOriginal formula: {item['formula']}"
+    return property(broken)
+
+
+def _import_blocks(ns, translations):
+    """
+    Building blocks (SHIFT, EVOLVE, ...) the formulas call.  If
+    quantum_walk_blocks cannot be imported, only those formulas fail (with
+    a NameError when read).
+    """
+    wanted = {call for items in translations.values() for t in items if t["compiled"]
+              for call in t["compiled"].calls} & generator.BUILDING_BLOCKS.keys()
+    if not wanted:
+        return
+    try:
+        import quantum_walk_blocks
+    except ImportError:
+        return
+    for name in wanted:
+        ns[name] = getattr(quantum_walk_blocks, name)
+
+
+################################################################
+# Cache                                                        #
+################################################################
+
+def _cache_path(path, domain):
+    base = os.path.basename(path) + (f".{domain}" if domain else "")
+    tag = sys.implementation.cache_tag or "python"
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR, f"{base}.{tag}.cache")
+
+
+def _read_cache(path):
+    """{'translations': ..., 'code': {hash: code object}}, or {} if missing or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache(path, data):
+    """Write atomically; a read-only model directory just means no cache."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
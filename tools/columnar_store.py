@@ -0,0 +1,302 @@
+# columnar_store.py
+"""
+Struct-of-arrays storage for generated CMCC SDKs (json-toemm-to-python-helper.py --columnar).
+
+Every entity type gets an EntityTable holding one growable NumPy column per
+scalar field.  Collections are RowSets: growable arrays of row indices into
+the child entity's table.  Projections such as SUM(this.angle_degrees) or
+SUM(teams.roster -> careerHomeRuns) then become a single fancy-index gather
+plus a vectorized reduction instead of a Python loop over objects.
+
+Row objects still exist (so formulas that need them keep working); their
+scalar attributes simply live in the columns instead of in __dict__.  A
+value always reads back exactly as written: a column is typed only while
+every value in it is a plain bool, int (within int64) or float.  An int
+column that receives a float becomes float64 and remembers which rows were
+ints (so they still read back as int), as long as every int is exact in
+float64; any other mix of kinds turns it into an object column.
+"""
+
+import numpy as np
+
+_INITIAL_CAPACITY = 16
+
+
+_INT64 = np.iinfo(np.int64)
+# Largest magnitude up to which every int is exact as a float64.
+_FLOAT_EXACT = 1 << 53
+
+
+def _kind_of(value):
+    """
+    Column kind for a Python value: 'bool', 'int' or 'float' for exactly
+    those types (ints only within int64), 'object' for anything else, so
+    that a typed column hands back the very value it was given.
+    """
+    kind = type(value)
+    if kind is bool:
+        return "bool"
+    if kind is int:
+        return "int" if _INT64.min <= value <= _INT64.max else "object"
+    if kind is float:
+        return "float"
+    return "object"
+
+
+_DTYPES = {"bool": np.bool_, "int": np.int64, "float": np.float64, "object": object}
+
+
+class Column:
+    """
+    One scalar field: a typed data array plus a validity mask (None ==
+    invalid).  A float column promoted from int also has `ints`, the rows
+    holding ints.
+    """
+    __slots__ = ("kind", "data", "valid", "ints")
+
+    def __init__(self, capacity):
+        self.kind = None
+        self.data = None
+        self.valid = np.zeros(capacity, dtype=np.bool_)
+        self.ints = None
+
+    def resize(self, capacity):
+        valid = np.zeros(capacity, dtype=np.bool_)
+        valid[:len(self.valid)] = self.valid
+        self.valid = valid
+        if self.ints is not None:
+            ints = np.zeros(capacity, dtype=np.bool_)
+            ints[:len(self.ints)] = self.ints
+            self.ints = ints
+        if self.data is not None:
+            data = np.empty(capacity, dtype=self.data.dtype)
+            data[:len(self.data)] = self.data
+            self.data = data
+
+    def set(self, row, value):
+        if value is None:
+            self.valid[row] = False
+            return
+        kind = _kind_of(value)
+        if self.kind is None:
+            self.kind = kind
+            self.data = np.empty(len(self.valid), dtype=_DTYPES[kind])
+        elif kind != self.kind and self.kind != "object":
+            if not ({kind, self.kind} == {"int", "float"} and self._promote_to_float(value)):
+                # Any other mix: keep every value as the Python object it
+                # was (int64 -> int, float64 -> float, bool_ -> bool).
+                data = self.data.astype(object)
+                if self.ints is not None:
+                    held = self.ints & self.valid
+                    data[held] = [int(v) for v in self.data[held]]
+                self.data = data
+                self.kind = "object"
+                self.ints = None
+        if self.ints is not None:
+            self.ints[row] = kind == "int"
+        self.data[row] = value
+        self.valid[row] = True
+
+    def _promote_to_float(self, value):
+        """
+        Turn an int column into float64 (or give a float column its `ints`
+        mask) if every int involved is exact as a float64.  False if not.
+        """
+        if self.kind == "int":
+            held = self.data[self.valid]
+            if held.size and max(-int(held.min()), int(held.max())) > _FLOAT_EXACT:
+                return False
+            self.ints = self.valid.copy()
+            self.data = self.data.astype(np.float64)
+            self.kind = "float"
+        elif abs(value) > _FLOAT_EXACT:
+            return False
+        elif self.ints is None:
+            self.ints = np.zeros(len(self.valid), dtype=np.bool_)
+        return True
+
+    def get(self, row):
+        if not self.valid[row]:
+            return None
+        value = self.data[row]
+        if self.kind == "object":
+            return value
+        if self.ints is not None and self.ints[row]:
+            return int(value)
+        return value.item()
+
+
+class EntityTable:
+    """All rows of one entity type: row objects plus one Column per scalar field."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = []          # row index -> entity object
+        self.columns = {}       # field name -> Column
+        self.capacity = _INITIAL_CAPACITY
+
+    def __len__(self):
+        return len(self.rows)
+
+    def append(self, obj):
+        """Add a row for obj and return its row index."""
+        row = len(self.rows)
+        if row >= self.capacity:
+            self.capacity *= 2
+            for col in self.columns.values():
+                col.resize(self.capacity)
+        self.rows.append(obj)
+        return row
+
+    def set(self, row, field, value):
+        col = self.columns.get(field)
+        if col is None:
+            col = self.columns[field] = Column(self.capacity)
+        col.set(row, value)
+
+    def get(self, row, field):
+        col = self.columns.get(field)
+        return None if col is None else col.get(row)
+
+    def gather(self, rows, field):
+        """
+        Column values for an index array.  Numeric columns come back as a
+        typed array; if any selected value is None the result is an object
+        array so reductions fail the same way the row-wise code would.
+        """
+        col = self.columns.get(field)
+        if col is None or col.data is None:
+            return np.full(len(rows), None, dtype=object)
+        values = col.data[rows]
+        valid = col.valid[rows]
+        if not valid.all():
+            values = values.astype(object)
+            values[~valid] = None
+        return values
+
+    def all_rows(self):
+        rowset = RowSet(self)
+        rowset.extend_indices(np.arange(len(self.rows), dtype=np.int64))
+        return rowset
+
+
+class RowSet:
+    """
+    A collection stored as row indices into a single EntityTable.
+    Behaves like the list CollectionWrapper used to hold (append, iterate,
+    len, index).  `mixed` is set if a row from another table (or a plain
+    object) is appended; from then on the set keeps its members in
+    `objects` and projections fall back to attribute reads.
+    """
+
+    def __init__(self, table=None):
+        self.table = table
+        self.mixed = False
+        self.objects = []       # the members, once the set is mixed (empty until then)
+        self._index = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._size = 0
+
+    def _reserve(self, needed):
+        if needed > len(self._index):
+            grown = np.empty(max(needed, 2 * len(self._index)), dtype=np.int64)
+            grown[:self._size] = self._index[:self._size]
+            self._index = grown
+
+    def append(self, obj):
+        table = obj.__dict__.get("_table") if hasattr(obj, "__dict__") else None
+        if self.table is None and self._size == 0:
+            self.table = table
+        if not self.mixed and (table is None or table is not self.table):
+            self.mixed = True
+            self.objects = list(self._rows())
+        if self.mixed:
+            self.objects.append(obj)
+        self._reserve(self._size + 1)
+        self._index[self._size] = obj.__dict__["_row"] if table is not None else -1
+        self._size += 1
+
+    def extend_indices(self, indices):
+        """Append rows of self.table by index (used by flatten / all_rows)."""
+        needed = self._size + len(indices)
+        self._reserve(needed)
+        self._index[self._size:needed] = indices
+        self._size = needed
+        if self.mixed:
+            self.objects.extend(self.table.rows[i] for i in indices.tolist())
+
+    def remove(self, obj):
+        """Remove the first occurrence of obj (ValueError if absent), as list.remove."""
+        position = next((i for i, x in enumerate(self) if x is obj), None)
+        if position is None:
+            raise ValueError("RowSet.remove(x): x not in RowSet")
+        self._index[position:self._size - 1] = self._index[position + 1:self._size]
+        self._size -= 1
+        if self.mixed:
+            del self.objects[position]
+
+    def indices(self):
+        return self._index[:self._size]
+
+    def _rows(self):
+        """The members of a set that is not mixed, from its table."""
+        if self.table is None:
+            return iter(())
+        return map(self.table.rows.__getitem__, self.indices().tolist())
+
+    def __iter__(self):
+        if self.mixed:
+            return iter(self.objects)
+        return self._rows()
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if self.mixed:
+            return self.objects[index]
+        return self.table.rows[int(self.indices()[index])]
+
+
+class ColumnStore:
+    """Entity name -> EntityTable for one generated module."""
+
+    def __init__(self):
+        self.tables = {}
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = EntityTable(name)
+        return table
+
+
+def _rowset_of(rows):
+    """Unwrap a CollectionWrapper to its RowSet (or list)."""
+    return getattr(rows, "items", rows)
+
+
+def column(rows, field):
+    """
+    Values of `field` for every row: a NumPy gather when rows is a
+    single-table RowSet holding that field as a column, otherwise a list.
+    """
+    rows = _rowset_of(rows)
+    if isinstance(rows, RowSet) and not rows.mixed and rows.table is not None \
+            and field in rows.table.columns:
+        return rows.table.gather(rows.indices(), field)
+    return [getattr(x, field) for x in rows]
+
+
+def flatten(rows, collection):
+    """Concatenate the `collection` RowSets of every row (e.g. teams.roster)."""
+    rows = _rowset_of(rows)
+    children = [_rowset_of(getattr(x, collection)) for x in rows]
+    if children and all(isinstance(c, RowSet) and not c.mixed for c in children):
+        tables = {id(c.table) for c in children if c.table is not None}
+        if len(tables) <= 1:
+            table = next((c.table for c in children if c.table is not None), None)
+            out = RowSet(table)
+            if table is not None:
+                out.extend_indices(np.concatenate([c.indices() for c in children]))
+            return out
+    return [y for c in children for y in c]
@@ -0,0 +1,104 @@
+# columnar_store_check.py
+"""
+Self-check for columnar_store: values read back exactly as written, int
+columns that take a float stay numeric, and RowSets keep every member when
+they turn mixed.
+
+    python tools/columnar_store_check.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from columnar_store import ColumnStore, RowSet, column  # noqa: E402
+
+
+class _Row:
+    """Stand-in for a generated entity: a row in `table`, scalars in its columns."""
+
+    def __init__(self, table, **fields):
+        self._table = table
+        self._row = table.append(self)
+        for name, value in fields.items():
+            table.set(self._row, name, value)
+
+    def __getattr__(self, name):
+        return self._table.get(self._row, name)
+
+
+def check_column_fidelity():
+    table = ColumnStore().table("Angle")
+    written = [60, 60.5, True, None, 2 ** 70, "obtuse", False, 7]
+    rows = [_Row(table, angle_degrees=v) for v in written]
+    for row, value in zip(rows, written):
+        got = row.angle_degrees
+        assert got == value and type(got) is type(value), (value, got)
+
+    typed = ColumnStore().table("Angle")
+    ints = [_Row(typed, angle_degrees=v) for v in (30, 60, 90)]
+    assert typed.columns["angle_degrees"].kind == "int"
+    assert all(type(r.angle_degrees) is int for r in ints)
+
+
+def check_numeric_promotion():
+    table = ColumnStore().table("Angle")
+    written = [30, None, 60.5, 90, -45, 0.25]
+    rows = [_Row(table, angle_degrees=v) for v in written]
+    col = table.columns["angle_degrees"]
+    assert col.kind == "float" and col.data.dtype.name == "float64", (col.kind, col.data.dtype)
+    for row, value in zip(rows, written):
+        got = row.angle_degrees
+        assert got == value and type(got) is type(value), (value, got)
+    table.set(1, "angle_degrees", 45)
+    assert column(table.all_rows(), "angle_degrees").dtype.name == "float64"
+
+    starts_float = ColumnStore().table("Angle")
+    later = [_Row(starts_float, angle_degrees=v) for v in (1.5, 2, 3.5)]
+    assert starts_float.columns["angle_degrees"].kind == "float"
+    assert [type(r.angle_degrees) for r in later] == [float, int, float]
+
+    for written in ([2 ** 60, 0.5], [0.5, 2 ** 60], [1, True], [1.0, False], [3, 2.5, "x"]):
+        mixed = ColumnStore().table("Angle")
+        rows = [_Row(mixed, angle_degrees=v) for v in written]
+        assert mixed.columns["angle_degrees"].kind == "object", written
+        for row, value in zip(rows, written):
+            got = row.angle_degrees
+            assert got == value and type(got) is type(value), (value, got)
+
+
+def check_rowset_mix():
+    store = ColumnStore()
+    players, teams = store.table("Player"), store.table("Team")
+    members = [_Row(players, hr=n) for n in range(3)]
+    rows = players.all_rows()
+    assert rows.objects == [], "a single-table RowSet must not keep an object list"
+    assert list(column(rows, "hr")) == [0, 1, 2]
+
+    team = _Row(teams, hr=9)
+    rows.append(team)
+    assert rows.mixed and len(rows) == 4
+    assert list(rows) == members + [team], "rows added by index were lost when the set turned mixed"
+    assert rows[0] is members[0] and rows[3] is team
+    assert column(rows, "hr") == [0, 1, 2, 9]
+
+    rows.remove(members[1])
+    assert list(rows) == [members[0], members[2], team] and len(rows) == 3
+
+    plain = RowSet(players)
+    plain.append(members[2])
+    plain.append(members[0])
+    plain.remove(members[2])
+    assert list(plain) == [members[0]] and plain.objects == []
+
+
+def main():
+    check_column_fidelity()
+    check_numeric_promotion()
+    check_rowset_mix()
+    print("columnar_store: ok")
+
+
+if __name__ == "__main__":
+    main()
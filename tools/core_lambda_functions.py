@@ -1,4 +1,27 @@
 # core_lambda_functions.py
+#
+# Collections may be plain lists, generators or NumPy arrays (e.g. the column
+# gathers produced by columnar_store).  Every reducer makes a single pass over
+# an iterable without building a list; arrays are reduced with their own
+# vectorized methods instead of a Python-level loop.
+
+import heapq
+from collections import Counter
+
+_EMPTY = object()
+
+
+def _is_array(collection):
+    return hasattr(collection, "dtype") and hasattr(collection, "ndim")
+
+
+def _scalar(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def _numeric(array):
+    return array.dtype.kind in "biuf"
+
 
 def COUNT(collection):
     """Returns the number of items in 'collection'."""
@@ -7,18 +30,119 @@ def COUNT(collection):
 
 def MAX(collection_of_numbers):
     """Returns the maximum numeric value in the collection."""
-    if not collection_of_numbers:
+    if _is_array(collection_of_numbers):
+        if len(collection_of_numbers) == 0:
+            raise ValueError("MAX function received an empty collection.")
+        return _scalar(collection_of_numbers.max())
+    result = max(collection_of_numbers, default=_EMPTY)
+    if result is _EMPTY:
         raise ValueError("MAX function received an empty collection.")
-    return max(collection_of_numbers)
+    return result
+
+
+def MIN(collection_of_numbers):
+    """Returns the minimum numeric value in the collection."""
+    if _is_array(collection_of_numbers):
+        if len(collection_of_numbers) == 0:
+            raise ValueError("MIN function received an empty collection.")
+        return _scalar(collection_of_numbers.min())
+    result = min(collection_of_numbers, default=_EMPTY)
+    if result is _EMPTY:
+        raise ValueError("MIN function received an empty collection.")
+    return result
 
 
 def SUM(collection_of_numbers):
     """Returns the sum of numeric values in the collection."""
+    if _is_array(collection_of_numbers):
+        return _scalar(collection_of_numbers.sum())
     return sum(collection_of_numbers)
 
 
+def AVG(collection_of_numbers):
+    """Returns the arithmetic mean of the collection (running sum and count, one pass)."""
+    if _is_array(collection_of_numbers):
+        if len(collection_of_numbers) == 0:
+            raise ValueError("AVG function received an empty collection.")
+        return _scalar(collection_of_numbers.mean())
+    total, count = 0, 0
+    for value in collection_of_numbers:
+        total += value
+        count += 1
+    if count == 0:
+        raise ValueError("AVG function received an empty collection.")
+    return total / count
+
+
+def EXISTS(collection):
+    """Returns True if the collection has at least one item; stops at the first."""
+    if _is_array(collection):
+        return len(collection) > 0
+    for _ in collection:
+        return True
+    return False
+
+
+def MINBY(collection, key=None):
+    """Returns the item whose key(item) is smallest (the first one on ties)."""
+    if key is None and _is_array(collection):
+        if len(collection) == 0:
+            raise ValueError("MINBY function received an empty collection.")
+        return _scalar(collection[collection.argmin()])
+    result = min(collection, key=key, default=_EMPTY)
+    if result is _EMPTY:
+        raise ValueError("MINBY function received an empty collection.")
+    return result
+
+
+def MAXBY(collection, key=None):
+    """Returns the item whose key(item) is largest (the first one on ties)."""
+    if key is None and _is_array(collection):
+        if len(collection) == 0:
+            raise ValueError("MAXBY function received an empty collection.")
+        return _scalar(collection[collection.argmax()])
+    result = max(collection, key=key, default=_EMPTY)
+    if result is _EMPTY:
+        raise ValueError("MAXBY function received an empty collection.")
+    return result
+
+
+def MODE(collection):
+    """Returns the most frequent value (the first one seen on ties), or None if empty."""
+    if _is_array(collection) and _numeric(collection):
+        if len(collection) == 0:
+            return None
+        import numpy as np
+        values, first, counts = np.unique(collection, return_index=True, return_counts=True)
+        tied = counts == counts.max()
+        return _scalar(values[tied][first[tied].argmin()])
+    counts = Counter(collection)
+    if not counts:
+        return None
+    return counts.most_common(1)[0][0]
+
+
+def TOPN(n, collection, key=None):
+    """
+    Returns the n items with the largest key(item), largest first.
+    Keeps a heap of at most n items, so memory is O(n) for any input size.
+    """
+    if key is None and _is_array(collection) and _numeric(collection):
+        if n <= 0 or len(collection) == 0:
+            return []
+        if n < len(collection):
+            top = collection[collection.argpartition(-n)[-n:]]
+        else:
+            top = collection.copy()
+        top.sort()
+        return top[::-1].tolist()
+    return heapq.nlargest(n, collection, key=key)
+
+
 def CONTAINS(collection_of_values, target_value):
     """Returns True if 'target_value' appears in 'collection_of_values', otherwise False."""
+    if _is_array(collection_of_values):
+        return bool((collection_of_values == target_value).any())
     return target_value in collection_of_values
 
 
@@ -2,10 +2,19 @@
 
 import json
 import argparse
+import hashlib
+import itertools
 import math
 import re
 import textwrap
+import time
 import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from types import SimpleNamespace
+
+import cmcc_formula_parser
+from cmcc_json_stream import iter_ssot_entities, top_level_keys
+from cmcc_formula_parser import FormulaSyntaxError, SchemaIndex, compile_formula
 
 ################################################################
 # 0) We'll define the aggregator building-blocks we recognize. #
@@ -27,310 +36,314 @@ SUPPORTED_AGG_FUNCS = {
     "COUNT": "COUNT",
     "SUM": "SUM",
     "MAX": "MAX",
+    "MIN": "MIN",
     "IF": "IF",
-    # You can add more here as needed (AVG, MINBY, etc.).
+    "AVG": "AVG",
+    "EXISTS": "EXISTS",
+    "MINBY": "MINBY",
+    "MAXBY": "MAXBY",
+    "MODE": "MODE",
+    "TOPN": "TOPN",
 }
 
 ################################################################
 #                 AGGREGATOR-TO-PYTHON REWRITING               #
 ################################################################
 
-def aggregator_to_python(expr: str) -> str:
-    """
-    Transform aggregator expressions into Python code that references
-    real aggregator calls from 'core_lambda_functions' where possible,
-    including rewriting one-level-dot references like self.foo.bar
-    into [x.bar for x in self.foo].
+def transform_formula(formula_str, entity_name, schema):
     """
-    s = basic_cleanup(expr)
-    s = aggregator_calls(s)           # e.g. MAX(...) => MAX(...)
-    s = aggregator_subfield_rewrite(s)# rewrite self.foo.bar => [x.bar for x in self.foo]
-    s = if_then_else_transform(s)
-    s = domain_specific_fixes(s)
-    s = remove_for_x_in_1(s)
-    s = known_function_map(s)
-    return s.strip()
-
-
-def basic_cleanup(expr: str) -> str:
-    """Replace common aggregator keywords with Python equivalents (AND->and, etc.)."""
-    s = expr
-    replacements = [
-        (r"\bAND\b", " and "),
-        (r"\bOR\b", " or "),
-        (r"\bNOT\b", " not "),
-        (r"\bNULL\b", "None"),
-        (r"\btrue\b", "True"),
-        (r"\bfalse\b", "False"),
-        (r"\bnull\b", "None"),
-        (r"\bthis\.", "self."),  # 'this.' => 'self.'
-        (r"\bthis\b", "self"),   # standalone 'this' => 'self'
-    ]
-    for pat, rep in replacements:
-        s = re.sub(pat, rep, s, flags=re.IGNORECASE)
-
-    # Convert single '=' to '==' if not part of '>=', '<=', '==', '!='
-    s = re.sub(r"(?<![=!<>])=+(?![=>\]])", "==", s)
+    Convert a formula string into a CompiledFormula, or None if empty.
 
-    # e.g. "IN [.." => " in [.."
-    s = re.sub(r"\sIN\s*\[", " in [", s, flags=re.IGNORECASE)
-
-    return s
+    Each formula is tokenized and parsed once by cmcc_formula_parser; the
+    AST is then emitted as Python with names resolved against `schema`.
+    Returns (compiled, error); on a parse error compiled is None.
+    """
+    if not formula_str:
+        return None, None
+    try:
+        return compile_formula(formula_str, entity_name, schema), None
+    except FormulaSyntaxError as exc:
+        return None, exc
 
 
-def aggregator_calls(expr: str) -> str:
+def translate_entity(entity, schema):
     """
-    Transform recognized aggregator calls:
-      COUNT(...) => COUNT(...)
-      SUM(...)   => SUM(...)
-      MAX(...)   => MAX(...)
-      AVG(...)   => ...
-    etc.
+    Compile every calculated member of one entity, in output order.
+    Returns a list of dicts with name/description/formula/compiled/error,
+    plus 'derived' for target_entity='this' lookups.
     """
-    s = expr
-    # COUNT(...) => COUNT(...)
-    s = re.sub(r"\bCOUNT\s*\(\s*(.*?)\s*\)", r"COUNT(\1)", s, flags=re.IGNORECASE)
-    # SUM(...) => SUM(...)
-    s = re.sub(r"\bSUM\s*\(\s*(.*?)\s*\)", r"SUM(\1)", s, flags=re.IGNORECASE)
-    # MAX(...) => MAX(...)
-    # Careful to avoid messing up "MAXBY(...)" (handled below), so we anchor carefully:
-    s = re.sub(r"\bMAX\s*\(\s*(.*?)\)", r"MAX(\1)", s, flags=re.IGNORECASE)
-
-    # AVERAGE(...) or AVG(...) => produce "AVG(...)"
-    s = re.sub(r"\bAVERAGE\s*\(\s*(.*?)\)", r"AVG(\1)", s, flags=re.IGNORECASE)
-    s = re.sub(r"\bAVG\s*\(\s*(.*?)\)", r"AVG(\1)", s, flags=re.IGNORECASE)
-
-    # Placeholders for advanced aggregator calls not in core_lambda_functions
-    s = re.sub(r"\bMINBY\s*\(\s*(.*?)\)", r"MINBY(\1)", s, flags=re.IGNORECASE)
-    s = re.sub(r"\bMAXBY\s*\(\s*(.*?)\)", r"MAXBY(\1)", s, flags=re.IGNORECASE)
-    s = re.sub(r"\bMODE\s*\(\s*(.*?)\)", r"MODE(\1)", s, flags=re.IGNORECASE)
-    s = re.sub(r"\bTOPN\s*\(\s*(.*?)\)", r"TOPN(\1)", s, flags=re.IGNORECASE)
+    class_name = entity["name"]
+    members = []
+    for f in entity.get("fields", []):
+        if f.get("type") == "calculated":
+            members.append((f.get("name") or f["fieldName"], f.get("description",""), f.get("formula","")))
+    for agg in entity.get("aggregations", []):
+        members.append((agg["name"], agg.get("description",""), agg.get("formula","")))
+
+    translated = []
+    for name, desc, formula in members:
+        compiled, error = transform_formula(formula, class_name, schema)
+        translated.append({"name": name, "description": desc, "formula": formula,
+                           "compiled": compiled, "error": error, "derived": False})
+
+    # "target_entity": "this" lookups, e.g. join_condition = "this.angles.angle_degrees"
+    for lu in entity.get("lookups", []):
+        join_cond = lu.get("join_condition", "")
+        parts = join_cond.split(".")
+        if lu.get("target_entity", "").lower() == "this" and len(parts) == 3 and parts[0].lower() == "this":
+            compiled, error = transform_formula(join_cond, class_name, schema)
+            translated.append({"name": lu.get("name"), "description": lu.get("description", ""),
+                               "formula": join_cond, "compiled": compiled, "error": error, "derived": True})
+    return translated
 
-    # EXISTS(...) => EXISTS(...)
-    s = re.sub(r"\bEXISTS\s*\(\s*(.*?)\s*\)", r"EXISTS(\1)", s, flags=re.IGNORECASE)
 
-    # POWER(a,2) => (a**2)
-    s = re.sub(r"\bPOWER\s*\(\s*(.*?),\s*2\s*\)", r"(\1**2)", s, flags=re.IGNORECASE)
+def translate_entities(entities, schema, cache=None):
+    """
+    translate_entity() for every entity, reusing cached translations.
 
-    # ABS(...) => abs(...)
-    s = re.sub(r"\bABS\s*\(\s*(.*?)\s*\)", r"abs(\1)", s, flags=re.IGNORECASE)
+    `cache` maps entity key -> serialized translations from an earlier run.
+    The key hashes the entity's JSON, the schema shape every formula
+    resolves names against, and the generator sources, so an edit to one
+    entity's formulas only re-parses that entity.  Returns
+    ({entity: translations}, {key: serialized}) for the entities given.
+    """
+    prefix = generator_fingerprint() + json.dumps(schema_fingerprint(schema))
+    translations, entries = {}, {}
+    for e in entities:
+        key = _sha256(prefix + json.dumps(e, sort_keys=True))
+        hit = (cache or {}).get(key)
+        if hit is not None:
+            translations[e["name"]] = [_load_translation(t) for t in hit]
+            entries[key] = hit
+        else:
+            translations[e["name"]] = translate_entity(e, schema)
+            entries[key] = [_dump_translation(t) for t in translations[e["name"]]]
+    return translations, entries
 
-    return s
 
+def schema_fingerprint(schema):
+    """The parts of a SchemaIndex that change how names in a formula resolve."""
+    return [[name, sorted(info.members), sorted(info.calculated),
+             sorted(info.collections.items()), sorted(info.references.items())]
+            for name, info in sorted(schema.entities.items())]
 
-def aggregator_subfield_rewrite(expr: str) -> str:
-    """
-    Scans for aggregator calls like:
-        COUNT(self.xyz.whatever)  => COUNT([x.whatever for x in self.xyz])
-    Only if there's exactly one dot after 'self':
-        self.foo           => no rewrite
-        self.foo.bar       => rewrite to [x.bar for x in self.foo]
-        self.foo.bar.baz   => produce # ERROR multiple-dot references...
-    """
-    pattern = re.compile(
-        r"(COUNT|SUM|MAX|AVG|MINBY|MAXBY|MODE|TOPN|EXISTS)\(\s*(self\.[a-zA-Z_]\w*(?:\.[a-zA-Z_]\w*)?)\s*\)",
-        re.IGNORECASE
-    )
 
-    def subfield_replacer(m):
-        agg_func = m.group(1).upper()   # e.g. "MAX"
-        param_expr = m.group(2)         # e.g. "self.angles.angle_degrees"
-
-        parts = param_expr.split(".")    # e.g. ["self","angles","angle_degrees"]
-        if len(parts) == 2:
-            # aggregator(self.something)
-            return f"{agg_func}({param_expr})"
-        elif len(parts) == 3:
-            # aggregator(self.something.somethingElse)
-            coll_name = parts[1]
-            field_name = parts[2]
-            return f"{agg_func}([x.{field_name} for x in self.{coll_name}])"
-        else:
-            # More than one dot after 'self' => produce an error comment or skip rewriting
-            return f"# ERROR multiple-dot references not supported: {m.group(0)}"
+_GENERATOR_FINGERPRINT = None
 
-    return pattern.sub(subfield_replacer, expr)
 
+def generator_fingerprint():
+    """Hash of this script and the formula compiler: any change invalidates every cache entry."""
+    global _GENERATOR_FINGERPRINT
+    if _GENERATOR_FINGERPRINT is None:
+        h = hashlib.sha256()
+        for path in (__file__, cmcc_formula_parser.__file__):
+            with open(path, "rb") as f:
+                h.update(f.read())
+        _GENERATOR_FINGERPRINT = h.hexdigest()
+    return _GENERATOR_FINGERPRINT
 
-def if_then_else_transform(expr: str) -> str:
-    """
-    Replace "IF (cond) THEN (val) ELSE (val)" => "IF(cond, val, val)"
-    We'll do repeated passes for nested usage.
-    """
-    s = expr
-    pattern = re.compile(r"\bIF\s*\((.*?)\)\s*THEN\s*\((.*?)\)\s*ELSE\s*\((.*?)\)",
-                         re.IGNORECASE | re.DOTALL)
-    while True:
-        m = pattern.search(s)
-        if not m:
-            break
-        cond = m.group(1).strip()
-        val_then = m.group(2).strip()
-        val_else = m.group(3).strip()
-        new_expr = f"IF({cond}, {val_then}, {val_else})"
-        s = s[:m.start()] + new_expr + s[m.end():]
-    return s
-
-
-def domain_specific_fixes(expr: str) -> str:
-    """
-    Additional replacements for domain-specific placeholders, e.g.
-    CALCULATE_FOO(...) => calculate_foo(...), TEAM_PAYROLL(...) => team_payroll(...), etc.
-    """
-    s = expr
 
-    # "CALCULATE_WOBA(" => "calculate_woba("
-    s = re.sub(r"\bCALCULATE_([A-Z0-9_]+)\s*\(", lambda m: f"calculate_{m.group(1).lower()}(", s)
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-    # "WIN_PCT_BY_STADIUM_FUNCTION(" => "win_pct_by_stadium_function("
-    s = re.sub(r"\bWIN_PCT_BY_STADIUM_FUNCTION\s*\(", "win_pct_by_stadium_function(", s)
 
-    domain_map = {
-        "TEAM_PAYROLL": "team_payroll",
-        "LUXURY_TAX_THRESHOLD": "LUXURY_TAX_THRESHOLD",
-        "allDesignatedHittersUsedUp": "all_designated_hitters_used_up",
-        "CHECK_NO_OVERLAP_IN_ROOM_WITHOUT_BUFFER": "check_no_overlap_in_room_without_buffer",
+def _dump_translation(t):
+    c = t["compiled"]
+    return {
+        "name": t["name"], "description": t["description"], "formula": t["formula"],
+        "derived": t["derived"], "error": None if t["error"] is None else str(t["error"]),
+        "compiled": None if c is None else {
+            "code": c.code, "calls": sorted(c.calls), "reads": sorted(c.reads),
+            "foreign_reads": sorted(c.foreign_reads), "extents": sorted(c.extents),
+            "probes": sorted(c.probes),
+        },
     }
-    for k,v in domain_map.items():
-        s = re.sub(rf"\b{k}\s*\(", f"{v}(", s)
 
-    return s
+
+def _load_translation(d):
+    c = d["compiled"]
+    compiled = None if c is None else SimpleNamespace(
+        code=c["code"], calls=set(c["calls"]), reads=set(c["reads"]),
+        foreign_reads={tuple(r) for r in c["foreign_reads"]}, extents=set(c["extents"]),
+        probes={tuple(p) for p in c["probes"]})
+    return dict(d, compiled=compiled)
 
 
-def remove_for_x_in_1(expr: str) -> str:
+def build_dependency_graph(translations):
     """
-    If aggregator rewriting introduced weird artifacts like:
-        "for x in 1 for x in self.foo" => minimal cleanup.
+    From {entity: translate_entity(...)} build, per entity:
+      dependents[input]  -> every calculated member that (transitively) reads input
+      extent_deps[member] -> every entity extent the member (transitively) scans
+    Inputs are scalar fields, collections and other calculated members.
+    Extent deps follow calculated members of related entities too, so a
+    League total over Team.wins is re-stamped when a Game is added.
     """
-    s = expr
-    s = re.sub(r"\sfor\s+\w+\s+in\s+1\s+for\s+\w+\s+in\s+", " for x in ", s)
-    s = s.replace("x.x for x in", "x for x in")
-    return s
+    calc = {ent: {t["name"]: t["compiled"] for t in items} for ent, items in translations.items()}
+
+    extents = {}
+    for ent, members in calc.items():
+        for name, compiled in members.items():
+            extents[(ent, name)] = set(compiled.extents) if compiled else set()
+    changed = True
+    while changed:
+        changed = False
+        for ent, members in calc.items():
+            for name, compiled in members.items():
+                if compiled is None:
+                    continue
+                mine = extents[(ent, name)]
+                before = len(mine)
+                for read in compiled.reads:
+                    mine |= extents.get((ent, read), set())
+                for foreign in compiled.foreign_reads:
+                    mine |= extents.get(foreign, set())
+                if len(mine) != before:
+                    changed = True
+
+    graph = {}
+    for ent, members in calc.items():
+        readers = {}
+        for name, compiled in members.items():
+            for read in (compiled.reads if compiled else ()):
+                readers.setdefault(read, set()).add(name)
+        dependents = {}
+        for start in readers:
+            seen = set()
+            stack = [start]
+            while stack:
+                for reader in readers.get(stack.pop(), ()):
+                    if reader not in seen:
+                        seen.add(reader)
+                        stack.append(reader)
+            dependents[start] = sorted(seen)
+        extent_deps = {name: sorted(extents[(ent, name)]) for name in members if extents[(ent, name)]}
+        graph[ent] = (dependents, extent_deps)
+    return graph
+
+
+def property_lines(item, used_blocks_set, class_name, profile=False):
+    """Emit one calculated, memoized property (with a parser-error fallback)."""
+    name, desc, formula = item["name"], item["description"], item["formula"]
+    lines = ["", "    @memoized_property"]
+    if profile:
+        lines.append(profiled_line(class_name, item))
+    lines += [
+        f"    def {name}(self):",
+        f"        \"\"\"{desc}\n        Original formula: {formula}\n        \"\"\"",
+    ]
+    return lines + body_lines(item, used_blocks_set)
 
 
-def known_function_map(expr: str) -> str:
-    """Optional final pass for leftover references."""
-    s = expr
-    return s
+def body_lines(item, used_blocks_set):
+    """The `return` of a calculated property, or `return None` if its formula did not translate."""
+    if item["error"] is not None:
+        return [f"        # Parser error for formula: {item['error']}", "        return None"]
+    if item["compiled"] is None:
+        return ["        return None"]
+    used_blocks_set.update(item["compiled"].calls.intersection(BUILDING_BLOCKS.keys()))
+    return [f"        return {item['compiled'].code}"]
 
 
-def parse_formula(expr, used_blocks_set):
-    """
-    Runs aggregator_to_python, also checks if SHIFT/EVOLVE references appear => add to used_blocks.
-    """
-    expr_py = aggregator_to_python(expr)
-    if "SHIFT(" in expr_py:
-        used_blocks_set.add("SHIFT")
-    if "EVOLVE(" in expr_py:
-        used_blocks_set.add("EVOLVE")
-    return expr_py
+def profiled_line(class_name, item):
+    """--profile: time each evaluation under "Entity.field", labelled with its formula."""
+    return f"    @profiled({class_name + '.' + item['name']!r}, {item['formula']!r})"
 
 
-def transform_formula(formula_str, used_blocks_set):
-    """Convert a formula string into Python code or 'None' if empty."""
-    if not formula_str:
-        return "None"
-    return parse_formula(formula_str, used_blocks_set)
+def dict_literal_lines(attr_name, mapping):
+    """Render `attr_name = {key: (values...)}` as class-body lines."""
+    if not mapping:
+        return [f"    {attr_name} = {{}}"]
+    lines = [f"    {attr_name} = {{"]
+    for key in sorted(mapping):
+        values = ", ".join(repr(v) for v in mapping[key])
+        if len(mapping[key]) == 1:
+            values += ","
+        lines.append(f"        {key!r}: ({values}),")
+    lines.append("    }")
+    return lines
 
 
 ################################################################
 #   Code generator for the classes (like generate_class_code)   #
 ################################################################
 
-def generate_class_code(entity, used_blocks_set):
+def collect_probes(translations):
+    """entity -> sorted fields that some formula looks up via _lookup(entity, field, key)."""
+    probes = {}
+    for items in translations.values():
+        for t in items:
+            for entity, field in (t["compiled"].probes if t["compiled"] else ()):
+                probes.setdefault(entity, set()).add(field)
+    return {entity: sorted(fields) for entity, fields in probes.items()}
+
+
+def generate_class_code(entity, translated, graph, used_blocks_set, columnar=False, indexed=(),
+                        profile=False):
     class_name = entity["name"]
     fields = entity.get("fields", [])
     lookups = entity.get("lookups", [])
-    aggregations = entity.get("aggregations", [])
+    dependents, extent_deps = graph
 
     code_lines = []
-    code_lines.append(f"class {class_name}:")
+    code_lines.append(f"class {class_name}(_Entity):")
     code_lines.append(f'    """Plain data container for {class_name} entities."""')
+    code_lines.append("    # input name -> calculated fields to drop from the memo when it changes")
+    code_lines.extend(dict_literal_lines("_DEPENDENTS", dependents))
+    code_lines.append("    # calculated field -> entity extents whose versions stamp its memo entry")
+    code_lines.extend(dict_literal_lines("_EXTENT_DEPS", extent_deps))
+    if indexed:
+        code_lines.append("    # fields with a hash index, for 'Entity where field = ...' lookups")
+        code_lines.append(f"    _INDEXED = frozenset({list(indexed)!r})")
+    if columnar:
+        scalars = sorted(f.get("name") or f["fieldName"] for f in fields if f.get("type", "scalar") != "calculated")
+        code_lines.append("    # input fields stored in this entity's ColumnStore table")
+        code_lines.append(f"    _SCALARS = frozenset({scalars!r})")
+    code_lines.append("")
     code_lines.append("    def __init__(self, **kwargs):")
+    code_lines.append("        _register(self)")
 
-    has_non_calc = False
     for f in fields:
         ftype = f.get("type", "scalar")
         if ftype != "calculated":
-            fname = f["name"]
+            fname = f.get("name") or f["fieldName"]
             code_lines.append(f"        self.{fname} = kwargs.get('{fname}')")
-            has_non_calc = True
-
-    if not has_non_calc:
-        code_lines.append("        pass")
 
     code_lines.append("")
     code_lines.append("        # If any 'one_to_many' or 'many_to_many' lookups exist, store them as collection wrappers.")
 
-    # We might collect property methods for "target_entity": "this" in a list,
-    # then append them at the bottom of the class.
-    derived_properties = []
-
+    derived_names = {t["name"] for t in translated if t["derived"]}
     for lu in lookups:
         lu_type = lu.get("type")
         lu_name = lu.get("name")
         lu_target = lu.get("target_entity", "")
         join_cond = lu.get("join_condition", "")
-        lu_desc = lu.get("description", "")
 
         # If target_entity is NOT "this", do normal one_to_many
         if lu_target.lower() != "this":
             if lu_type in ("one_to_many", "many_to_many"):
                 code_lines.append(f"        self.{lu_name} = CollectionWrapper(self, '{lu_name}')")
-        else:
-            # "target_entity": "this" => interpret as "derived property"
-            # e.g. join_condition = "this.angles.angle_degrees"
-            parts = join_cond.split(".")  # e.g. ["this", "angles", "angle_degrees"]
-            if len(parts) == 3 and parts[0].lower() == "this":
-                collection_name = parts[1]
-                field_name = parts[2]
-                # Generate a Python property that returns `[x.field_name for x in self.collection_name]`
-                # We'll store in derived_properties and add them later
-                prop_def = textwrap.dedent(f"""
-                @property
-                def {lu_name}(self):
-                    \"\"\"{lu_desc}\"\"\"
-                    return [x.{field_name} for x in self.{collection_name}]
-                """).strip("\n")
-                derived_properties.append(prop_def)
-            else:
-                # If the join_condition doesn't match "this.foo.bar" pattern, skip or handle differently
-                # We'll just put a comment for now:
-                code_lines.append(f"        # Skipping unusual 'target_entity=this' lookup: {lu_name}, {join_cond}")
+        elif lu_name not in derived_names:
+            # If the join_condition doesn't match "this.foo.bar" pattern, skip or handle differently
+            # We'll just put a comment for now:
+            code_lines.append(f"        # Skipping unusual 'target_entity=this' lookup: {lu_name}, {join_cond}")
 
-    # aggregator fields from 'fields' if type=calculated
-    for f in fields:
-        if f.get("type") == "calculated":
-            formula = f.get("formula","")
-            desc = f.get("description","")
-            pyexpr = transform_formula(formula, used_blocks_set)
-            prop_name = f["name"]
-            code_lines.append("")
-            code_lines.append("    @property")
-            code_lines.append(f"    def {prop_name}(self):")
-            code_lines.append(f"        \"\"\"{desc}\n        Original formula: {formula}\n        \"\"\"")
-            code_lines.append(f"        return {pyexpr}")
-
-    # aggregator fields from "aggregations"
-    for agg in aggregations:
-        formula = agg.get("formula","")
-        desc = agg.get("description","")
-        name = agg["name"]
-        pyexpr = transform_formula(formula, used_blocks_set)
-
-        code_lines.append("")
-        code_lines.append("    @property")
-        code_lines.append(f"    def {name}(self):")
-        code_lines.append(f"        \"\"\"{desc}\n        Original formula: {formula}\n        \"\"\"")
-        code_lines.append(f"        return {pyexpr}")
+    # aggregator fields from 'fields' if type=calculated, then from "aggregations"
+    for item in translated:
+        if not item["derived"]:
+            code_lines.extend(property_lines(item, used_blocks_set, class_name, profile))
 
     # Finally, append any derived properties for "target_entity": "this"
-    if derived_properties:
+    derived = [t for t in translated if t["derived"]]
+    if derived:
         code_lines.append("")
         code_lines.append("    # Derived properties for 'target_entity': 'this'")
-        for dp in derived_properties:
-            for line in dp.splitlines():
-                code_lines.append("    " + line)
+        for item in derived:
+            code_lines.append("    @memoized_property")
+            if profile:
+                code_lines.append(profiled_line(class_name, item))
+            code_lines.append(f"    def {item['name']}(self):")
+            code_lines.append(f"        \"\"\"{item['description']}\"\"\"")
+            code_lines.extend(body_lines(item, used_blocks_set))
 
     return "\n".join(code_lines)
 
@@ -339,49 +352,309 @@ def generate_class_code(entity, used_blocks_set):
 # 2) Main CLI that reads the JSON and writes a .py file         #
 ################################################################
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Generate Python classes from a JSON-based meta-model, referencing aggregator calls in core_lambda_functions."
-    )
-    parser.add_argument("-i", "--input", required=True, help="Path to input JSON file.")
-    parser.add_argument("-o", "--output", required=True, help="Path to output .py file.")
-    parser.add_argument("--include-sample-main", action="store_true",
-        help="If set, also inject a sample_main() function demonstration.")
-    args = parser.parse_args()
+def load_entities(data):
+    """
+    Find the entity list in any of the single-domain layouts used in this repo:
+      {"meta-model": {"schema": {"entities": [...]}}}   (domain meta-models)
+      {"schema": {"entities": [...]}}                   (baseball)
+      [...]                                             (bare entity list)
+    """
+    if isinstance(data, list):
+        return data
+    meta_model = data.get("meta-model")
+    if isinstance(meta_model, dict) and "schema" in meta_model:
+        return meta_model["schema"]["entities"]
+    return data["schema"]["entities"]
 
-    with open(args.input,"r",encoding="utf-8") as f:
-        data = json.load(f)
-        entities = data["meta-model"]["schema"]["entities"]
 
-    used_blocks = set()
-    class_codes = []
-    for e in entities:
-        code = generate_class_code(e, used_blocks)
-        class_codes.append(code)
+def tools_path(module_path):
+    """
+    Path components from module_path's directory to this tools/ directory,
+    for a generated module to import core_lambda_functions (and
+    columnar_store, cmcc_profile) from here instead of a copy of its own.
+    """
+    module_dir = os.path.dirname(os.path.abspath(module_path))
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        return tuple(os.path.relpath(here, module_dir).split(os.sep))
+    except ValueError:      # another drive: only an absolute path reaches it
+        return (here,)
 
-    # Build final output
-    output_lines = []
-    output_lines.append('"""')
-    output_lines.append("Auto-generated Python code from your domain model.")
-    output_lines.append("Now with aggregator rewriting that references core_lambda_functions.")
-    output_lines.append('"""')
-    output_lines.append("import math")
-    output_lines.append("import numpy as np")
+
+def module_prelude(ext_imports=(), columnar=False, profile=False, tools=None):
+    """
+    Source of everything a generated module defines before its classes:
+    imports, the extent / index / memo helpers, _Entity and
+    CollectionWrapper.  cmcc_runtime execs the same text.
+    With tools (see tools_path()), the module first puts the tools/
+    directory on sys.path, the way cmcc_runtime does for itself.
+    """
+    lines = []
+    lines.append("import math")
+    lines.append("import numpy as np")
+    if tools is not None:
+        parts = ", ".join(json.dumps(part) for part in tools)
+        lines.append("import os")
+        lines.append("import sys")
+        lines.append("")
+        lines.append(f"_TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), {parts})")
+        lines.append("if _TOOLS not in sys.path:")
+        lines.append("    sys.path.insert(0, _TOOLS)")
+        lines.append("")
 
     # We assume you have 'core_lambda_functions.py' with COUNT, SUM, MAX, etc.:
-    output_lines.append("from core_lambda_functions import COUNT, SUM, MAX, IF, CONTAINS, EQUAL")
+    lines.append("from core_lambda_functions import COUNT, SUM, MAX, MIN, AVG, IF, CONTAINS, EQUAL, "
+                        "EXISTS, MINBY, MAXBY, MODE, TOPN")
 
     # If SHIFT/EVOLVE were found, import them:
-    ext_imports = sorted(used_blocks.intersection(BUILDING_BLOCKS.keys()))
     if ext_imports:
         module_name = "quantum_walk_blocks"  # or whatever your module is called
         i_list = ", ".join(ext_imports)
-        output_lines.append(f"from {module_name} import {i_list}")
+        lines.append(f"from {module_name} import {i_list}")
+    if columnar:
+        lines.append("from columnar_store import ColumnStore, RowSet, column as _column, flatten as _flatten")
+    if profile:
+        lines.append("from cmcc_profile import profiled")
 
     aggregator_helpers = textwrap.dedent("""\
     import uuid
     import re
 
+    """)
+    if columnar:
+        aggregator_helpers += textwrap.dedent("""\
+        _STORE = ColumnStore()
+        _EXTENT_VERSIONS = {}
+
+        def _register(obj):
+            \"\"\"Give every instance a row in its entity's table (the extent 'Entity where ...' scans).\"\"\"
+            name = type(obj).__name__
+            table = _STORE.table(name)
+            obj.__dict__['_table'] = table
+            obj.__dict__['_row'] = table.append(obj)
+            _EXTENT_VERSIONS[name] = _EXTENT_VERSIONS.get(name, 0) + 1
+
+        def _extent(entity_name):
+            \"\"\"All instances of entity_name created so far, as a RowSet.\"\"\"
+            return _STORE.table(entity_name).all_rows()
+
+        def _new_collection():
+            return RowSet()
+
+        def _index_rows(entity_name, bucket):
+            \"\"\"A hash-index bucket ({id: obj}) as a RowSet.\"\"\"
+            rows = RowSet(_STORE.table(entity_name))
+            if bucket:
+                rows.extend_indices(np.fromiter((obj.__dict__['_row'] for obj in bucket.values()),
+                                                dtype=np.int64, count=len(bucket)))
+            return rows
+
+        def _forget_extents():
+            \"\"\"Start a fresh store; returns the instances the old one held.\"\"\"
+            global _STORE
+            forgotten = [obj for table in _STORE.tables.values() for obj in table.rows]
+            _STORE = ColumnStore()
+            return forgotten
+        """)
+    else:
+        aggregator_helpers += textwrap.dedent("""\
+        _EXTENTS = {}
+        _EXTENT_VERSIONS = {}
+
+        def _register(obj):
+            \"\"\"Remember every instance so 'Entity where ...' formulas can scan it.\"\"\"
+            name = type(obj).__name__
+            _EXTENTS.setdefault(name, []).append(obj)
+            _EXTENT_VERSIONS[name] = _EXTENT_VERSIONS.get(name, 0) + 1
+
+        def _extent(entity_name):
+            \"\"\"All instances of entity_name created so far.\"\"\"
+            return _EXTENTS.get(entity_name, [])
+
+        def _forget_extents():
+            \"\"\"Empty every extent; returns the instances they held.\"\"\"
+            forgotten = [obj for objs in _EXTENTS.values() for obj in objs]
+            _EXTENTS.clear()
+            return forgotten
+
+        def _new_collection():
+            return []
+
+        def _index_rows(entity_name, bucket):
+            \"\"\"A hash-index bucket ({id: obj}) as a list.\"\"\"
+            return list(bucket.values()) if bucket else []
+
+        def _column(rows, field):
+            \"\"\"field of every row in rows (e.g. SUM(teams -> wins)).\"\"\"
+            return [getattr(x, field) for x in rows]
+
+        def _flatten(rows, collection):
+            \"\"\"Concatenate the collection of every row (e.g. teams.roster).\"\"\"
+            return [y for x in rows for y in getattr(x, collection)]
+        """)
+    aggregator_helpers += textwrap.dedent("""\
+
+    def _touch(obj, attr_name, _seen=None):
+        \"\"\"
+        attr_name on obj changed: drop the memoized fields that depend on it,
+        bump obj's extent version, then tell every object that holds obj in
+        a collection or reference attribute.
+        \"\"\"
+        if _seen is None:
+            _seen = set()
+        elif id(obj) in _seen:
+            return
+        _seen.add(id(obj))
+        memo = obj.__dict__.get('_memo')
+        if memo:
+            for dependent in getattr(type(obj), '_DEPENDENTS', {}).get(attr_name, ()):
+                memo.pop(dependent, None)
+        name = type(obj).__name__
+        _EXTENT_VERSIONS[name] = _EXTENT_VERSIONS.get(name, 0) + 1
+        containers = obj.__dict__.get('_containers')
+        if containers:
+            for parent, parent_attr in list(containers.values()):
+                _touch(parent, parent_attr, _seen)
+
+    _INDEXES = {}            # (entity, input field) -> {value: {id(obj): obj}}
+    _CALCULATED_INDEXES = {} # (entity, calculated field) -> (version stamp, index)
+
+    def _lookup(entity_name, field, key):
+        \"\"\"Instances of entity_name whose input field equals key, from the hash index.\"\"\"
+        return _index_rows(entity_name, _INDEXES.get((entity_name, field), {}).get(key))
+
+    def _lookup_calculated(entity_name, field, key):
+        \"\"\"
+        As _lookup, for a calculated field.  Its index is rebuilt with one pass
+        over the extent whenever the versions of that extent (or of the
+        extents the field itself scans) have moved, so N probes between two
+        changes cost one scan instead of N.
+        \"\"\"
+        cls = globals().get(entity_name)
+        deps = (entity_name,) + tuple(cls._EXTENT_DEPS.get(field, ()) if cls else ())
+        stamp = tuple(_EXTENT_VERSIONS.get(e, 0) for e in deps)
+        hit = _CALCULATED_INDEXES.get((entity_name, field))
+        if hit is None or hit[0] != stamp:
+            index = {}
+            for obj in _extent(entity_name):
+                index.setdefault(getattr(obj, field), {})[id(obj)] = obj
+            hit = _CALCULATED_INDEXES[(entity_name, field)] = (stamp, index)
+        return _index_rows(entity_name, hit[1].get(key))
+
+    def _reindex(obj, field, value):
+        \"\"\"Move obj to the `value` bucket of the (type, field) hash index.\"\"\"
+        keys = obj.__dict__.setdefault('_index_keys', {})
+        if keys is None:
+            return      # forgotten by clear_extents()
+        index = _INDEXES.setdefault((type(obj).__name__, field), {})
+        if field in keys:
+            bucket = index[keys[field]]
+            del bucket[id(obj)]
+            if not bucket:
+                del index[keys[field]]
+        index.setdefault(value, {})[id(obj)] = obj
+        keys[field] = value
+
+    def clear_extents():
+        \"\"\"
+        Forget every instance created so far.  The extents and hash indexes
+        hold each instance for the life of the module, so a long-running
+        process that builds one model after another calls this between
+        them to let the old objects go.  Those objects keep working, but
+        'Entity where ...' scans and lookups no longer find them.
+        \"\"\"
+        for obj in _forget_extents():
+            obj.__dict__['_index_keys'] = None
+        _INDEXES.clear()
+        _CALCULATED_INDEXES.clear()
+        for name in _EXTENT_VERSIONS:
+            _EXTENT_VERSIONS[name] += 1
+
+    def _contain(item, parent, attr_name):
+        \"\"\"Record that parent.attr_name holds item, so changes to item reach parent.\"\"\"
+        if isinstance(item, _Entity):
+            item.__dict__.setdefault('_containers', {})[(id(parent), attr_name)] = (parent, attr_name)
+
+    def _uncontain(item, parent, attr_name):
+        \"\"\"parent.attr_name no longer holds item: stop telling parent about item's changes.\"\"\"
+        if isinstance(item, _Entity):
+            containers = item.__dict__.get('_containers')
+            if containers:
+                containers.pop((id(parent), attr_name), None)
+
+    class _Entity:
+        \"\"\"Base for generated classes: every public attribute write invalidates its dependents.\"\"\"
+        _DEPENDENTS = {}
+        _EXTENT_DEPS = {}
+        _SCALARS = frozenset()
+        _INDEXED = frozenset()
+
+        def __setattr__(self, name, value):
+            public = not name.startswith('_')
+            if name in type(self)._SCALARS:
+                table, row = self.__dict__['_table'], self.__dict__['_row']
+                old = table.get(row, name) if public else None
+                table.set(row, name, value)
+            else:
+                old = self.__dict__.get(name) if public else None
+                object.__setattr__(self, name, value)
+            if name in type(self)._INDEXED:
+                _reindex(self, name, value)
+            if public:
+                if old is not value:
+                    _uncontain(old, self, name)
+                _contain(value, self, name)
+                _touch(self, name)
+    """)
+    if columnar:
+        aggregator_helpers += textwrap.indent(textwrap.dedent("""\
+
+        def __getattr__(self, name):
+            # Reached for attributes not in __dict__ (columnar scalars), and
+            # also when a calculated field's formula raised AttributeError:
+            # Python then retries here and would report the field itself as
+            # missing.  Re-read it (formulas are pure) to surface the cause.
+            if name in type(self)._SCALARS:
+                return self.__dict__['_table'].get(self.__dict__['_row'], name)
+            field = getattr(type(self), name, None)
+            if field is not None and hasattr(type(field), '__set__'):
+                try:
+                    return field.__get__(self, type(self))
+                except AttributeError as exc:
+                    raise AttributeError(f"{type(self).__name__}.{name} failed: {exc}") from exc
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        """), "    ")
+    aggregator_helpers += textwrap.dedent("""\
+
+    class memoized_property:
+        \"\"\"
+        A read-only @property cached per instance.  The entry is dropped by
+        _touch when an input changes, and is re-stamped against the
+        versions of any entity extents the formula scans.
+        \"\"\"
+        def __init__(self, func):
+            self.func = func
+            self.name = func.__name__
+            self.__doc__ = func.__doc__
+
+        def __get__(self, obj, objtype=None):
+            if obj is None:
+                return self
+            extents = type(obj)._EXTENT_DEPS.get(self.name)
+            stamp = tuple(_EXTENT_VERSIONS.get(e, 0) for e in extents) if extents else None
+            memo = obj.__dict__.get('_memo')
+            if memo is None:
+                memo = obj.__dict__['_memo'] = {}
+            hit = memo.get(self.name)
+            if hit is not None and hit[1] == stamp:
+                return hit[0]
+            value = self.func(obj)
+            memo[self.name] = (value, stamp)
+            return value
+
+        def __set__(self, obj, value):
+            raise AttributeError(f"can't set calculated field '{self.name}'")
+
     class CollectionWrapper:
         \"\"\"A tiny helper so we can do something like: obj.someLookup.add(item).\"\"\"
         def __init__(self, parent_object, attr_name):
@@ -390,10 +663,25 @@ def main():
             if not hasattr(parent_object, '_collections'):
                 parent_object._collections = {}
             if attr_name not in parent_object._collections:
-                parent_object._collections[attr_name] = []
+                parent_object._collections[attr_name] = _new_collection()
+
+        @property
+        def items(self):
+            \"\"\"The underlying list (or RowSet in --columnar modules).\"\"\"
+            return self.parent_object._collections[self.attr_name]
 
         def add(self, item):
             self.parent_object._collections[self.attr_name].append(item)
+            _contain(item, self.parent_object, self.attr_name)
+            _touch(self.parent_object, self.attr_name)
+
+        def remove(self, item):
+            \"\"\"Remove the first occurrence of item (ValueError if absent).\"\"\"
+            items = self.parent_object._collections[self.attr_name]
+            items.remove(item)
+            if not any(x is item for x in items):
+                _uncontain(item, self.parent_object, self.attr_name)
+            _touch(self.parent_object, self.attr_name)
 
         def __iter__(self):
             return iter(self.parent_object._collections[self.attr_name])
@@ -403,31 +691,48 @@ def main():
 
         def __getitem__(self, index):
             return self.parent_object._collections[self.attr_name][index]
+    """)
+    if profile:
+        aggregator_helpers += textwrap.dedent("""
+        # --profile: time the aggregators and the row helpers formulas call
+        for _name in ("COUNT", "SUM", "MAX", "MIN", "AVG", "EXISTS", "MINBY", "MAXBY", "MODE", "TOPN",
+                      "_extent", "_column", "_flatten", "_lookup", "_lookup_calculated"):
+            globals()[_name] = profiled(_name)(globals()[_name])
+        """)
+    lines.append("")
+    lines.append(aggregator_helpers)
+    lines.append("")
+    return "\n".join(lines)
 
-    # Below are aggregator stubs not yet in core_lambda_functions:
-    def AVG(collection):
-        \"\"\"Placeholder aggregator: real logic not yet implemented.\"\"\"
-        # Could do: return sum(collection)/len(collection) if numeric
-        return f\"/* AVG not implemented: {collection} */\"
-
-    def EXISTS(condition_expr):
-        return f\"/* EXISTS not implemented: {condition_expr} */\"
-
-    def MINBY(expr):
-        return f\"/* MINBY not implemented: {expr} */\"
-
-    def MAXBY(expr):
-        return f\"/* MAXBY not implemented: {expr} */\"
 
-    def MODE(expr):
-        return f\"/* MODE not implemented: {expr} */\"
+def generate_module(entities, columnar=False, include_sample_main=False, cache=None, profile=False,
+                    tools=None):
+    """
+    Generate the SDK module for one domain's entity list.
+    With profile, every calculated field, aggregator and row helper is
+    wrapped in cmcc_profile.profiled (see cmcc_profile.report()); tools
+    is passed on to module_prelude().
+    Returns (code, building blocks used, translation cache entries).
+    """
+    schema = SchemaIndex(entities)
+    translations, entries = translate_entities(entities, schema, cache)
+    graph = build_dependency_graph(translations)
+    probes = collect_probes(translations)
+    used_blocks = set()
+    class_codes = []
+    for e in entities:
+        code = generate_class_code(e, translations[e["name"]], graph[e["name"]], used_blocks,
+                                   columnar, probes.get(e["name"], ()), profile)
+        class_codes.append(code)
 
-    def TOPN(expr):
-        return f\"/* TOPN not implemented: {expr} */\"
-    """)
-    output_lines.append("")
-    output_lines.append(aggregator_helpers)
-    output_lines.append("")
+    # Build final output
+    ext_imports = sorted(used_blocks.intersection(BUILDING_BLOCKS.keys()))
+    output_lines = []
+    output_lines.append('"""')
+    output_lines.append("Auto-generated Python code from your domain model.")
+    output_lines.append("Now with aggregator rewriting that references core_lambda_functions.")
+    output_lines.append('"""')
+    output_lines.append(module_prelude(ext_imports, columnar, profile, tools))
 
     # Then generate each class code
     output_lines.append("# ----- Generated classes below -----\n")
@@ -436,7 +741,7 @@ def main():
         output_lines.append("")
 
     # Optional sample_main
-    if args.include_sample_main:
+    if include_sample_main:
         sample_main_str = textwrap.dedent("""\
         def sample_main():
             \"\"\"
@@ -450,7 +755,163 @@ def main():
         output_lines.append(sample_main_str)
         output_lines.append("")
 
-    final_code = "\n".join(output_lines)
+    return "\n".join(output_lines), ext_imports, entries
+
+
+################################################################
+# 3) Batch mode: every domain of the SSoT (or a directory)      #
+################################################################
+
+CACHE_FILE = ".cmcc-sdk-cache.json"
+# Domains per worker that generate_batch submits ahead of the results.
+_BATCH_IN_FLIGHT = 2
+_DOMAIN_MODEL_RE = re.compile(r"^cmcc-toe-(.+)-meta-model\.json$")
+
+
+def is_ssot(path):
+    """True for the all-domains SSoT document (checked without decoding it)."""
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return "CMCC_ToEMM_Domains" in top_level_keys(f)
+        except ValueError:
+            return False
+
+
+def ssot_domains(path, output_dir):
+    """
+    (nickname, output path, entities) for every domain in the SSoT
+    cmcc-toe-meta-model.json, streamed: only one domain's entities are held
+    at a time and the narrative meta / Research sections are never decoded.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for (_, nickname), rows in itertools.groupby(iter_ssot_entities(f), key=lambda r: r[:2]):
+            out = os.path.join(output_dir, nickname, f"{nickname}_cmcc_sdk.py")
+            yield nickname, out, [entity for _, _, entity in rows]
+
+
+def find_domain_models(directory, output_dir):
+    """(nickname, output path, entities) for every cmcc-toe-<nickname>-meta-model.json under directory."""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            m = _DOMAIN_MODEL_RE.match(name)
+            if m:
+                with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                    entities = load_entities(json.load(f))
+                nickname = m.group(1)
+                yield nickname, os.path.join(output_dir, nickname, f"{nickname}_cmcc_sdk.py"), entities
+
+
+def _generate_domain(job):
+    """Process-pool worker: generate one domain module, writing it only if it changed."""
+    out, entities, columnar, include_sample_main, cache, profile = job
+    code, ext_imports, entries = generate_module(entities, columnar, include_sample_main, cache, profile,
+                                                 tools_path(out))
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    old = None
+    if os.path.exists(out):
+        with open(out, "r", encoding="utf-8") as f:
+            old = f.read()
+    if code != old:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(code)
+    return out, entries, ext_imports
+
+
+def generate_batch(domains, args):
+    """
+    Generate one SDK module per domain.  A domain whose model, flags and
+    generator are unchanged since the last run (per the content-hash cache
+    in the output directory) is skipped outright; the rest are generated
+    across a process pool, reusing cached translations of unchanged entities.
+
+    `domains` is consumed lazily: each domain is hashed and checked as it
+    arrives and handed to the pool straight away, with at most
+    _BATCH_IN_FLIGHT domains per worker submitted but not finished, so only
+    those domains' entities are alive at a time.
+    """
+    started = time.perf_counter()
+    cache_path = os.path.join(args.output, CACHE_FILE)
+    cache = {"modules": {}}
+    if not args.no_cache and os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    flags = json.dumps([args.columnar, args.include_sample_main, args.profile])
+    jobs = args.jobs or os.cpu_count() or 1
+    seen = regenerated = 0
+
+    def finish(result, digest):
+        nonlocal regenerated
+        out, entries, ext_imports = result
+        cache["modules"][os.path.relpath(out, args.output)] = {"hash": digest, "entities": entries}
+        print(f"Generated Python code written to {out}")
+        if ext_imports:
+            print("  Detected usage of building blocks:", ", ".join(ext_imports))
+        regenerated += 1
+
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    in_flight = {}   # future -> hash of its domain
+    try:
+        for nickname, out, entities in domains:
+            seen += 1
+            digest = _sha256(generator_fingerprint() + flags + json.dumps(tools_path(out))
+                             + json.dumps(entities, sort_keys=True))
+            previous = cache["modules"].get(os.path.relpath(out, args.output), {})
+            if previous.get("hash") == digest and os.path.exists(out):
+                continue
+            job = (out, entities, args.columnar, args.include_sample_main, previous.get("entities"),
+                   args.profile)
+            if pool is None:
+                finish(_generate_domain(job), digest)
+                continue
+            if len(in_flight) >= jobs * _BATCH_IN_FLIGHT:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future.result(), in_flight.pop(future))
+            in_flight[pool.submit(_generate_domain, job)] = digest
+        for future in as_completed(in_flight):
+            finish(future.result(), in_flight[future])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if regenerated and not args.no_cache:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    print(f"{regenerated} of {seen} domain modules regenerated "
+          f"({seen - regenerated} unchanged) in {time.perf_counter() - started:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate Python classes from a JSON-based meta-model, referencing aggregator calls in core_lambda_functions."
+    )
+    parser.add_argument("-i", "--input", required=True,
+        help="Path to input JSON file, the SSoT cmcc-toe-meta-model.json, or a directory of cmcc-toe-*-meta-model.json files.")
+    parser.add_argument("-o", "--output", required=True,
+        help="Path to output .py file (an output directory for the SSoT / directory inputs).")
+    parser.add_argument("--include-sample-main", action="store_true",
+        help="If set, also inject a sample_main() function demonstration.")
+    parser.add_argument("--columnar", action="store_true",
+        help="Store scalar fields and collections in NumPy columns (imports columnar_store from tools/).")
+    parser.add_argument("--profile", action="store_true",
+        help="Wrap calculated fields and aggregators in cmcc_profile timers (imports cmcc_profile from tools/).")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+        help="Worker processes for the SSoT / directory inputs (default: CPU count).")
+    parser.add_argument("--no-cache", action="store_true",
+        help="Ignore and do not update the content-hash cache of the SSoT / directory inputs.")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.input):
+        return generate_batch(find_domain_models(args.input, args.output), args)
+
+    if is_ssot(args.input):
+        return generate_batch(ssot_domains(args.input, args.output), args)
+    with open(args.input,"r",encoding="utf-8") as f:
+        entities = load_entities(json.load(f))
+
+    final_code, ext_imports, _ = generate_module(entities, args.columnar, args.include_sample_main,
+                                                 profile=args.profile, tools=tools_path(args.output))
     with open(args.output,"w",encoding="utf-8") as out_f:
         out_f.write(final_code)
 